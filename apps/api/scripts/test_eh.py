@@ -9,48 +9,86 @@ Extended Hours 功能测试脚本
     python3 scripts/test_eh.py
 """
 
+import os
+import sys
+
+import numpy as np
+import pandas as pd
 import yfinance as yf
 from datetime import datetime
 
+# 添加 src 到路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.providers.segment import segment_sessions
+
+# 测试的股票列表（一次批量下载）
+TICKERS = ["TSLA", "QQQ", "AAPL"]
+
 
-def test_yfinance_prepost():
-    """测试 YFinance prepost 参数"""
+def test_yfinance_prepost(tickers=TICKERS):
+    """测试 YFinance prepost 参数（批量下载，按 ticker 拆分）"""
     print("=" * 60)
     print("测试 YFinance Extended Hours 数据获取")
     print("=" * 60)
 
-    ticker = "TSLA"
-    print(f"\n获取 {ticker} 的 Extended Hours 数据...\n")
+    print(f"\n批量获取 {', '.join(tickers)} 的 Extended Hours 数据...\n")
 
     try:
-        stock = yf.Ticker(ticker)
+        # 一次请求获取所有 ticker 的 prepost 数据
+        all_df = yf.download(
+            " ".join(tickers),
+            period="2d",
+            interval="1m",
+            prepost=True,
+            threads=True,
+            group_by="ticker",
+            progress=False,
+        )
+    except Exception as e:
+        print(f"❌ 批量下载失败: {e}")
+        return False
 
-        # 获取带 prepost 的数据
-        df = stock.history(period="2d", interval="1m", prepost=True)
+    ok = True
+    for ticker in tickers:
+        if isinstance(all_df.columns, pd.MultiIndex):
+            if ticker not in all_df.columns.get_level_values(0):
+                print(f"❌ {ticker}: 无数据返回")
+                ok = False
+                continue
+            df = all_df[ticker].dropna(how="all")
+        else:
+            df = all_df.dropna(how="all")
+        if df.index.tz is not None:
+            df = df.tz_convert("America/New_York")
+        ok = report_prepost(ticker, df) and ok
+    return ok
+
+
+def report_prepost(ticker, df):
+    """输出单个 ticker 的 Extended Hours 统计和关键位"""
+    print("-" * 60)
+    print(f"{ticker}")
 
+    try:
         if df.empty:
             print("❌ 无数据返回")
-            return
+            return False
 
         print(f"✅ 成功获取 {len(df)} 根 K 线")
 
-        # 统计各时段
-        premarket = 0
-        regular = 0
-        afterhours = 0
+        # 一次性取出 OHLC 的 numpy 视图（SoA），后续统计直接在 ndarray 上完成
+        o, h, l, c = (df[col].to_numpy() for col in ("Open", "High", "Low", "Close"))
+        minutes = df.index.hour.values * 60 + df.index.minute.values
+        day_ids = df.index.tz_localize(None).values.astype("datetime64[D]").astype(np.int64)
 
-        for idx in df.index:
-            ts = idx.to_pydatetime()
-            hour = ts.hour
-            minute = ts.minute
-            time_minutes = hour * 60 + minute
+        # 按 (交易日, 时段) 一次性分割，每段是原数组的连续切片
+        sessions = segment_sessions(minutes, day_ids)
 
-            if 240 <= time_minutes < 570:  # 04:00 - 09:30
-                premarket += 1
-            elif 570 <= time_minutes < 960:  # 09:30 - 16:00
-                regular += 1
-            elif 960 <= time_minutes <= 1200:  # 16:00 - 20:00
-                afterhours += 1
+        premarket = sum(len(c[s.premarket]) for s in sessions.values())
+        regular = sum(len(c[s.regular]) for s in sessions.values())
+        # segment_sessions 的盘后止于 19:59；统计沿用原脚本口径（16:00-20:00 含），20:00 整点也计入盘后
+        afterhours = sum(len(c[s.afterhours]) for s in sessions.values()) + int(np.count_nonzero(minutes == 1200))
 
         print(f"\n📊 时段统计:")
         print(f"   盘前 (04:00-09:30): {premarket} bars")
@@ -58,62 +96,50 @@ def test_yfinance_prepost():
         print(f"   盘后 (16:00-20:00): {afterhours} bars")
 
         # 显示日期分布
-        dates = df.index.date
-        unique_dates = sorted(set(dates))
+        unique_dates = sorted(set(df.index.date))
         print(f"\n📅 日期覆盖: {unique_dates}")
 
         # 显示样本数据
         print(f"\n📈 样本数据:")
         print(f"   最早: {df.index[0]}")
-        print(f"          O:{df.iloc[0]['Open']:.2f} H:{df.iloc[0]['High']:.2f} L:{df.iloc[0]['Low']:.2f} C:{df.iloc[0]['Close']:.2f}")
+        print(f"          O:{o[0]:.2f} H:{h[0]:.2f} L:{l[0]:.2f} C:{c[0]:.2f}")
         print(f"   最新: {df.index[-1]}")
-        print(f"          O:{df.iloc[-1]['Open']:.2f} H:{df.iloc[-1]['High']:.2f} L:{df.iloc[-1]['Low']:.2f} C:{df.iloc[-1]['Close']:.2f}")
-
-        # 计算关键位
-        if len(unique_dates) >= 2:
-            yesterday = unique_dates[-2]
-            today = unique_dates[-1]
-
-            yesterday_df = df[df.index.date == yesterday]
-            today_df = df[df.index.date == today]
-
-            # 分离时段
-            yesterday_regular = yesterday_df[
-                (yesterday_df.index.hour >= 9) &
-                ((yesterday_df.index.hour < 16) | ((yesterday_df.index.hour == 9) & (yesterday_df.index.minute >= 30)))
-            ]
-            yesterday_ah = yesterday_df[yesterday_df.index.hour >= 16]
-            today_pm = today_df[
-                (today_df.index.hour < 9) |
-                ((today_df.index.hour == 9) & (today_df.index.minute < 30))
-            ]
+        print(f"          O:{o[-1]:.2f} H:{h[-1]:.2f} L:{l[-1]:.2f} C:{c[-1]:.2f}")
+
+        # 计算关键位（最后一天为今日，倒数第二天为昨日）
+        if len(sessions) >= 2:
+            *_, yesterday, today = sessions.values()
+            yesterday_regular = yesterday.regular
+            yesterday_ah = yesterday.afterhours
+            today_pm = today.premarket
 
             print(f"\n🎯 关键位提取:")
 
-            if len(yesterday_regular) > 0:
-                yc = yesterday_regular.iloc[-1]['Close']
-                yh = yesterday_regular['High'].max()
-                yl = yesterday_regular['Low'].min()
+            has_regular = len(c[yesterday_regular]) > 0
+            if has_regular:
+                yc = c[yesterday_regular][-1]
+                yh = h[yesterday_regular].max()
+                yl = l[yesterday_regular].min()
                 print(f"   YC (昨收): ${yc:.2f}")
                 print(f"   YH (昨高): ${yh:.2f}")
                 print(f"   YL (昨低): ${yl:.2f}")
 
-            if len(yesterday_ah) > 0:
-                ahh = yesterday_ah['High'].max()
-                ahl = yesterday_ah['Low'].min()
+            if len(h[yesterday_ah]) > 0:
+                ahh = h[yesterday_ah].max()
+                ahl = l[yesterday_ah].min()
                 print(f"   AHH (盘后高): ${ahh:.2f}")
                 print(f"   AHL (盘后低): ${ahl:.2f}")
             else:
                 print(f"   AHH/AHL: 无盘后数据")
 
-            if len(today_pm) > 0:
-                pmh = today_pm['High'].max()
-                pml = today_pm['Low'].min()
+            if len(h[today_pm]) > 0:
+                pmh = h[today_pm].max()
+                pml = l[today_pm].min()
                 print(f"   PMH (盘前高): ${pmh:.2f}")
                 print(f"   PML (盘前低): ${pml:.2f}")
 
-                if len(yesterday_regular) > 0:
-                    gap = today_pm.iloc[-1]['Close'] - yc
+                if has_regular:
+                    gap = c[today_pm][-1] - yc
                     gap_pct = gap / yc * 100
                     print(f"   GAP (缺口): ${gap:+.2f} ({gap_pct:+.2f}%)")
             else:
@@ -13,12 +13,12 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.providers import TwelveDataProvider, segment_bars_by_session, get_yesterday_sessions
-from src.config import settings
+from src.config import get_settings
 
 
 def main():
     # 检查 API Key
-    api_key = settings.twelvedata_api_key
+    api_key = get_settings().twelvedata_api_key
     if not api_key:
         print("错误: 请设置 TWELVEDATA_API_KEY 环境变量")
         return 1
@@ -29,13 +29,37 @@ def main():
     # 创建 provider
     provider = TwelveDataProvider(api_key=api_key)
 
-    # 测试获取 TSLA 的 Extended Hours 数据
-    ticker = "TSLA"
-    print(f"获取 {ticker} 的 Extended Hours 数据 (2天, 1分钟线)...")
+    # 批量获取 Extended Hours 数据（一次请求）
+    tickers = ["TSLA", "QQQ", "AAPL"]
+    print(f"批量获取 {', '.join(tickers)} 的 Extended Hours 数据 (2天, 1分钟线)...")
     print()
 
     try:
-        bars = provider.get_bars_extended(ticker, "1m", "2d")
+        bars_by_ticker = provider.get_bars_extended_batch(tickers, "1m", "2d")
+    except Exception as e:
+        print(f"❌ 错误: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    status = 0
+    for ticker in tickers:
+        bars = bars_by_ticker.get(ticker)
+        if not bars:
+            print(f"❌ {ticker}: 无数据")
+            status = 1
+            continue
+        status = report_ticker(ticker, bars) or status
+    return status
+
+
+def report_ticker(ticker, bars):
+    """输出单个 ticker 的时段统计和关键位"""
+    print("=" * 40)
+    print(ticker)
+    print("=" * 40)
+
+    try:
         print(f"✅ 成功获取 {len(bars)} 根 K 线")
         print()
 
@@ -6,7 +6,9 @@ FastAPI 后端服务的主模块包。
 
 模块结构:
 - main.py: FastAPI 应用入口和路由定义
+- __main__.py: 启动入口（python -m src）
 - config.py: 配置管理（环境变量）
 - cache.py: 内存缓存管理
+- analysis.py: core 分析模块加载与分析进程池
 - providers/: 数据提供者实现（yfinance 等）
 """
@@ -0,0 +1,25 @@
+"""
+KLineLens API 启动入口
+
+用法: python -m src（使用 uvloop + httptools，端口取 PORT，进程数取 WEB_CONCURRENCY）
+
+此模块不导入 src.main：应用以导入字符串交给 uvicorn，由服务进程（或各 worker）
+自行导入，父进程不会重复创建缓存、数据库连接和分析进程池。
+"""
+
+import os
+
+import uvicorn
+
+
+if __name__ == "__main__":
+    # 进程数由 WEB_CONCURRENCY 决定（uvicorn 自动读取，默认 1）
+    uvicorn.run(
+        "src.main:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+    )
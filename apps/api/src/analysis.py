@@ -0,0 +1,194 @@
+"""
+core 分析模块加载与多进程分析
+
+analyze_market 是纯 Python 的 CPU 密集计算，线程池受 GIL 限制只能串行执行。
+本模块提供:
+- import_core_package(): 加载 packages/core（以 klinelens_core 的名字加载，避免与 API 的 src 包同名冲突）
+- report_to_json(): AnalysisReport 序列化
+- create_analysis_pool() / analyze_bars_to_json(): 在子进程中运行分析
+
+子进程与主进程之间只传递基础类型（K 线元组、JSON 字节），
+使进程间传输的数据尽量小，序列化开销低。
+"""
+
+import importlib
+import importlib.util
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from types import ModuleType
+from typing import Any, List, Optional, Tuple
+
+import orjson
+
+
+# 导入 core 模块
+# 支持两种环境：
+# 1. Docker: core 挂载在 /app/packages/core
+# 2. 本地开发: core 在 ../../../packages/core
+#
+# core 的包目录同样叫 src，与 API 的 src 包同名。按文件路径以 klinelens_core
+# 的名字加载（core 内部均为相对导入），不修改 sys.path，也不替换 API 的 src 模块
+
+CORE_PACKAGE = "klinelens_core"
+
+_core_import_lock = threading.Lock()
+_core_symbols: Optional[tuple] = None
+
+
+def load_core_package() -> ModuleType:
+    """加载 core 包并注册为 klinelens_core（进程内只加载一次）"""
+    with _core_import_lock:
+        module = sys.modules.get(CORE_PACKAGE)
+        if module is None:
+            module = _load_core_package()
+    return module
+
+
+def _load_core_package() -> ModuleType:
+    """按文件路径加载 core 的 src 包"""
+    # Docker 环境: /app/packages/core
+    docker_core_path = '/app/packages/core'
+    # 本地环境: packages/core
+    local_core_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'packages', 'core'))
+
+    # 检测运行环境
+    if os.path.exists(docker_core_path):
+        core_path = docker_core_path
+    else:
+        core_path = local_core_path
+
+    src_path = os.path.join(core_path, 'src')
+    spec = importlib.util.spec_from_file_location(
+        CORE_PACKAGE,
+        os.path.join(src_path, '__init__.py'),
+        submodule_search_locations=[src_path],
+    )
+    module = importlib.util.module_from_spec(spec)
+    # 先注册再执行：包内的相对导入需要通过 sys.modules 找到父包
+    sys.modules[CORE_PACKAGE] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[CORE_PACKAGE]
+        raise
+    return module
+
+
+def import_core_package() -> tuple:
+    """导入 core 分析模块（进程内只导入一次）"""
+    global _core_symbols
+    if _core_symbols is None:
+        _core_symbols = _import_core_package()
+    return _core_symbols
+
+
+def _import_core_package() -> tuple:
+    """从 klinelens_core 取出 API 使用的函数和类型"""
+    load_core_package()
+    core_analyze = importlib.import_module(f"{CORE_PACKAGE}.analyze")
+    core_models = importlib.import_module(f"{CORE_PACKAGE}.models")
+    core_eh = importlib.import_module(f"{CORE_PACKAGE}.extended_hours")
+
+    return (
+        core_analyze.analyze_market,
+        core_analyze.AnalysisParams,
+        core_models.Bar,
+        core_models.AnalysisReport,
+        # Extended Hours
+        core_eh.build_eh_context,
+        core_eh.get_yesterday_bars,
+        core_eh.EHContext,
+        core_eh.EHLevels,
+        # New EH functions
+        core_eh.split_bars_by_session,
+        core_eh.build_eh_context_from_bars,
+        core_eh.SessionBars,
+    )
+
+
+# AnalysisReport 序列化选项:
+# - naive/UTC datetime 输出为 "...Z"，不含微秒
+# - numpy 标量/数组直接转为 JSON 数值
+# - dataclass 由 orjson 原生序列化（C 实现，无需 asdict 递归复制）
+_REPORT_JSON_OPTIONS = (
+    orjson.OPT_NAIVE_UTC
+    | orjson.OPT_UTC_Z
+    | orjson.OPT_OMIT_MICROSECONDS
+    | orjson.OPT_SERIALIZE_NUMPY
+    | orjson.OPT_NON_STR_KEYS
+)
+
+
+def report_to_json(report: Any) -> bytes:
+    """
+    将 AnalysisReport 直接序列化为 JSON 字节
+
+    用于直接返回响应体，跳过 jsonable_encoder。
+    """
+    return orjson.dumps(report, default=str, option=_REPORT_JSON_OPTIONS)
+
+
+# ============ 分析进程池 ============
+
+# K 线元组: (t, o, h, l, c, v)
+BarTuple = Tuple[datetime, float, float, float, float, float]
+
+# 子进程内的 core 函数（由 _init_worker 加载）
+_analyze_market = None
+_core_bar = None
+
+
+def _init_worker() -> None:
+    """子进程初始化：加载一次 core 模块"""
+    global _analyze_market, _core_bar
+    core = import_core_package()
+    _analyze_market = core[0]
+    _core_bar = core[2]
+
+
+def analyze_bars_to_json(bars: List[BarTuple], ticker: str, timeframe: str = "1d") -> bytes:
+    """
+    在子进程中运行 analyze_market 并返回序列化后的报告
+
+    参数:
+        bars: K 线元组列表 (t, o, h, l, c, v)
+        ticker: 股票代码
+        timeframe: 时间周期
+
+    返回:
+        AnalysisReport 的 JSON 字节
+
+    异常:
+        ValueError: K 线数量不足（由 analyze_market 抛出）
+    """
+    if _analyze_market is None:
+        _init_worker()
+    # 元组顺序即 Bar 的字段顺序，按位置构造
+    core_bars = list(itertools.starmap(_core_bar, bars))
+    report = _analyze_market(bars=core_bars, ticker=ticker, timeframe=timeframe)
+    return report_to_json(report)
+
+
+def create_analysis_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    创建分析进程池
+
+    使用 spawn 启动子进程（不继承主进程的线程与锁），子进程在
+    initializer 中加载一次 core 模块。进程在首次提交任务时才启动。
+
+    参数:
+        max_workers: 进程数（None 表示 CPU 核数）
+
+    返回:
+        ProcessPoolExecutor 实例
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+    )
@@ -6,37 +6,117 @@
 
 主要功能:
 - MemoryCache: 带 TTL 的内存缓存类
+- DiskCache: SQLite 持久化缓存（内存 LRU 热层 + 磁盘层），进程重启后仍有效
+- RedisCache: Redis 共享缓存（内存 LRU 热层 + Redis），多 worker / 多实例共享
 - get_cache(): 获取全局缓存实例
 - cache_key(): 生成缓存键
+- ttl_for_timeframe(): 根据 K 线周期选择 TTL
+- EMPTY: 负结果哨兵，缓存"上游没有数据"这一事实
+
+条件重新验证:
+    带 ETag / Last-Modified 的条目过期后不会立即丢弃，可通过 get_stale()
+    取回校验值发起条件请求；服务端返回 304 时调用 touch() 续期即可。
 
 使用示例:
     cache = get_cache(default_ttl=60)
     cache.set("key", data)
     data = cache.get("key")  # 60秒内有效
+
+    # 持久化缓存（CACHE_TYPE=disk）
+    cache = get_cache(default_ttl=60, cache_type="disk", path="data/cache.db")
+
+    # 多 worker 共享缓存（CACHE_TYPE=redis）
+    cache = get_cache(default_ttl=60, cache_type="redis", url="redis://localhost:6379/0")
 """
 
+import heapq
+import os
+import sqlite3
+import sys
+import threading
 import time
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from .config import CacheTTL
 
 # 配置日志记录器
 logger = logging.getLogger(__name__)
 
 
+class _Empty:
+    """
+    负结果哨兵类型
+
+    布尔值为 False；pickle 后还原为同一个 EMPTY 实例。
+    DiskCache / RedisCache 将其编码为空字节串（_encode_value），读回后同样可用 `is` 判断。
+    """
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return "EMPTY"
+
+    def __reduce__(self) -> str:
+        return "EMPTY"
+
+
+# 负结果哨兵：cache.get(key) is EMPTY 表示上游确认无数据，无需再次请求
+EMPTY = _Empty()
+
+
+def _encode_value(value: Any) -> bytes:
+    """
+    将缓存值编码为 JSON 字节（DiskCache / RedisCache 使用）
+
+    不使用 pickle：能写入缓存文件或 Redis 的人不能借反序列化执行代码。
+    缓存值均为 dict / list / 基础类型；EMPTY 编码为空字节串（JSON 编码结果不会为空）。
+    """
+    if value is EMPTY:
+        return b""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _decode_value(payload: bytes) -> Any:
+    """
+    解码 _encode_value 的结果
+
+    异常:
+        orjson.JSONDecodeError: 不是有效的 JSON（如旧版 pickle 格式的条目）
+    """
+    if not payload:
+        return EMPTY
+    return orjson.loads(payload)
+
+
 @dataclass
 class CacheEntry:
     """
     缓存条目
 
-    存储缓存数据和过期时间。
+    存储缓存数据、过期时间和 HTTP 校验值。
 
     属性:
         data: 缓存的数据
         expires_at: 过期时间戳（Unix 时间）
+        etag: 上游返回的 ETag（用于 If-None-Match）
+        last_modified: 上游返回的 Last-Modified（用于 If-Modified-Since）
     """
     data: Any
     expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def revalidatable(self) -> bool:
+        """是否带有可用于条件请求的校验值"""
+        return self.etag is not None or self.last_modified is not None
 
 
 class MemoryCache:
@@ -44,13 +124,23 @@ class MemoryCache:
     内存缓存类
 
     使用字典存储缓存数据，支持自动过期清理。
-    适用于单实例部署，多实例部署需要使用 Redis。
+    适用于单实例部署，多实例部署需要使用 RedisCache。
+
+    过期清理使用按淘汰时间排序的最小堆：cleanup_expired 只弹出已到期的条目，
+    开销与过期条目数成正比，而不是全表扫描。start_eviction() 启动后台定时器
+    周期性执行清理。
 
     属性:
         _cache: 内部缓存字典
         _default_ttl: 默认生存时间（秒）
+        _heap: (淘汰时间, key) 最小堆
     """
 
+    # 后台清理间隔（秒）
+    EVICTION_INTERVAL = 30
+    # 带校验值的过期条目额外保留时间（秒），供条件重新验证
+    STALE_GRACE = 3600
+
     def __init__(self, default_ttl: int = 60):
         """
         初始化缓存
@@ -60,6 +150,21 @@ class MemoryCache:
         """
         self._cache: Dict[str, CacheEntry] = {}
         self._default_ttl = default_ttl
+        self._heap: List[Tuple[float, str]] = []
+        self._heap_lock = threading.Lock()
+        self._eviction_timer: Optional[threading.Timer] = None
+        self._eviction_interval = self.EVICTION_INTERVAL
+
+    def _evict_at(self, entry: CacheEntry) -> float:
+        """条目的淘汰时间（带校验值的条目延后 STALE_GRACE 秒）"""
+        if entry.revalidatable:
+            return entry.expires_at + self.STALE_GRACE
+        return entry.expires_at
+
+    def _schedule(self, key: str, entry: CacheEntry) -> None:
+        """将条目的淘汰时间加入最小堆"""
+        with self._heap_lock:
+            heapq.heappush(self._heap, (self._evict_at(entry), key))
 
     def get(self, key: str) -> Optional[Any]:
         """
@@ -75,16 +180,36 @@ class MemoryCache:
         if entry is None:
             return None
 
-        # 检查是否过期
+        # 检查是否过期（带校验值的条目保留，供条件重新验证）
         if time.time() > entry.expires_at:
-            del self._cache[key]
+            if not entry.revalidatable:
+                self._cache.pop(key, None)
             logger.debug(f"缓存已过期: {key}")
             return None
 
         logger.debug(f"缓存命中: {key}")
         return entry.data
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        批量获取缓存值
+
+        参数:
+            keys: 缓存键列表
+
+        返回:
+            与 keys 一一对应的缓存数据（不存在或已过期为 None）
+        """
+        return [self.get(key) for key in keys]
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
         """
         设置缓存值
 
@@ -92,12 +217,52 @@ class MemoryCache:
             key: 缓存键
             value: 要缓存的数据
             ttl: 生存时间（秒），不指定则使用默认值
+            etag: 上游 ETag（可选）
+            last_modified: 上游 Last-Modified（可选）
         """
         ttl = ttl if ttl is not None else self._default_ttl
         expires_at = time.time() + ttl
-        self._cache[key] = CacheEntry(data=value, expires_at=expires_at)
+        entry = CacheEntry(
+            data=value, expires_at=expires_at, etag=etag, last_modified=last_modified
+        )
+        self._cache[key] = entry
+        self._schedule(key, entry)
         logger.debug(f"缓存设置: {key} (TTL={ttl}秒)")
 
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        """
+        获取缓存条目（不检查过期）
+
+        用于条件重新验证：取回过期条目的 ETag / Last-Modified 发起条件请求。
+
+        参数:
+            key: 缓存键
+
+        返回:
+            缓存条目，不存在则返回 None
+        """
+        return self._cache.get(key)
+
+    def touch(self, key: str, ttl: Optional[int] = None) -> bool:
+        """
+        续期缓存条目（上游返回 304 Not Modified 时调用）
+
+        参数:
+            key: 缓存键
+            ttl: 新的生存时间（秒），不指定则使用默认值
+
+        返回:
+            条目存在并已续期返回 True
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return False
+        ttl = ttl if ttl is not None else self._default_ttl
+        entry.expires_at = time.time() + ttl
+        self._schedule(key, entry)
+        logger.debug(f"缓存续期: {key} (TTL={ttl}秒)")
+        return True
+
     def delete(self, key: str) -> None:
         """
         删除指定缓存
@@ -105,35 +270,592 @@ class MemoryCache:
         参数:
             key: 要删除的缓存键
         """
-        if key in self._cache:
-            del self._cache[key]
+        self._cache.pop(key, None)
 
     def clear(self) -> None:
         """清空所有缓存"""
         self._cache.clear()
+        with self._heap_lock:
+            self._heap.clear()
 
     def cleanup_expired(self) -> int:
         """
         清理所有过期的缓存条目
 
+        从最小堆顶部依次弹出已到期的记录，只删除仍对应当前条目的 key
+        （被重新 set / touch 过的条目淘汰时间已变，跳过）。
+        带校验值的条目在过期后再保留 STALE_GRACE 秒。
+
         返回:
             清理的条目数量
         """
         now = time.time()
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if now > entry.expires_at
-        ]
-        for key in expired_keys:
-            del self._cache[key]
-        return len(expired_keys)
+        removed = 0
+        with self._heap_lock:
+            while self._heap and self._heap[0][0] < now:
+                evict_at, key = heapq.heappop(self._heap)
+                entry = self._cache.get(key)
+                if entry is not None and self._evict_at(entry) == evict_at:
+                    # get() 可能在其他线程中同时移除该 key
+                    self._cache.pop(key, None)
+                    removed += 1
+        return removed
+
+    def start_eviction(self, interval: Optional[float] = None) -> None:
+        """
+        启动后台清理定时器（守护线程，重复调用无效）
+
+        参数:
+            interval: 清理间隔（秒），默认 EVICTION_INTERVAL
+        """
+        if self._eviction_timer is not None:
+            return
+        if interval is not None:
+            self._eviction_interval = interval
+        self._schedule_eviction()
+
+    def stop_eviction(self) -> None:
+        """停止后台清理定时器"""
+        timer, self._eviction_timer = self._eviction_timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def _schedule_eviction(self) -> None:
+        """安排下一次后台清理"""
+        timer = threading.Timer(self._eviction_interval, self._run_eviction)
+        timer.daemon = True
+        self._eviction_timer = timer
+        timer.start()
+
+    def _run_eviction(self) -> None:
+        """后台清理任务，执行后重新安排下一次"""
+        try:
+            removed = self.cleanup_expired()
+            if removed:
+                logger.debug(f"后台清理过期缓存: {removed} 条")
+        except Exception as e:
+            logger.error(f"后台清理缓存失败: {e}")
+        finally:
+            if self._eviction_timer is not None:
+                self._schedule_eviction()
+
+
+class _TieredCache(MemoryCache):
+    """
+    两级缓存基类（DiskCache / RedisCache 共用）
+
+    L1 为进程内 LRU 字典，热点 key 直接命中，无反序列化开销；
+    L2（SQLite / Redis）由子类实现。L1 的 move_to_end / popitem 需要与
+    并发的读写互斥（get/set 在线程池中调用），统一在 _l1_lock 下进行。
+
+    属性:
+        _l1_size: L1 热层最大条目数
+    """
+
+    def __init__(self, default_ttl: int = 60, l1_size: int = 256):
+        """
+        初始化 L1 热层
+
+        参数:
+            default_ttl: 默认生存时间，单位秒，默认 60 秒
+            l1_size: 内存热层最大条目数，默认 256
+        """
+        super().__init__(default_ttl=default_ttl)
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._l1_size = l1_size
+        self._l1_lock = threading.Lock()
+
+    def _remember(self, key: str, entry: CacheEntry) -> None:
+        """写入 L1 热层，超出容量时淘汰最久未使用的条目"""
+        with self._l1_lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._l1_size:
+                self._cache.popitem(last=False)
+
+    def _l1_get(self, key: str, now: float) -> Optional[CacheEntry]:
+        """L1 中未过期的条目（过期条目顺带移除）"""
+        with self._l1_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if now <= entry.expires_at:
+                self._cache.move_to_end(key)
+                return entry
+            self._cache.pop(key, None)
+            return None
+
+    def _l1_peek(self, key: str) -> Optional[CacheEntry]:
+        """L1 中的条目（不检查过期，不调整 LRU 顺序）"""
+        with self._l1_lock:
+            return self._cache.get(key)
+
+    def _l1_discard(self, key: str) -> None:
+        """从 L1 移除条目"""
+        with self._l1_lock:
+            self._cache.pop(key, None)
+
+    def _l1_clear(self) -> None:
+        """清空 L1"""
+        with self._l1_lock:
+            self._cache.clear()
+
+    def _l1_cleanup(self, now: float) -> int:
+        """移除 L1 中已过期的条目，返回移除数量"""
+        with self._l1_lock:
+            expired = [k for k, e in self._cache.items() if now > e.expires_at]
+            for key in expired:
+                del self._cache[key]
+        return len(expired)
+
+
+class DiskCache(_TieredCache):
+    """
+    磁盘持久化缓存类
+
+    两级结构：
+    - L1: 进程内 LRU 字典（默认 256 条），热点 key 直接命中，无反序列化开销
+    - L2: SQLite 表，值以 JSON 字节（_encode_value）存入 BLOB 列，进程重启/重新部署后仍可命中
+
+    接口与 MemoryCache 完全一致，可直接替换。
+
+    属性:
+        path: SQLite 缓存文件路径
+        _l1_size: L1 热层最大条目数
+    """
+
+    def __init__(self, path: str, default_ttl: int = 60, l1_size: int = 256):
+        """
+        初始化磁盘缓存
+
+        参数:
+            path: SQLite 缓存文件路径
+            default_ttl: 默认生存时间，单位秒，默认 60 秒
+            l1_size: 内存热层最大条目数，默认 256
+        """
+        super().__init__(default_ttl=default_ttl, l1_size=l1_size)
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 单连接 + 锁：FastAPI 线程池中的调用共享同一连接
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+        """)
+        # 兼容旧版缓存文件：补齐校验值列
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache_entries)")}
+        for column in ("etag", "last_modified"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE cache_entries ADD COLUMN {column} TEXT")
+
+    def _load(self, key: str, payload: bytes) -> Optional[Any]:
+        """解码磁盘中的值；无法解码（如旧版 pickle 条目）时删除该行并返回 None"""
+        try:
+            return _decode_value(payload)
+        except orjson.JSONDecodeError:
+            logger.debug(f"丢弃无法解码的缓存条目: {key}")
+            with self._lock:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            return None
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        获取缓存值
+
+        先查 L1 热层，未命中再查 SQLite，命中后回填 L1。
+
+        参数:
+            key: 缓存键
+
+        返回:
+            缓存的数据，如果不存在或已过期则返回 None
+        """
+        now = time.time()
+        entry = self._l1_get(key, now)
+        if entry is not None:
+            logger.debug(f"缓存命中 (L1): {key}")
+            return entry.data
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, etag, last_modified FROM cache_entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if now > row[1]:
+                # 带校验值的条目保留在磁盘，供条件重新验证
+                if row[2] is None and row[3] is None:
+                    self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                logger.debug(f"缓存已过期: {key}")
+                return None
+
+        data = self._load(key, row[0])
+        if data is None:
+            return None
+        self._remember(key, CacheEntry(data, row[1], row[2], row[3]))
+        logger.debug(f"缓存命中 (磁盘): {key}")
+        return data
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """
+        设置缓存值（同时写入 L1 和 SQLite）
+
+        参数:
+            key: 缓存键
+            value: 要缓存的数据（dict / list / 基础类型或 EMPTY，可 JSON 编码）
+            ttl: 生存时间（秒），不指定则使用默认值
+            etag: 上游 ETag（可选）
+            last_modified: 上游 Last-Modified（可选）
+        """
+        ttl = ttl if ttl is not None else self._default_ttl
+        expires_at = time.time() + ttl
+        payload = _encode_value(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, expires_at, etag, last_modified),
+            )
+        self._remember(key, CacheEntry(value, expires_at, etag, last_modified))
+        logger.debug(f"缓存设置: {key} (TTL={ttl}秒)")
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        """
+        获取缓存条目（不检查过期，L1 未命中时查磁盘）
+
+        参数:
+            key: 缓存键
+
+        返回:
+            缓存条目，不存在则返回 None
+        """
+        entry = self._l1_peek(key)
+        if entry is not None:
+            return entry
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, etag, last_modified FROM cache_entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        data = self._load(key, row[0])
+        if data is None:
+            return None
+        return CacheEntry(data, row[1], row[2], row[3])
+
+    def touch(self, key: str, ttl: Optional[int] = None) -> bool:
+        """
+        续期缓存条目（L1 与磁盘同时更新）
+
+        参数:
+            key: 缓存键
+            ttl: 新的生存时间（秒），不指定则使用默认值
+
+        返回:
+            条目存在并已续期返回 True
+        """
+        ttl = ttl if ttl is not None else self._default_ttl
+        expires_at = time.time() + ttl
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE cache_entries SET expires_at = ? WHERE key = ?", (expires_at, key)
+            )
+        entry = self._l1_peek(key)
+        if entry is not None:
+            entry.expires_at = expires_at
+        logger.debug(f"缓存续期: {key} (TTL={ttl}秒)")
+        return cursor.rowcount > 0
+
+    def delete(self, key: str) -> None:
+        """
+        删除指定缓存
+
+        参数:
+            key: 要删除的缓存键
+        """
+        self._l1_discard(key)
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """清空所有缓存（含磁盘）"""
+        self._l1_clear()
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+
+    def cleanup_expired(self) -> int:
+        """
+        清理所有过期的缓存条目
+
+        与 MemoryCache 一致：带校验值的条目在过期后再保留 STALE_GRACE 秒，
+        供条件重新验证（L1 中的过期条目直接移除，get_stale 会回查磁盘）。
+
+        返回:
+            从磁盘清理的条目数量
+        """
+        now = time.time()
+        self._l1_cleanup(now)
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE "
+                "(expires_at < ? AND etag IS NULL AND last_modified IS NULL) OR expires_at < ?",
+                (now, now - self.STALE_GRACE),
+            )
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """停止后台清理并关闭 SQLite 连接"""
+        self.stop_eviction()
+        with self._lock:
+            self._conn.close()
+
+
+class RedisCache(_TieredCache):
+    """
+    Redis 共享缓存类
+
+    两级结构（与 DiskCache 相同）：
+    - L1: 进程内 LRU 字典（默认 256 条），同一 worker 连续请求同一 key 时不访问 Redis
+    - L2: Redis，值为 JSON 编码的 [expires_at, etag, last_modified] 头部 + 换行 + 数据（_encode_value），
+      多个 worker / 实例共享，同一份 K 线只向数据提供者请求一次
+
+    Redis 键的过期时间与条目一致（带校验值的条目额外保留 STALE_GRACE 秒），
+    无需后台清理 L2。get_many() 用一次 MGET 取回 L1 未命中的多个 key。
+
+    需要安装 redis 包（pip install redis），仅在 CACHE_TYPE=redis 时导入。
+
+    属性:
+        prefix: Redis 键前缀
+        _l1_size: L1 热层最大条目数
+    """
+
+    def __init__(
+        self,
+        url: str,
+        default_ttl: int = 60,
+        l1_size: int = 256,
+        prefix: str = "klinelens:",
+    ):
+        """
+        初始化 Redis 缓存
+
+        参数:
+            url: Redis 连接地址（如 redis://localhost:6379/0）
+            default_ttl: 默认生存时间，单位秒，默认 60 秒
+            l1_size: 内存热层最大条目数，默认 256
+            prefix: Redis 键前缀，默认 klinelens:
+        """
+        import redis
+
+        super().__init__(default_ttl=default_ttl, l1_size=l1_size)
+        self.prefix = prefix
+        # 客户端自带连接池，线程池中的并发调用可直接共享
+        self._client = redis.Redis.from_url(url)
+
+    @staticmethod
+    def _pack(entry: CacheEntry) -> bytes:
+        """编码 Redis 中的值（JSON 头部不含换行，以第一个换行分隔数据）"""
+        head = orjson.dumps([entry.expires_at, entry.etag, entry.last_modified])
+        return head + b"\n" + _encode_value(entry.data)
+
+    @staticmethod
+    def _unpack(key: str, payload: Optional[bytes]) -> Optional[CacheEntry]:
+        """解码 _pack 的结果；不存在或无法解码（如旧版 pickle 值）时返回 None"""
+        if payload is None:
+            return None
+        head, _, body = payload.partition(b"\n")
+        try:
+            expires_at, etag, last_modified = orjson.loads(head)
+            return CacheEntry(_decode_value(body), expires_at, etag, last_modified)
+        except (orjson.JSONDecodeError, TypeError, ValueError):
+            logger.debug(f"忽略无法解码的缓存条目: {key}")
+            return None
+
+    def _load(self, key: str, payload: Optional[bytes], now: float) -> Optional[Any]:
+        """解析 Redis 中的值，未过期时回填 L1 并返回数据"""
+        entry = self._unpack(key, payload)
+        if entry is None:
+            return None
+        if now > entry.expires_at:
+            # 带校验值的过期条目仍在 Redis 中，供条件重新验证
+            logger.debug(f"缓存已过期: {key}")
+            return None
+        self._remember(key, entry)
+        logger.debug(f"缓存命中 (Redis): {key}")
+        return entry.data
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        获取缓存值
+
+        先查 L1 热层，未命中再查 Redis，命中后回填 L1。
+
+        参数:
+            key: 缓存键
+
+        返回:
+            缓存的数据，如果不存在或已过期则返回 None
+        """
+        now = time.time()
+        entry = self._l1_get(key, now)
+        if entry is not None:
+            logger.debug(f"缓存命中 (L1): {key}")
+            return entry.data
+        return self._load(key, self._client.get(self.prefix + key), now)
+
+    def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        批量获取缓存值（L1 未命中的 key 一次 MGET）
+
+        参数:
+            keys: 缓存键列表
+
+        返回:
+            与 keys 一一对应的缓存数据（不存在或已过期为 None）
+        """
+        now = time.time()
+        results: List[Optional[Any]] = []
+        missing: List[int] = []
+        for i, key in enumerate(keys):
+            entry = self._l1_get(key, now)
+            results.append(entry.data if entry is not None else None)
+            if entry is None:
+                missing.append(i)
+
+        if missing:
+            payloads = self._client.mget([self.prefix + keys[i] for i in missing])
+            for i, payload in zip(missing, payloads):
+                results[i] = self._load(keys[i], payload, now)
+        return results
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """
+        设置缓存值（同时写入 L1 和 Redis）
+
+        参数:
+            key: 缓存键
+            value: 要缓存的数据（dict / list / 基础类型或 EMPTY，可 JSON 编码）
+            ttl: 生存时间（秒），不指定则使用默认值
+            etag: 上游 ETag（可选）
+            last_modified: 上游 Last-Modified（可选）
+        """
+        ttl = ttl if ttl is not None else self._default_ttl
+        entry = CacheEntry(value, time.time() + ttl, etag, last_modified)
+        self._store(key, entry)
+        self._remember(key, entry)
+        logger.debug(f"缓存设置: {key} (TTL={ttl}秒)")
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        """写入 Redis，键的过期时间与条目的淘汰时间一致"""
+        px = max(1, int((self._evict_at(entry) - time.time()) * 1000))
+        self._client.set(self.prefix + key, self._pack(entry), px=px)
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        """
+        获取缓存条目（不检查过期，L1 未命中时查 Redis）
+
+        参数:
+            key: 缓存键
+
+        返回:
+            缓存条目，不存在则返回 None
+        """
+        entry = self._l1_peek(key)
+        if entry is not None:
+            return entry
+        return self._unpack(key, self._client.get(self.prefix + key))
+
+    def touch(self, key: str, ttl: Optional[int] = None) -> bool:
+        """
+        续期缓存条目（L1 与 Redis 同时更新）
+
+        参数:
+            key: 缓存键
+            ttl: 新的生存时间（秒），不指定则使用默认值
+
+        返回:
+            条目存在并已续期返回 True
+        """
+        entry = self.get_stale(key)
+        if entry is None:
+            return False
+        ttl = ttl if ttl is not None else self._default_ttl
+        entry = CacheEntry(entry.data, time.time() + ttl, entry.etag, entry.last_modified)
+        self._store(key, entry)
+        self._remember(key, entry)
+        logger.debug(f"缓存续期: {key} (TTL={ttl}秒)")
+        return True
+
+    def delete(self, key: str) -> None:
+        """
+        删除指定缓存
+
+        参数:
+            key: 要删除的缓存键
+        """
+        self._l1_discard(key)
+        self._client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        """清空所有缓存（含 Redis 中带本前缀的键）"""
+        self._l1_clear()
+        keys = list(self._client.scan_iter(match=self.prefix + "*", count=500))
+        if keys:
+            self._client.delete(*keys)
+
+    def cleanup_expired(self) -> int:
+        """
+        清理 L1 中过期的条目（Redis 中的键自动过期）
+
+        返回:
+            清理的条目数量
+        """
+        return self._l1_cleanup(time.time())
+
+    def close(self) -> None:
+        """停止后台清理并关闭 Redis 连接池"""
+        self.stop_eviction()
+        self._client.close()
 
 
 # 全局缓存实例
 _cache: Optional[MemoryCache] = None
 
 
-def get_cache(default_ttl: int = 60) -> MemoryCache:
+def get_cache(
+    default_ttl: int = 60,
+    cache_type: str = "memory",
+    path: Optional[str] = None,
+    url: Optional[str] = None,
+) -> MemoryCache:
     """
     获取或创建全局缓存实例
 
@@ -141,22 +863,42 @@ def get_cache(default_ttl: int = 60) -> MemoryCache:
 
     参数:
         default_ttl: 默认生存时间（秒）
+        cache_type: 缓存类型（memory / disk / redis）
+        path: disk 模式下的 SQLite 文件路径（默认 apps/api/data/cache.db）
+        url: redis 模式下的连接地址
+
+    异常:
+        ValueError: redis 模式未提供 url
 
     返回:
-        全局 MemoryCache 实例
+        全局缓存实例
     """
     global _cache
     if _cache is None:
-        _cache = MemoryCache(default_ttl=default_ttl)
+        if cache_type == "disk":
+            if path is None:
+                path = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache.db')
+            _cache = DiskCache(path=path, default_ttl=default_ttl)
+        elif cache_type == "redis":
+            if not url:
+                raise ValueError("CACHE_TYPE=redis 需要配置 REDIS_URL")
+            _cache = RedisCache(url=url, default_ttl=default_ttl)
+        else:
+            _cache = MemoryCache(default_ttl=default_ttl)
+        _cache.start_eviction()
     return _cache
 
 
+@lru_cache(maxsize=4096)
 def cache_key(ticker: str, timeframe: str, window: str) -> str:
     """
     生成 K 线数据的缓存键
 
     格式: bars:{TICKER}:{timeframe}:{window}
 
+    结果按 (ticker, timeframe, window) 记忆化并驻留（sys.intern），
+    轮询同一组 key 时不再重复拼接字符串，字典查找也可直接比较指针。
+
     参数:
         ticker: 股票代码
         timeframe: K线周期
@@ -165,4 +907,26 @@ def cache_key(ticker: str, timeframe: str, window: str) -> str:
     返回:
         格式化的缓存键字符串
     """
-    return f"bars:{ticker.upper()}:{timeframe}:{window}"
+    return sys.intern(f"bars:{ticker.upper()}:{timeframe}:{window}")
+
+
+# K 线周期 -> TTL 映射
+_TIMEFRAME_TTL: Dict[str, int] = {
+    "1m": CacheTTL.INTRADAY_1M,
+    "5m": CacheTTL.INTRADAY_5M,
+    "1d": CacheTTL.DAILY,
+}
+
+
+def ttl_for_timeframe(timeframe: str, default: Optional[int] = None) -> Optional[int]:
+    """
+    根据 K 线周期选择缓存 TTL
+
+    参数:
+        timeframe: K线周期（1m, 5m, 1d）
+        default: 未知周期时的返回值（None 表示使用缓存默认 TTL）
+
+    返回:
+        TTL 秒数
+    """
+    return _TIMEFRAME_TTL.get(timeframe, default)
@@ -1,12 +1,12 @@
 """
 配置管理模块
 
-使用 pydantic-settings 从环境变量加载应用配置。
-支持 .env 文件和环境变量两种配置方式。
+从环境变量和 .env 文件加载应用配置（环境变量优先，变量名不区分大小写）。
+只依赖标准库：Settings 是不可变 dataclass，避免启动时导入 pydantic-settings。
 
 配置项:
 - provider: 数据提供者（默认 yfinance）
-- cache_type: 缓存类型（默认 memory）
+- cache_type: 缓存类型（默认 memory，可选 disk 持久化）
 - cache_ttl: 缓存生存时间（默认 60 秒）
 - log_level: 日志级别（默认 INFO）
 - cors_origins: 允许的跨域来源
@@ -14,22 +14,82 @@
 使用示例:
     from .config import settings
     print(settings.cache_ttl)  # 60
+
+    # 或通过 get_settings()（进程内只解析一次 .env）
+    from .config import get_settings
+    print(get_settings().cache_ttl)
 """
 
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import os
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+
+class CacheTTL:
+    """
+    按数据类别划分的缓存 TTL（秒）
+
+    与行情数据的更新节奏对齐：分钟线变化快，日线和基础信息变化慢。
+    未在此列出的数据仍使用 Settings.cache_ttl。
+    """
+    INTRADAY_1M = 30  # 1 分钟线
+    INTRADAY_5M = 300  # 5 分钟线（一根 K 线周期）
+    DAILY = 3600  # 日线
+    INFO = 604800  # 股票基础信息（7 天）
+
+
+def _read_env_file(path: str) -> Dict[str, str]:
+    """
+    解析 .env 文件
+
+    支持 KEY=VALUE、export 前缀、引号包裹的值和行尾 # 注释。
 
+    参数:
+        path: .env 文件路径
 
-class Settings(BaseSettings):
+    返回:
+        {大写变量名: 值}，文件不存在时返回空字典
+    """
+    values: Dict[str, str] = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return values
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        if line.startswith("export "):
+            line = line[len("export "):]
+        key, value = line.split("=", 1)
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
+            value = value[1:-1]
+        else:
+            value = value.split(" #", 1)[0].rstrip()
+        values[key.strip().upper()] = value
+    return values
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
     """
     应用配置类
 
-    从环境变量或 .env 文件加载配置。
+    通过 Settings.from_env() 从环境变量或 .env 文件加载配置。
     所有配置项都有默认值，可以直接使用。
 
     属性:
         provider: 数据提供者名称 (yfinance, alphavantage)
-        cache_type: 缓存类型 (memory/redis)
+        cache_type: 缓存类型 (memory/disk/redis)
+        cache_path: disk 缓存的 SQLite 文件路径（留空使用 data/cache.db）
+        redis_url: redis 缓存的连接地址（如 redis://localhost:6379/0）
         cache_ttl: 缓存生存时间（秒）
+        analysis_workers: analyze_market 进程池大小（0 表示 CPU 核数）
+        llm_max_concurrency: 批量叙事同时进行的 LLM 请求上限
         log_level: 日志级别
         cors_origins: 允许的跨域来源，多个用逗号分隔
         alphavantage_api_key: Alpha Vantage API 密钥（使用 alphavantage 时必需）
@@ -56,21 +116,83 @@ class Settings(BaseSettings):
     llm_model: str = ""  # 短评模型（留空使用默认: gpt-4o-mini）
     llm_model_full: str = ""  # 完整报告模型（留空使用默认: gpt-4o）
     llm_base_url: str = ""  # OpenAI 兼容 API 的 base URL（可选）
+    llm_max_concurrency: int = 4  # 批量叙事同时进行的 LLM 请求上限（单次叙事不受限）
 
     # 缓存配置
-    cache_type: str = "memory"  # memory 或 redis
+    cache_type: str = "memory"  # memory / disk（SQLite 持久化，重启后仍有效）/ redis
+    cache_path: str = ""  # disk 缓存文件路径（留空使用 data/cache.db）
+    redis_url: str = ""  # redis 缓存连接地址（CACHE_TYPE=redis 时必需）
     cache_ttl: int = 60  # 缓存生存时间（秒）
 
+    # 分析配置
+    analysis_workers: int = 0  # 分析进程数（0 = CPU 核数）
+
     # 服务器配置
     log_level: str = "INFO"  # DEBUG, INFO, WARNING, ERROR
     cors_origins: str = "*"  # 允许的跨域来源，* 表示允许所有
 
-    # Pydantic V2 配置
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8"
-    )
+    @property
+    def cors_origin_list(self) -> Tuple[str, ...]:
+        """
+        解析后的跨域来源列表（去空格、去空项）
+
+        返回:
+            来源元组，如 ("http://localhost:3000",)；包含 "*" 表示允许所有
+        """
+        return tuple(o.strip() for o in self.cors_origins.split(",") if o.strip())
+
+    @classmethod
+    def from_env(
+        cls,
+        env_file: Optional[str] = ".env",
+        environ: Optional[Dict[str, str]] = None,
+    ) -> "Settings":
+        """
+        从环境变量和 .env 文件构建配置
+
+        参数:
+            env_file: .env 文件路径（None 表示不读取）
+            environ: 环境变量字典（默认 os.environ）
+
+        返回:
+            Settings 实例
+
+        异常:
+            ValueError: 整数配置项的值无法解析
+        """
+        environ = os.environ if environ is None else environ
+        file_values = _read_env_file(env_file) if env_file else {}
+        env_values = {key.upper(): value for key, value in environ.items()}
+
+        kwargs = {}
+        for field in fields(cls):
+            name = field.name.upper()
+            if name in env_values:
+                raw = env_values[name]
+            elif name in file_values:
+                raw = file_values[name]
+            else:
+                continue
+            try:
+                kwargs[field.name] = field.type(raw)
+            except ValueError:
+                raise ValueError(f"配置项 {name} 的值无效: {raw!r}")
+        return cls(**kwargs)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    获取全局配置实例
+
+    首次调用时读取环境变量和 .env，之后直接返回同一实例。
+    测试中可调用 get_settings.cache_clear() 重新加载。
+
+    返回:
+        Settings 单例
+    """
+    return Settings.from_env()
 
 
-# 全局配置实例（单例）
-settings = Settings()
+# 全局配置实例（单例，兼容 from .config import settings）
+settings = get_settings()
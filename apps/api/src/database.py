@@ -6,15 +6,17 @@ SQLite database for storing and retrieving signal evaluation records.
 
 import os
 import sqlite3
-import uuid
-from datetime import datetime
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass, asdict
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, FrozenSet, Iterator, Tuple
+from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SignalEvaluation:
-    """Signal evaluation record"""
+    """Signal evaluation record (field order matches _EVALUATION_COLUMNS)"""
     id: str
     ticker: str
     tf: str
@@ -45,31 +47,196 @@ class EvaluationStatistics:
     by_signal_type: Dict[str, Dict[str, Any]]
 
 
-class SignalEvaluationDB:
+# Explicit column list in SignalEvaluation field order, so rows can be
+# passed positionally: SignalEvaluation(*row)
+_EVALUATION_COLUMNS = (
+    'id, ticker, tf, created_at, signal_type, direction, predicted_behavior, '
+    'entry_price, target_price, invalidation_price, confidence, notes, status, '
+    'result, actual_outcome, evaluation_notes, evaluated_at'
+)
+
+_INSERT_EVALUATION_SQL = '''
+    INSERT INTO signal_evaluations
+    (id, ticker, tf, created_at, signal_type, direction, predicted_behavior,
+     entry_price, target_price, invalidation_price, confidence, notes, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# ISO-8601 UTC timestamp with milliseconds, computed by SQLite at write time
+# (same format as utc_timestamp())
+_SQL_NOW = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+_UPDATE_EVALUATION_SQL = f'''
+    UPDATE signal_evaluations
+    SET status = ?, result = ?, actual_outcome = ?, evaluation_notes = ?, evaluated_at = {_SQL_NOW}
+    WHERE id = ?
+'''
+# Single-row variant that hands back the updated row in the same statement
+_UPDATE_RETURNING_EVALUATION_SQL = f'{_UPDATE_EVALUATION_SQL} RETURNING {_EVALUATION_COLUMNS}'
+
+# Fixed SQL text is kept in module constants so every call hands sqlite3 the
+# same string and hits the connection's prepared-statement cache instead of
+# re-formatting and re-preparing it.
+_SELECT_EVALUATION_SQL = f'SELECT {_EVALUATION_COLUMNS} FROM signal_evaluations WHERE id = ?'
+_DELETE_EVALUATION_SQL = 'DELETE FROM signal_evaluations WHERE id = ?'
+
+# Explicit column list in WatchlistItem field order: WatchlistItem(*row)
+_WATCHLIST_COLUMNS = 'ticker, added_at, note'
+
+_CREATE_WATCHLIST_SQL = f'''
+    CREATE TABLE IF NOT EXISTS {{table}} (
+        ticker TEXT PRIMARY KEY COLLATE NOCASE,
+        added_at TEXT NOT NULL DEFAULT ({_SQL_NOW}),
+        note TEXT
+    )
+'''
+_LIST_WATCHLIST_SQL = f'SELECT {_WATCHLIST_COLUMNS} FROM watchlist ORDER BY added_at ASC'
+_LIST_WATCHLIST_TICKERS_SQL = 'SELECT ticker FROM watchlist'
+_SELECT_WATCHLIST_SQL = f'SELECT {_WATCHLIST_COLUMNS} FROM watchlist WHERE ticker = ?'
+# Insert only while below the item limit; the ticker PRIMARY KEY plus
+# OR IGNORE turns a duplicate into a no-op, so one statement does
+# check-exists + check-limit + insert
+_INSERT_WATCHLIST_SQL = f'''
+    INSERT OR IGNORE INTO watchlist (ticker, added_at, note)
+    SELECT ?, {_SQL_NOW}, ?
+    WHERE (SELECT COUNT(*) FROM watchlist) < ?
+'''
+_EXISTS_WATCHLIST_SQL = 'SELECT 1 FROM watchlist WHERE ticker = ?'
+_DELETE_WATCHLIST_SQL = 'DELETE FROM watchlist WHERE ticker = ?'
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+_CACHED_STATEMENTS = 256
+
+# Rows fetched per batch when streaming results with iter_list()
+_FETCH_BATCH = 256
+
+
+# Default path: apps/api/data/klinelens.db (shared by both DB classes)
+_DEFAULT_DB_PATH = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'klinelens.db')
+)
+
+
+@lru_cache(maxsize=None)
+def _default_db_path() -> str:
+    """Return _DEFAULT_DB_PATH, creating its directory on first use only"""
+    os.makedirs(os.path.dirname(_DEFAULT_DB_PATH), exist_ok=True)
+    return _DEFAULT_DB_PATH
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Open a long-lived connection in autocommit mode with performance pragmas
+
+    The connection may be used from several threads; callers serialize access
+    with their own lock.
+    """
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=_CACHED_STATEMENTS,
+    )
+    # page_size only applies to a new, empty file and must precede WAL mode;
+    # on an existing database it is a no-op
+    conn.execute('PRAGMA page_size=8192')
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-65536')  # 64 MB page cache
+    # Memory-map up to 256 MB so reads of hot pages skip read() syscalls;
+    # this reserves address space, not resident memory
+    conn.execute('PRAGMA mmap_size=268435456')
+    return conn
+
+
+def _cache_lookup(cache: Dict[Any, Tuple[float, Any]], key: Any) -> Any:
+    """Return the value cached under key, or None if missing or expired"""
+    cached = cache.get(key)
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+    return None
+
+
+def _status_total(stats: EvaluationStatistics, status: Optional[str]) -> Optional[int]:
+    """Row count for a status filter as already tallied in stats, or None if not tallied"""
+    if status is None:
+        return stats.total_predictions
+    if status in ('pending', 'correct', 'incorrect'):
+        return getattr(stats, status)
+    return None
+
+
+def utc_timestamp() -> str:
+    """Current UTC time as ISO-8601 with milliseconds, e.g. 2026-01-15T14:30:00.123Z"""
+    ns = time.time_ns()
+    seconds, millis = divmod(ns // 1_000_000, 1000)
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(seconds))}.{millis:03d}Z"
+
+
+class _Store:
+    """Connection handling shared by SignalEvaluationDB and WatchlistDB
+
+    Holds one long-lived connection (WAL mode) for the lifetime of the
+    instance instead of reconnecting on every call. Access is serialized
+    with a lock because FastAPI may call in from worker threads.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, database: Optional["Database"] = None):
+        """Initialize database connection
+
+        Pass `database` to share its connection and lock instead of opening a
+        connection of its own.
+        """
+        self._owns_conn = database is None
+        if database is None:
+            self.db_path = db_path or _default_db_path()
+            self._lock = threading.Lock()
+            self._conn = _connect(self.db_path)
+        else:
+            self.db_path = database.db_path
+            self._lock = database.lock
+            self._conn = database.conn
+
+    def close(self):
+        """Close the connection, unless it belongs to a shared Database"""
+        if self._owns_conn:
+            with self._lock:
+                self._conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed statements in one transaction (caller holds the lock)"""
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield self._conn
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._conn.execute('COMMIT')
+
+
+class SignalEvaluationDB(_Store):
     """SQLite database for signal evaluations"""
 
-    def __init__(self, db_path: Optional[str] = None):
-        """Initialize database connection"""
-        if db_path is None:
-            # Default path: apps/api/data/klinelens.db
-            data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-            os.makedirs(data_dir, exist_ok=True)
-            db_path = os.path.join(data_dir, 'klinelens.db')
-
-        self.db_path = db_path
+    STATS_TTL = 60  # seconds a cached get_statistics() result stays valid
+    COUNT_TTL = 1  # seconds a cached count() result stays valid
+
+    def __init__(self, db_path: Optional[str] = None, database: Optional["Database"] = None):
+        """Initialize database connection (see _Store.__init__)"""
+        super().__init__(db_path, database)
+        self._stats_cache: Dict[Tuple[str, Optional[str]], Tuple[float, EvaluationStatistics]] = {}
+        self._count_cache: Dict[Tuple[str, Optional[str], Optional[str]], Tuple[float, int]] = {}
         self._init_db()
 
     def _init_db(self):
         """Create tables if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute('''
+        with self._lock:
+            self._conn.execute(f'''
                 CREATE TABLE IF NOT EXISTS signal_evaluations (
                     id TEXT PRIMARY KEY,
                     ticker TEXT NOT NULL,
                     tf TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
+                    created_at TEXT NOT NULL DEFAULT ({_SQL_NOW}),
                     signal_type TEXT NOT NULL,
                     direction TEXT NOT NULL,
                     predicted_behavior TEXT NOT NULL,
@@ -87,57 +254,62 @@ class SignalEvaluationDB:
             ''')
 
             # Create indexes
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_ticker_tf ON signal_evaluations(ticker, tf)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_status ON signal_evaluations(status)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON signal_evaluations(created_at)')
-
-            conn.commit()
-        finally:
-            conn.close()
+            # (ticker, tf, created_at DESC, id DESC, status) serves list() and its
+            # (created_at, id) keyset cursor without a sort step; it supersedes the
+            # old (ticker, tf) and (ticker, tf, created_at DESC, status) indexes
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_tkr_tf_created_id
+                ON signal_evaluations(ticker, tf, created_at DESC, id DESC, status)
+            ''')
+            # (ticker, tf, signal_type, status) covers the statistics query, so
+            # the aggregation reads only the index and never touches table rows
+            self._conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_stats_cover
+                ON signal_evaluations(ticker, tf, signal_type, status)
+            ''')
+            self._conn.execute('DROP INDEX IF EXISTS idx_ticker_tf')
+            self._conn.execute('DROP INDEX IF EXISTS idx_tkr_tf_created')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_status ON signal_evaluations(status)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_created_at ON signal_evaluations(created_at)')
 
     def create(self, evaluation: SignalEvaluation) -> SignalEvaluation:
         """Create a new signal evaluation record"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO signal_evaluations
-                (id, ticker, tf, created_at, signal_type, direction, predicted_behavior,
-                 entry_price, target_price, invalidation_price, confidence, notes, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                evaluation.id,
-                evaluation.ticker,
-                evaluation.tf,
-                evaluation.created_at,
-                evaluation.signal_type,
-                evaluation.direction,
-                evaluation.predicted_behavior,
-                evaluation.entry_price,
-                evaluation.target_price,
-                evaluation.invalidation_price,
-                evaluation.confidence,
-                evaluation.notes,
-                evaluation.status,
-            ))
-            conn.commit()
-            return evaluation
-        finally:
-            conn.close()
+        return self.create_many([evaluation])[0]
+
+    def create_many(self, evaluations: List[SignalEvaluation]) -> List[SignalEvaluation]:
+        """Create several evaluation records with one executemany in a single transaction"""
+        rows = [
+            (
+                e.id,
+                e.ticker,
+                e.tf,
+                e.created_at,
+                e.signal_type,
+                e.direction,
+                e.predicted_behavior,
+                e.entry_price,
+                e.target_price,
+                e.invalidation_price,
+                e.confidence,
+                e.notes,
+                e.status,
+            )
+            for e in evaluations
+        ]
+        with self._lock:
+            with self._transaction() as conn:
+                conn.executemany(_INSERT_EVALUATION_SQL, rows)
+            for ticker in {e.ticker for e in evaluations}:
+                self._invalidate_caches(ticker)
+        return evaluations
 
     def get(self, eval_id: str) -> Optional[SignalEvaluation]:
         """Get a single evaluation by ID"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM signal_evaluations WHERE id = ?', (eval_id,))
-            row = cursor.fetchone()
-            if row:
-                return SignalEvaluation(**dict(row))
-            return None
-        finally:
-            conn.close()
+        with self._lock:
+            row = self._conn.execute(_SELECT_EVALUATION_SQL, (eval_id,)).fetchone()
+        if row:
+            return SignalEvaluation(*row)
+        return None
 
     def list(
         self,
@@ -145,33 +317,89 @@ class SignalEvaluationDB:
         tf: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0
+        offset: int = 0,
+        before: Optional[str] = None,
+        before_key: Optional[Tuple[str, str]] = None
     ) -> List[SignalEvaluation]:
-        """List evaluations with filters"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            cursor = conn.cursor()
-
-            query = 'SELECT * FROM signal_evaluations WHERE ticker = ?'
-            params = [ticker]
-
-            if tf:
-                query += ' AND tf = ?'
-                params.append(tf)
+        """
+        List evaluations with filters, newest first.
 
-            if status:
-                query += ' AND status = ?'
-                params.append(status)
+        Pass the (created_at, id) of the last row seen as `before_key` to fetch
+        the next page via the (ticker, tf, created_at, id) index instead of
+        skipping `offset` rows; the id breaks ties between rows created in the
+        same millisecond. `before` (created_at only) is kept for older callers.
+        """
+        query, params = self._list_query(ticker, tf, status, limit, offset, before, before_key)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [SignalEvaluation(*row) for row in rows]
 
-            query += ' ORDER BY created_at DESC LIMIT ? OFFSET ?'
-            params.extend([limit, offset])
+    def iter_list(
+        self,
+        ticker: str,
+        tf: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        before: Optional[str] = None,
+        before_key: Optional[Tuple[str, str]] = None
+    ) -> Iterator[SignalEvaluation]:
+        """
+        Same as list(), but yields rows as they are read.
 
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            return [SignalEvaluation(**dict(row)) for row in rows]
-        finally:
-            conn.close()
+        Rows are fetched _FETCH_BATCH at a time, so only one batch is held in
+        memory. Each batch is its own keyset query continuing from the
+        (created_at, id) of the previous batch's last row, so no cursor stays
+        open on the shared connection between yields and the lock is held
+        only while a batch is read; a slow consumer does not block other callers.
+        """
+        remaining = limit
+        while remaining > 0:
+            batch = min(_FETCH_BATCH, remaining)
+            query, params = self._list_query(ticker, tf, status, batch, offset, before, before_key)
+            with self._lock:
+                rows = self._conn.execute(query, params).fetchall()
+            records = [SignalEvaluation(*row) for row in rows]
+            yield from records
+            if len(records) < batch:
+                return
+            remaining -= batch
+            offset = 0
+            before_key = (records[-1].created_at, records[-1].id)
+
+    @staticmethod
+    def _list_query(
+        ticker: str,
+        tf: Optional[str],
+        status: Optional[str],
+        limit: int,
+        offset: int,
+        before: Optional[str],
+        before_key: Optional[Tuple[str, str]] = None
+    ) -> Tuple[str, List[Any]]:
+        """Build the SELECT used by list() and iter_list()"""
+        query = f'SELECT {_EVALUATION_COLUMNS} FROM signal_evaluations WHERE ticker = ?'
+        params: List[Any] = [ticker]
+
+        if tf:
+            query += ' AND tf = ?'
+            params.append(tf)
+
+        if status:
+            query += ' AND status = ?'
+            params.append(status)
+
+        if before:
+            query += ' AND created_at < ?'
+            params.append(before)
+
+        if before_key:
+            query += ' AND (created_at, id) < (?, ?)'
+            params.extend(before_key)
+
+        query += ' ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?'
+        params.extend([limit, offset])
+        return query, params
 
     def count(
         self,
@@ -179,26 +407,73 @@ class SignalEvaluationDB:
         tf: Optional[str] = None,
         status: Optional[str] = None
     ) -> int:
-        """Count evaluations with filters"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
+        """Count evaluations with filters
 
-            query = 'SELECT COUNT(*) FROM signal_evaluations WHERE ticker = ?'
-            params = [ticker]
-
-            if tf:
-                query += ' AND tf = ?'
-                params.append(tf)
-
-            if status:
-                query += ' AND status = ?'
-                params.append(status)
+        Results are cached per (ticker, tf, status) for COUNT_TTL seconds, since
+        UIs poll this; writes to the ticker drop the cached counts immediately.
+        """
+        key = (ticker, tf, status)
+        with self._lock:
+            total = _cache_lookup(self._count_cache, key)
+            if total is None:
+                total = self._query_count(ticker, tf, status)
+                self._count_cache[key] = (time.monotonic() + self.COUNT_TTL, total)
+        return total
+
+    def _query_count(self, ticker: str, tf: Optional[str], status: Optional[str]) -> int:
+        """Count evaluations from the table (caller holds the lock)"""
+        query = 'SELECT COUNT(*) FROM signal_evaluations WHERE ticker = ?'
+        params = [ticker]
+
+        if tf:
+            query += ' AND tf = ?'
+            params.append(tf)
+
+        if status:
+            query += ' AND status = ?'
+            params.append(status)
+
+        return self._conn.execute(query, params).fetchone()[0]
+
+    def list_with_stats(
+        self,
+        ticker: str,
+        tf: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        before: Optional[str] = None,
+        before_key: Optional[Tuple[str, str]] = None
+    ) -> Tuple[List[SignalEvaluation], int, EvaluationStatistics]:
+        """
+        Return (records, total, statistics) as list(), count() and
+        get_statistics() would, in one call.
 
-            cursor.execute(query, params)
-            return cursor.fetchone()[0]
-        finally:
-            conn.close()
+        The lock is taken once for all three reads, so the API needs a single
+        worker-thread hop per request. On a statistics miss the total is read
+        off the freshly grouped statistics (they already count rows per status)
+        instead of issuing a separate COUNT(*).
+        """
+        query, params = self._list_query(ticker, tf, status, limit, offset, before, before_key)
+        stats_key = (ticker, tf)
+        count_key = (ticker, tf, status)
+
+        # Cache lookups, queries and stores share one critical section, so a
+        # write's invalidation cannot land between a query and its store
+        with self._lock:
+            stats = _cache_lookup(self._stats_cache, stats_key)
+            total = _cache_lookup(self._count_cache, count_key)
+            rows = self._conn.execute(query, params).fetchall()
+            if stats is None:
+                stats = self._query_statistics(ticker, tf)
+                self._stats_cache[stats_key] = (time.monotonic() + self.STATS_TTL, stats)
+                if total is None:
+                    total = _status_total(stats, status)
+            if total is None:
+                total = self._query_count(ticker, tf, status)
+            self._count_cache[count_key] = (time.monotonic() + self.COUNT_TTL, total)
+
+        return [SignalEvaluation(*row) for row in rows], total, stats
 
     def update(
         self,
@@ -208,198 +483,254 @@ class SignalEvaluationDB:
         actual_outcome: str,
         evaluation_notes: Optional[str] = None
     ) -> Optional[SignalEvaluation]:
-        """Update evaluation result"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE signal_evaluations
-                SET status = ?, result = ?, actual_outcome = ?, evaluation_notes = ?, evaluated_at = ?
-                WHERE id = ?
-            ''', (
+        """Update evaluation result
+
+        UPDATE ... RETURNING writes the row and reads it back in a single
+        statement, so the caller sees exactly the row it wrote.
+        """
+        with self._lock:
+            # fetchall() steps the statement to completion so the autocommit write lands
+            rows = self._conn.execute(_UPDATE_RETURNING_EVALUATION_SQL, (
                 status,
                 result,
                 actual_outcome,
                 evaluation_notes,
-                datetime.utcnow().isoformat() + 'Z',
                 eval_id,
-            ))
-            conn.commit()
+            )).fetchall()
+            evaluation = SignalEvaluation(*rows[0]) if rows else None
+            if evaluation is not None:
+                self._invalidate_caches(evaluation.ticker)
+        return evaluation
 
-            if cursor.rowcount == 0:
-                return None
+    def update_many(
+        self,
+        updates: List[Tuple[str, str, str, str, Optional[str]]]
+    ) -> int:
+        """Apply (eval_id, status, result, actual_outcome, evaluation_notes) updates
+        with one executemany in a single transaction.
 
-            return self.get(eval_id)
-        finally:
-            conn.close()
+        Returns the number of rows updated. Cached statistics are dropped for all
+        tickers, since the affected tickers are not known without another query.
+        """
+        rows = [
+            (status, result, actual_outcome, evaluation_notes, eval_id)
+            for eval_id, status, result, actual_outcome, evaluation_notes in updates
+        ]
+        with self._lock:
+            with self._transaction() as conn:
+                updated = conn.executemany(_UPDATE_EVALUATION_SQL, rows).rowcount
+            if updated:
+                self._invalidate_caches()
+        return updated
 
     def get_statistics(self, ticker: str, tf: Optional[str] = None) -> EvaluationStatistics:
-        """Get evaluation statistics for a ticker"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-
-            # Build base query
-            base_where = 'WHERE ticker = ?'
-            params = [ticker]
-            if tf:
-                base_where += ' AND tf = ?'
-                params.append(tf)
-
-            # Total counts by status
-            cursor.execute(f'''
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = 'correct' THEN 1 ELSE 0 END) as correct,
-                    SUM(CASE WHEN status = 'incorrect' THEN 1 ELSE 0 END) as incorrect,
-                    SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending
-                FROM signal_evaluations {base_where}
-            ''', params)
-            row = cursor.fetchone()
-            total = row[0] or 0
-            correct = row[1] or 0
-            incorrect = row[2] or 0
-            pending = row[3] or 0
-
-            # Accuracy rate (excluding pending)
-            evaluated = correct + incorrect
-            accuracy_rate = correct / evaluated if evaluated > 0 else 0.0
-
-            # By signal type
-            cursor.execute(f'''
-                SELECT
-                    signal_type,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = 'correct' THEN 1 ELSE 0 END) as correct
-                FROM signal_evaluations {base_where}
-                GROUP BY signal_type
-            ''', params)
-
-            by_signal_type = {}
-            for row in cursor.fetchall():
-                sig_type = row[0]
-                sig_total = row[1]
-                sig_correct = row[2]
-                sig_evaluated = sig_total - (sig_total - (sig_correct + (sig_total - sig_correct if sig_correct else sig_total)))
-                # Recalculate evaluated count
-                cursor.execute(f'''
-                    SELECT COUNT(*) FROM signal_evaluations
-                    {base_where} AND signal_type = ? AND status != 'pending'
-                ''', params + [sig_type])
-                sig_evaluated = cursor.fetchone()[0]
-
-                by_signal_type[sig_type] = {
-                    "total": sig_total,
-                    "correct": sig_correct,
-                    "accuracy": sig_correct / sig_evaluated if sig_evaluated > 0 else 0.0
-                }
-
-            return EvaluationStatistics(
-                total_predictions=total,
-                correct=correct,
-                incorrect=incorrect,
-                pending=pending,
-                accuracy_rate=accuracy_rate,
-                by_signal_type=by_signal_type
-            )
-        finally:
-            conn.close()
+        """Get evaluation statistics for a ticker
+
+        Results are cached per (ticker, tf) until a write touches that ticker
+        or STATS_TTL seconds pass (other processes may write to the same file).
+        """
+        key = (ticker, tf)
+        with self._lock:
+            stats = _cache_lookup(self._stats_cache, key)
+            if stats is None:
+                stats = self._query_statistics(ticker, tf)
+                self._stats_cache[key] = (time.monotonic() + self.STATS_TTL, stats)
+        return stats
+
+    def _invalidate_caches(self, ticker: Optional[str] = None):
+        """Drop cached statistics and counts for one ticker, or all tickers if None
+        (caller holds the lock)"""
+        for cache in (self._stats_cache, self._count_cache):
+            if ticker is None:
+                cache.clear()
+                continue
+            for key in [k for k in cache if k[0] == ticker]:
+                cache.pop(key, None)
+
+    def _query_statistics(self, ticker: str, tf: Optional[str] = None) -> EvaluationStatistics:
+        """Compute evaluation statistics from the table (caller holds the lock)"""
+        # Build base query
+        base_where = 'WHERE ticker = ?'
+        params = [ticker]
+        if tf:
+            base_where += ' AND tf = ?'
+            params.append(tf)
+
+        # One grouped pass; overall totals are folded from the per-type rows
+        rows = self._conn.execute(f'''
+            SELECT
+                signal_type,
+                COUNT(*) as total,
+                SUM(CASE WHEN status = 'correct' THEN 1 ELSE 0 END) as correct,
+                SUM(CASE WHEN status = 'incorrect' THEN 1 ELSE 0 END) as incorrect,
+                SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) as pending
+            FROM signal_evaluations {base_where}
+            GROUP BY signal_type
+        ''', params).fetchall()
+
+        total = correct = incorrect = pending = 0
+        by_signal_type = {}
+        for sig_type, sig_total, sig_correct, sig_incorrect, sig_pending in rows:
+            total += sig_total
+            correct += sig_correct
+            incorrect += sig_incorrect
+            pending += sig_pending
+
+            sig_evaluated = sig_total - sig_pending
+            by_signal_type[sig_type] = {
+                "total": sig_total,
+                "correct": sig_correct,
+                "accuracy": sig_correct / sig_evaluated if sig_evaluated > 0 else 0.0
+            }
+
+        # Accuracy rate (excluding pending)
+        evaluated = correct + incorrect
+        accuracy_rate = correct / evaluated if evaluated > 0 else 0.0
+
+        return EvaluationStatistics(
+            total_predictions=total,
+            correct=correct,
+            incorrect=incorrect,
+            pending=pending,
+            accuracy_rate=accuracy_rate,
+            by_signal_type=by_signal_type
+        )
 
     def delete(self, eval_id: str) -> bool:
         """Delete an evaluation record"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM signal_evaluations WHERE id = ?', (eval_id,))
-            conn.commit()
-            return cursor.rowcount > 0
-        finally:
-            conn.close()
+        with self._lock:
+            deleted = self._conn.execute(_DELETE_EVALUATION_SQL, (eval_id,)).rowcount > 0
+            if deleted:
+                self._invalidate_caches()
+        return deleted
+
+
+_CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_ulid_lock = threading.Lock()
+_last_ulid = (0, 0)  # (timestamp ms, random part) of the last generated ULID
+
+
+def _new_ulid() -> str:
+    """Generate a monotonic ULID (48-bit ms timestamp + 80-bit randomness)
+
+    IDs created within the same millisecond increment the random part, so
+    generated IDs always sort in creation order.
+    """
+    global _last_ulid
+    ms = time.time_ns() // 1_000_000
+    with _ulid_lock:
+        last_ms, last_rand = _last_ulid
+        if ms <= last_ms:
+            ms, rand = last_ms, (last_rand + 1) & ((1 << 80) - 1)
+        else:
+            rand = int.from_bytes(os.urandom(10), 'big')
+        _last_ulid = (ms, rand)
+
+    value = (ms << 80) | rand
+    return ''.join(_CROCKFORD_BASE32[(value >> shift) & 31] for shift in range(125, -1, -5))
 
 
 def generate_eval_id() -> str:
-    """Generate a unique evaluation ID"""
-    date_str = datetime.utcnow().strftime('%Y%m%d')
-    short_uuid = uuid.uuid4().hex[:6]
-    return f"eval_{date_str}_{short_uuid}"
+    """Generate a unique, time-ordered evaluation ID (eval_ + 26-char ULID)"""
+    return f"eval_{_new_ulid()}"
 
 
 # ============ Watchlist Database ============
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class WatchlistItem:
-    """Watchlist item"""
+    """Watchlist item (field order matches _WATCHLIST_COLUMNS)"""
     ticker: str
     added_at: str  # ISO timestamp
     note: Optional[str] = None
 
 
-class WatchlistDB:
+class WatchlistDB(_Store):
     """SQLite database for watchlist (WebSocket subscriptions)"""
 
     MAX_ITEMS = 8  # TwelveData free plan limit
+    TICKERS_TTL = 1  # seconds the cached ticker set stays valid (other processes may write)
 
-    def __init__(self, db_path: Optional[str] = None):
-        """Initialize database connection"""
-        if db_path is None:
-            data_dir = os.path.join(os.path.dirname(__file__), '..', 'data')
-            os.makedirs(data_dir, exist_ok=True)
-            db_path = os.path.join(data_dir, 'klinelens.db')
-
-        self.db_path = db_path
+    def __init__(self, db_path: Optional[str] = None, database: Optional["Database"] = None):
+        """Initialize database connection (see _Store.__init__)"""
+        super().__init__(db_path, database)
+        self._tickers_cache: Optional[Tuple[float, FrozenSet[str]]] = None
         self._init_db()
 
     def _init_db(self):
-        """Create watchlist table if not exists"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS watchlist (
-                    ticker TEXT PRIMARY KEY,
-                    added_at TEXT NOT NULL,
-                    note TEXT
-                )
-            ''')
-            conn.commit()
-        finally:
-            conn.close()
+        """Create watchlist table if not exists
+
+        ticker is COLLATE NOCASE, so lookups match regardless of case and
+        callers do not need to upper-case before get/remove.
+        """
+        with self._lock:
+            self._conn.execute(_CREATE_WATCHLIST_SQL.format(table='watchlist'))
+
+            # Older files have a case-sensitive key: rebuild once with NOCASE
+            table_sql = self._conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'watchlist'"
+            ).fetchone()[0]
+            if 'NOCASE' not in table_sql.upper():
+                with self._transaction():
+                    self._conn.execute(_CREATE_WATCHLIST_SQL.format(table='watchlist_nocase'))
+                    self._conn.execute(f'''
+                        INSERT OR IGNORE INTO watchlist_nocase ({_WATCHLIST_COLUMNS})
+                        SELECT upper(ticker), added_at, note FROM watchlist ORDER BY added_at
+                    ''')
+                    self._conn.execute('DROP TABLE watchlist')
+                    self._conn.execute('ALTER TABLE watchlist_nocase RENAME TO watchlist')
 
     def list(self) -> List[WatchlistItem]:
         """Get all watchlist items"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM watchlist ORDER BY added_at ASC')
-            rows = cursor.fetchall()
-            return [WatchlistItem(**dict(row)) for row in rows]
-        finally:
-            conn.close()
+        with self._lock:
+            rows = self._conn.execute(_LIST_WATCHLIST_SQL).fetchall()
+        return [WatchlistItem(*row) for row in rows]
 
     def count(self) -> int:
-        """Get watchlist count"""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute('SELECT COUNT(*) FROM watchlist')
-            return cursor.fetchone()[0]
-        finally:
-            conn.close()
+        """Get watchlist count (from the cached ticker set)"""
+        return len(self._tickers())
+
+    def _tickers(self) -> FrozenSet[str]:
+        """Upper-cased tickers in the watchlist
+
+        Cached for TICKERS_TTL seconds, since count() and is_in_watchlist() are
+        called on most watchlist and realtime requests. The cached set is
+        immutable and only replaced under the lock (here and by add/remove),
+        so readers can use it without the lock and a refresh cannot overwrite
+        a newer write with rows read before it.
+        """
+        cached = self._tickers_cache
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+
+        with self._lock:
+            cached = self._tickers_cache
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+            rows = self._conn.execute(_LIST_WATCHLIST_TICKERS_SQL).fetchall()
+            tickers = frozenset(row[0].upper() for row in rows)
+            self._tickers_cache = (time.monotonic() + self.TICKERS_TTL, tickers)
+        return tickers
+
+    def _update_tickers(self, add: Optional[str] = None, discard: Optional[str] = None) -> None:
+        """Apply a local write to the cached ticker set (caller holds the lock)"""
+        cached = self._tickers_cache
+        if cached is None:
+            return
+        tickers = cached[1]
+        if add is not None:
+            tickers = tickers | {add}
+        if discard is not None:
+            tickers = tickers - {discard}
+        self._tickers_cache = (cached[0], tickers)
 
     def get(self, ticker: str) -> Optional[WatchlistItem]:
         """Get a single watchlist item"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM watchlist WHERE ticker = ?', (ticker.upper(),))
-            row = cursor.fetchone()
-            if row:
-                return WatchlistItem(**dict(row))
-            return None
-        finally:
-            conn.close()
+        with self._lock:
+            row = self._conn.execute(_SELECT_WATCHLIST_SQL, (ticker,)).fetchone()
+        if row:
+            return WatchlistItem(*row)
+        return None
 
     def add(self, ticker: str, note: Optional[str] = None) -> tuple[bool, str]:
         """
@@ -408,29 +739,28 @@ class WatchlistDB:
         Returns:
             (success, message)
         """
-        ticker = ticker.upper()
+        ticker = ticker.upper()  # stored form; lookups are case-insensitive
 
-        # Check if already exists
-        if self.get(ticker):
-            return False, f"{ticker} 已在自选股列表中"
-
-        # Check limit
-        if self.count() >= self.MAX_ITEMS:
-            return False, f"已达到 {self.MAX_ITEMS} 个上限，请先移除其他股票"
-
-        conn = sqlite3.connect(self.db_path)
         try:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO watchlist (ticker, added_at, note)
-                VALUES (?, ?, ?)
-            ''', (ticker, datetime.utcnow().isoformat() + 'Z', note))
-            conn.commit()
-            return True, f"{ticker} 已添加到自选股"
+            with self._lock:
+                inserted = self._conn.execute(
+                    _INSERT_WATCHLIST_SQL,
+                    (ticker, note, self.MAX_ITEMS),
+                ).rowcount
+                # Nothing inserted: either a duplicate or the list is full
+                exists = not inserted and self._conn.execute(
+                    _EXISTS_WATCHLIST_SQL, (ticker,)
+                ).fetchone() is not None
+                if inserted:
+                    self._update_tickers(add=ticker)
         except Exception as e:
             return False, str(e)
-        finally:
-            conn.close()
+
+        if inserted:
+            return True, f"{ticker} 已添加到自选股"
+        if exists:
+            return False, f"{ticker} 已在自选股列表中"
+        return False, f"已达到 {self.MAX_ITEMS} 个上限，请先移除其他股票"
 
     def remove(self, ticker: str) -> tuple[bool, str]:
         """
@@ -439,20 +769,45 @@ class WatchlistDB:
         Returns:
             (success, message)
         """
-        ticker = ticker.upper()
+        with self._lock:
+            deleted = self._conn.execute(_DELETE_WATCHLIST_SQL, (ticker,)).rowcount
+            if deleted:
+                self._update_tickers(discard=ticker.upper())
 
-        if not self.get(ticker):
+        if not deleted:
             return False, f"{ticker} 不在自选股列表中"
-
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM watchlist WHERE ticker = ?', (ticker,))
-            conn.commit()
-            return True, f"{ticker} 已从自选股移除"
-        finally:
-            conn.close()
+        return True, f"{ticker} 已从自选股移除"
 
     def is_in_watchlist(self, ticker: str) -> bool:
-        """Check if ticker is in watchlist"""
-        return self.get(ticker.upper()) is not None
+        """Check if ticker is in watchlist (case-insensitive, from the cached ticker set)"""
+        return ticker.upper() in self._tickers()
+
+
+# ============ Shared Database ============
+
+class Database:
+    """Owns one SQLite connection and lock for all tables in a file
+
+    The evaluation and watchlist stores live in the same file; sharing one
+    connection means one file descriptor and one WAL writer instead of two
+    connections contending for the write lock.
+
+    Usage:
+        db = Database()
+        db.signals.create(...)
+        db.watchlist.add("TSLA")
+        db.close()
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """Open the connection and create all tables"""
+        self.db_path = db_path or _default_db_path()
+        self.lock = threading.Lock()
+        self.conn = _connect(self.db_path)
+        self.signals = SignalEvaluationDB(database=self)
+        self.watchlist = WatchlistDB(database=self)
+
+    def close(self):
+        """Close the shared connection"""
+        with self.lock:
+            self.conn.close()
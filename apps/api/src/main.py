@@ -9,91 +9,51 @@ FastAPI 应用程序入口，提供市场数据和分析接口。
 - POST /v1/analyze: 运行市场分析
 
 启动方式:
-    uvicorn src.main:app --reload --port 8000
+    开发: uvicorn src.main:app --reload --port 8000
+    生产: uvicorn src.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools \
+              --limit-concurrency 1000 --timeout-keep-alive 30
+    也可以: python -m src（使用 uvloop + httptools，端口取 PORT）
+
+    uvloop 和 httptools 由 uvicorn[standard] 提供。
+    多进程: 设置 WEB_CONCURRENCY=N（uvicorn 命令行与 python -m src 均读取）。
+    每个进程各有一份分析进程池、WebSocket 连接和模拟交易状态，需相应调小
+    ANALYSIS_WORKERS；K 线缓存建议使用 CACHE_TYPE=redis 在进程间共享；
+    SQLite 为 WAL 模式，多进程读写无需额外配置；TwelveData WebSocket 连接数受套餐限制。
 
 访问文档:
     http://localhost:8000/docs
 """
 
 import asyncio
+import base64
+import binascii
+import functools
+import hashlib
 import json
 import logging
-import sys
 import os
-from typing import Optional, Any
-from dataclasses import asdict
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import orjson
+from typing import Annotated, Literal, Mapping, Optional, Any, List, Dict, Set, Tuple, Union
+from datetime import datetime, time as dt_time
+from zoneinfo import ZoneInfo
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import AfterValidator, BaseModel
 from sse_starlette.sse import EventSourceResponse
 
 from .config import settings
-from .cache import get_cache, cache_key
-from .providers import get_provider, TickerNotFoundError, RateLimitError, ProviderError
+from .cache import get_cache, cache_key, ttl_for_timeframe, EMPTY, MemoryCache
+from .providers import get_provider, Bar, TickerNotFoundError, RateLimitError, ProviderError, YFinanceProvider
 from .services.llm_service import LLMService, generate_narrative, prepare_analysis_for_llm
-from .database import SignalEvaluationDB, SignalEvaluation, generate_eval_id, WatchlistDB, WatchlistItem
+from .database import Database, SignalEvaluation, generate_eval_id, utc_timestamp, WatchlistItem
 from .websocket_manager import init_websocket, get_websocket_manager, RealtimePrice
-
-# 导入 core 模块
-# 支持两种环境：
-# 1. Docker: core 挂载在 /app/core (作为 src 包)
-# 2. 本地开发: core 在 ../../../packages/core
-
-def _import_core_package():
-    """导入 core 分析模块"""
-    # Docker 环境: /app/packages/core
-    docker_core_path = '/app/packages/core'
-    # 本地环境: packages/core
-    local_core_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'packages', 'core'))
-
-    # 检测运行环境
-    if os.path.exists(docker_core_path):
-        core_path = docker_core_path
-    else:
-        core_path = local_core_path
-
-    # 将 core 路径添加到 sys.path
-    if core_path not in sys.path:
-        sys.path.insert(0, core_path)
-
-    # 保存并临时移除 API 的 src 模块
-    api_src = sys.modules.get('src')
-    api_src_submodules = {k: v for k, v in sys.modules.items() if k.startswith('src.')}
-
-    for k in api_src_submodules:
-        del sys.modules[k]
-    if api_src:
-        del sys.modules['src']
-
-    try:
-        # 导入 core 的 src 包
-        from src import analyze as core_analyze
-        from src import models as core_models
-        from src import extended_hours as core_eh
-    finally:
-        # 恢复 API 的 src 模块
-        if api_src:
-            sys.modules['src'] = api_src
-        sys.modules.update(api_src_submodules)
-
-    return (
-        core_analyze.analyze_market,
-        core_analyze.AnalysisParams,
-        core_models.Bar,
-        core_models.AnalysisReport,
-        # Extended Hours
-        core_eh.build_eh_context,
-        core_eh.get_yesterday_bars,
-        core_eh.EHContext,
-        core_eh.EHLevels,
-        # New EH functions
-        core_eh.split_bars_by_session,
-        core_eh.build_eh_context_from_bars,
-        core_eh.SessionBars,
-    )
+from .analysis import import_core_package, report_to_json, create_analysis_pool, analyze_bars_to_json
 
 # 导入 core 模块
 (
@@ -110,7 +70,7 @@ def _import_core_package():
     split_bars_by_session,
     build_eh_context_from_bars,
     SessionBars,
-) = _import_core_package()
+) = import_core_package()
 
 # 配置日志
 logging.basicConfig(
@@ -119,22 +79,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class FastJSONResponse(JSONResponse):
+    """
+    使用 orjson 序列化的 JSON 响应
+
+    比标准库 json 快数倍，K 线列表、评估记录等大响应体收益明显。
+    同时支持 numpy 数组/标量，NaN/Inf 输出为 null（标准库会直接报错）。
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
 # 初始化 FastAPI 应用
 app = FastAPI(
     title="KLineLens API",
     description="市场结构分析 API - 提供 K 线数据和行为分析",
     version="0.1.0",
+    default_response_class=FastJSONResponse,
 )
 
 # 配置 CORS 中间件，允许前端跨域访问
+# 来源列表启动时解析一次并转为 frozenset，逐请求的来源匹配为 O(1) 集合查找；
+# 同源请求（无 Origin 头）由中间件直接放行。
+# 通配符 * 时关闭 allow_credentials：浏览器本就不会对 * 携带凭据，
+# 开启时 Starlette 还需逐个请求回显 Origin 并追加 Vary 头
+cors_origins = settings.cors_origin_list
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins.split(","),
-    allow_credentials=True,
+    allow_origins=frozenset(cors_origins),
+    allow_credentials="*" not in cors_origins,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# 响应压缩：K 线和分析报告 JSON 高度重复，gzip 通常可压缩 5-10 倍
+# 小于 1KB 的响应不压缩；SSE（text/event-stream）由 Starlette 默认排除
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # 初始化数据提供者和缓存
 # 根据配置选择数据提供者
 # - yfinance: 免费，无需 Key（默认）
@@ -157,15 +139,39 @@ provider = get_provider(
     api_secret=api_secret,
 )
 logger.info(f"使用数据提供者: {provider.name}")
-cache = get_cache(default_ttl=settings.cache_ttl)
-
-# 初始化 Signal Evaluation 数据库
-eval_db = SignalEvaluationDB()
-logger.info(f"Signal Evaluation DB 初始化完成: {eval_db.db_path}")
-
-# 初始化 Watchlist 数据库
-watchlist_db = WatchlistDB()
-logger.info(f"Watchlist DB 初始化完成 (最大 {watchlist_db.MAX_ITEMS} 个)")
+cache = get_cache(
+    default_ttl=settings.cache_ttl,
+    cache_type=settings.cache_type,
+    path=settings.cache_path or None,
+    url=settings.redis_url or None,
+)
+if int(os.environ.get("WEB_CONCURRENCY", "1")) > 1 and settings.cache_type != "redis":
+    logger.warning("多进程运行时各进程的 K 线缓存互不共享，建议设置 CACHE_TYPE=redis")
+
+# 已解析的 CoreBar 列表（进程内），key 与 cache 相同
+# analyze/narrative 缓存命中时直接复用，无需逐根重新解析时间戳
+core_bar_cache = MemoryCache(default_ttl=settings.cache_ttl)
+core_bar_cache.start_eviction()
+
+# /v1/bars 的 ETag 和已编码的 K 线 JSON（key -> (bars_data, etag, bars_json)），
+# 同一份缓存数据只编码、哈希一次
+bars_etag_cache = MemoryCache(default_ttl=settings.cache_ttl)
+bars_etag_cache.start_eviction()
+
+# 分析结果（进程内，AnalysisReport 的 JSON 字节）
+# analyze_market 对相同输入结果确定，K 线未更新时 analyze/narrative 直接复用
+analysis_cache = MemoryCache(default_ttl=settings.cache_ttl)
+analysis_cache.start_eviction()
+
+# EHContext 对象（进程内），供叙事/交易计划直接复用，无需序列化往返
+eh_context_cache = MemoryCache(default_ttl=60)
+eh_context_cache.start_eviction()
+
+# 初始化 SQLite 数据库（Signal Evaluation 与 Watchlist 共用一个连接）
+database = Database()
+eval_db = database.signals
+watchlist_db = database.watchlist
+logger.info(f"数据库初始化完成: {database.db_path} (自选股最大 {watchlist_db.MAX_ITEMS} 个)")
 
 # 初始化 LLM 服务（用于生成叙事报告）
 llm_service = LLMService(
@@ -180,6 +186,89 @@ if settings.llm_api_key:
 else:
     logger.warning("LLM API Key 未配置，叙事生成功能不可用")
 
+# 批量叙事中 LLM 调用的并发上限（各批量请求合计，不超出提供者的速率限制）
+# 单次 /v1/narrative 不经过此信号量，批量请求再多也不会让交互请求排队
+batch_llm_semaphore = asyncio.Semaphore(max(1, settings.llm_max_concurrency))
+
+
+# 阻塞调用线程池（数据提供者 HTTP 请求、SQLite 读写等同步调用）
+# 放到线程中执行，避免阻塞事件循环，多个 ticker 的请求可以并发
+blocking_executor = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 4),
+    thread_name_prefix="klinelens-blocking",
+)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    在 blocking_executor 中运行同步函数并等待结果
+
+    参数:
+        func: 同步函数
+        *args, **kwargs: 传给 func 的参数
+
+    返回:
+        func 的返回值（异常原样抛出）
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_executor, functools.partial(func, *args, **kwargs))
+
+
+# 分析进程池（analyze_market 为纯 Python CPU 密集计算，线程池受 GIL 限制）
+analysis_pool = create_analysis_pool(settings.analysis_workers or None)
+
+
+def _analysis_key(core_bars: List[CoreBar], ticker: str, timeframe: str) -> str:
+    """分析结果缓存键（股票 + 周期 + K 线数量 + 首尾时间 + 最新 K 线的高低收量，最新 K 线更新或新 K 线到达即失效）"""
+    if not core_bars:
+        return f"{ticker}:{timeframe}:0"
+    first, last = core_bars[0], core_bars[-1]
+    return f"{ticker}:{timeframe}:{len(core_bars)}:{first.t}:{last.t}:{last.h}:{last.l}:{last.c}:{last.v}"
+
+
+async def run_analysis(core_bars: List[CoreBar], ticker: str, timeframe: str = "1d") -> bytes:
+    """
+    在 analysis_pool 子进程中运行 analyze_market
+
+    相同 K 线的结果缓存在 analysis_cache 中，直接返回已序列化的字节。
+    进程池不可用（子进程异常退出、初始化失败等）时关闭进程池，
+    之后的分析都退回线程池执行。
+
+    参数:
+        core_bars: CoreBar 列表
+        ticker: 股票代码
+        timeframe: 时间周期
+
+    返回:
+        AnalysisReport 的 JSON 字节
+
+    异常:
+        ValueError: K 线数量不足
+    """
+    key = _analysis_key(core_bars, ticker, timeframe)
+    report_json = analysis_cache.get(key)
+    if report_json is None:
+        report_json = await _analyze(core_bars, ticker, timeframe)
+        analysis_cache.set(key, report_json, ttl=ttl_for_timeframe(timeframe))
+    return report_json
+
+
+async def _analyze(core_bars: List[CoreBar], ticker: str, timeframe: str) -> bytes:
+    """运行 analyze_market（优先进程池）并返回 JSON 字节"""
+    global analysis_pool
+    if analysis_pool is not None:
+        bars = [(bar.t, bar.o, bar.h, bar.l, bar.c, bar.v) for bar in core_bars]
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(analysis_pool, analyze_bars_to_json, bars, ticker, timeframe)
+        except BrokenProcessPool as e:
+            logger.error(f"分析进程池不可用，之后改用线程池: {e}")
+            analysis_pool.shutdown(wait=False, cancel_futures=True)
+            analysis_pool = None
+
+    report = await run_blocking(analyze_market, bars=core_bars, ticker=ticker, timeframe=timeframe)
+    return report_to_json(report)
+
 
 # ============ WebSocket 实时数据 ============
 
@@ -196,10 +285,10 @@ async def startup_event():
             logger.info("TwelveData WebSocket 已初始化")
 
             # 订阅所有自选股
-            watchlist = watchlist_db.list()
+            watchlist = await run_blocking(watchlist_db.list)
             if watchlist:
-                for item in watchlist:
-                    await ws_manager.subscribe(item.ticker)
+                # 一条消息批量订阅
+                await ws_manager.subscribe([item.ticker for item in watchlist])
                 logger.info(f"已订阅 {len(watchlist)} 个自选股: {[w.ticker for w in watchlist]}")
             else:
                 logger.info("自选股列表为空，无需订阅")
@@ -217,40 +306,253 @@ async def shutdown_event():
         await ws_manager.disconnect()
         logger.info("WebSocket 已关闭")
 
+    # 关闭 LLM 服务的 HTTP 连接池
+    await llm_service.aclose()
+
+    # 关闭 SQLite 长连接
+    database.close()
+
+    blocking_executor.shutdown(wait=False, cancel_futures=True)
+    if analysis_pool is not None:
+        analysis_pool.shutdown(wait=False, cancel_futures=True)
+
 
 # ============ 辅助函数 ============
 
-def report_to_dict(report: AnalysisReport) -> dict:
+def _bars_fingerprint(bars_data: List[dict]) -> tuple:
+    """K 线列表的内容指纹（数量 + 首尾时间 + 最新收盘价）"""
+    if not bars_data:
+        return (0,)
+    return (len(bars_data), bars_data[0]["t"], bars_data[-1]["t"], bars_data[-1]["c"])
+
+
+def remember_core_bars(key: str, bars_data: List[dict], core_bars: List[CoreBar], tf: str) -> None:
+    """记录 bars_data 对应的 CoreBar 列表，供后续缓存命中时复用"""
+    core_bar_cache.set(key, (_bars_fingerprint(bars_data), core_bars), ttl=ttl_for_timeframe(tf))
+
+
+def core_bars_from_cache(key: str, bars_data: List[dict], tf: str) -> List[CoreBar]:
     """
-    将 AnalysisReport 转换为 JSON 可序列化的字典
+    将缓存中的字典格式 K 线转换为 CoreBar 列表
+
+    解析结果按内容指纹缓存在 core_bar_cache 中：底层数据未变时直接返回
+    已解析的列表（CoreBar 为不可变 dataclass，可安全共享）；数据刷新后重新解析。
 
-    处理 datetime 和嵌套 dataclass 的序列化。
+    参数:
+        key: 缓存键（与 cache 相同）
+        bars_data: cache 中的字典格式 K 线
+        tf: 时间周期（决定 TTL）
+
+    返回:
+        CoreBar 列表
     """
-    def serialize(obj):
-        """递归序列化对象"""
-        if isinstance(obj, datetime):
-            # 处理时区信息：如果是 timezone-aware，转换为 UTC 并使用 Z 后缀
-            if obj.tzinfo is not None:
-                # 转换为 UTC 字符串，去掉 +00:00，用 Z 代替
-                utc_str = obj.strftime('%Y-%m-%dT%H:%M:%S')
-                return utc_str + "Z"
-            else:
-                # naive datetime，直接添加 Z
-                return obj.isoformat() + "Z"
-        elif hasattr(obj, '__dataclass_fields__'):
-            return {k: serialize(v) for k, v in asdict(obj).items()}
-        elif isinstance(obj, dict):
-            return {k: serialize(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [serialize(item) for item in obj]
-        else:
-            return obj
+    entry = core_bar_cache.get(key)
+    if entry is not None and entry[0] == _bars_fingerprint(bars_data):
+        return entry[1]
+
+    # 时间戳按提供者返回的 naive 时间还原（去掉 to_dict 追加的 "Z"），
+    # 与直接由 Bar 转换的 CoreBar 保持一致
+    # CoreBar 按位置参数构造（字段顺序 t, o, h, l, c, v），比关键字参数快约 3 倍
+    core_bars = [
+        CoreBar(datetime.fromisoformat(bar["t"].removesuffix("Z")), bar["o"], bar["h"], bar["l"], bar["c"], bar["v"])
+        for bar in bars_data
+    ]
+    remember_core_bars(key, bars_data, core_bars, tf)
+    return core_bars
+
+
+# 后台任务的强引用（事件循环只持有弱引用，未被引用的任务可能在完成前被回收）
+_background_tasks: Set[asyncio.Task] = set()
+
+# 进行中的获取（key -> Future）
+# 冷缓存时并发的相同请求只有一个访问数据提供者，其余等待同一个 Future
+# 条目在数据写入缓存后才移除，之后的请求直接读缓存
+_pending_fetches: Dict[str, asyncio.Future] = {}
+
+
+async def fetch_bars_cached(ticker: str, tf: str, window: str) -> List[dict]:
+    """
+    获取字典格式 K 线（优先读缓存，未命中时同一键只请求一次）
+
+    过期条目带校验值时发起条件请求，上游未变化则续期旧缓存。
+    新获取的数据同时记录对应的 CoreBar 列表，供分析直接复用。
+
+    参数:
+        ticker: 股票代码（大写）
+        tf: 时间周期
+        window: 回溯时间
+
+    返回:
+        字典格式 K 线列表（Bar.to_dict() 的输出）
+
+    异常:
+        TickerNotFoundError: 股票代码不存在
+        RateLimitError: 请求频率超限
+        ProviderError: 其他提供者错误
+    """
+    key = cache_key(ticker, tf, window)
+    # DiskCache / RedisCache 的读取会阻塞（SQLite / 网络往返），放到线程池
+    bars_data = await run_blocking(cache.get, key)
+    if bars_data is not None:
+        logger.info(f"缓存命中: {ticker}")
+        return bars_data
+
+    pending = _pending_fetches.get(key)
+    if pending is None:
+        pending = _pending_fetches[key] = asyncio.get_running_loop().create_future()
+        # 获取在独立任务中运行：某个请求被取消不会中断其他等待者
+        task = asyncio.create_task(_fetch_bars(key, ticker, tf, window, pending))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    # shield: 等待者被取消时不取消共享的 Future
+    return await asyncio.shield(pending)
+
+
+async def load_core_bars(ticker: str, tf: str, window: str) -> List[CoreBar]:
+    """
+    获取分析用的 CoreBar 列表（缓存 + 单飞获取 + 已解析列表复用）
+
+    参数:
+        ticker: 股票代码（大写）
+        tf: 时间周期
+        window: 回溯时间
+
+    返回:
+        CoreBar 列表
+
+    异常:
+        同 fetch_bars_cached
+    """
+    bars_data = await fetch_bars_cached(ticker, tf, window)
+    return core_bars_from_cache(cache_key(ticker, tf, window), bars_data, tf)
 
-    return serialize(report)
+
+async def _fetch_bars(key: str, ticker: str, tf: str, window: str, pending: asyncio.Future) -> None:
+    """
+    从提供者获取 K 线，结果交给 pending，随后写入缓存
+
+    数据就绪即唤醒等待者（分析可以立即开始），缓存写入（DiskCache 需要
+    pickle + SQLite）在线程池中完成，不占用请求的关键路径和事件循环。
+    """
+    try:
+        logger.info(f"获取数据: {ticker} {tf} {window}")
+        stale = await run_blocking(cache.get_stale, key)
+        result = await run_blocking(
+            provider.get_bars_conditional,
+            ticker,
+            tf,
+            window,
+            etag=stale.etag if stale else None,
+            last_modified=stale.last_modified if stale else None,
+        )
+
+        if result.not_modified:
+            # 上游数据未变化：续期旧缓存，不重新下载
+            pending.set_result(stale.data)
+            await run_blocking(cache.touch, key, ttl=ttl_for_timeframe(tf))
+            return
+
+        # 一次遍历同时生成响应用的字典（cache 存储格式）和分析用的 CoreBar
+        # （API Bar 和 Core Bar 结构相同，直接转换，省去解析时间戳）
+        bars_data = []
+        core_bars = []
+        for bar in result.bars:
+            bars_data.append(bar.to_dict())
+            core_bars.append(CoreBar(bar.t, bar.o, bar.h, bar.l, bar.c, bar.v))
+        remember_core_bars(key, bars_data, core_bars, tf)
+        pending.set_result(bars_data)
+
+        # TTL 随周期变化
+        await run_blocking(
+            cache.set,
+            key,
+            bars_data,
+            ttl=ttl_for_timeframe(tf),
+            etag=result.etag,
+            last_modified=result.last_modified,
+        )
+    except Exception as e:
+        if not pending.done():
+            pending.set_exception(e)
+        else:
+            logger.warning(f"写入缓存失败: {key}: {e}")
+    finally:
+        if not pending.done():
+            # 任务被取消（如关闭时）：让等待者一并取消
+            pending.cancel()
+        _pending_fetches.pop(key, None)
 
 
 # ============ 数据模型 ============
 
+# 股票代码：在 Pydantic 校验阶段统一转为大写，
+# 请求体模型和 Query/Path 参数共用，接口内无需再调用 .upper()。
+# Query 参数需写成 Annotated[Ticker, Query(...)]，写成默认值形式时校验器不生效
+Ticker = Annotated[str, AfterValidator(str.upper)]
+
+# 参数取值集合（模块级常量，请求内做 O(1) 成员判断）
+VALID_TIMEFRAMES = frozenset({"1m", "5m", "1d"})
+EH_TIMEFRAMES = frozenset({"1m", "5m"})  # 支持 Extended Hours 的周期
+VALID_REPORT_TYPES = frozenset({"full", "quick", "confirmation", "context"})
+VALID_LANGS = frozenset({"zh", "en"})
+VALID_DIRECTIONS = frozenset({"up", "down"})
+VALID_EVAL_STATUSES = frozenset({"pending", "correct", "incorrect"})
+RESOLVED_EVAL_STATUSES = frozenset({"correct", "incorrect"})
+VALID_EVAL_RESULTS = frozenset({"target_hit", "invalidation_hit", "partial_correct", "direction_wrong", "timeout"})
+
+
+def check_timeframe(tf: str, allowed: frozenset = VALID_TIMEFRAMES) -> str:
+    """
+    校验时间周期（各接口共用）
+
+    参数:
+        tf: 时间周期
+        allowed: 允许的周期集合（默认 VALID_TIMEFRAMES）
+
+    异常:
+        HTTPException: 时间周期无效 (400 TIMEFRAME_INVALID)
+    """
+    if tf not in allowed:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "TIMEFRAME_INVALID", "message": f"无效的时间周期: {tf}"}
+        )
+    return tf
+
+
+def timeframe_query(tf: str = Query("1m", description="时间周期: 1m, 5m, 1d")) -> str:
+    """时间周期查询参数依赖（校验后返回）"""
+    return check_timeframe(tf)
+
+
+def eh_timeframe_query(tf: str = Query("1m", description="时间周期: 1m, 5m")) -> str:
+    """日内（支持 Extended Hours）时间周期查询参数依赖（校验后返回）"""
+    return check_timeframe(tf, EH_TIMEFRAMES)
+
+
+def evaluation_filters(
+    tf: Optional[str] = Query(None, description="时间周期过滤: 1m, 5m, 1d"),
+    status: Optional[str] = Query(None, description="状态过滤: pending, correct, incorrect"),
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    评估记录过滤参数依赖（列表与导出接口共用）
+
+    返回:
+        (tf, status)，未指定的为 None
+
+    异常:
+        HTTPException: 时间周期或状态无效 (400)
+    """
+    if tf:
+        check_timeframe(tf)
+    if status and status not in VALID_EVAL_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "STATUS_INVALID", "message": f"无效的状态: {status}"}
+        )
+    return tf, status
+
+
 class ErrorResponse(BaseModel):
     """
     错误响应模型
@@ -271,7 +573,7 @@ class BarsResponse(BaseModel):
     ticker: str  # 股票代码
     tf: str  # 时间周期
     bar_count: int  # K 线数量
-    bars: list  # K 线数据列表
+    bars: Union[list, Dict[str, list]]  # K 线数据列表（columnar 格式时为按字段分列的字典）
 
 
 class AnalyzeRequest(BaseModel):
@@ -280,7 +582,7 @@ class AnalyzeRequest(BaseModel):
 
     用于 POST /v1/analyze 接口的请求体。
     """
-    ticker: str  # 股票代码
+    ticker: Ticker  # 股票代码
     tf: str = "1m"  # 时间周期，默认 1 分钟
     window: Optional[str] = None  # 回溯时间范围
 
@@ -297,7 +599,7 @@ class NarrativeRequest(BaseModel):
     - confirmation: 1m 执行确认（确认/否定高级别论点）
     - context: 1D 背景框架（大结构上下文）
     """
-    ticker: str  # 股票代码
+    ticker: Ticker  # 股票代码
     tf: str = "5m"  # 时间周期（默认 5m）
     window: Optional[str] = None  # 回溯时间范围
     report_type: str = "full"  # full / quick / confirmation / context
@@ -310,7 +612,7 @@ class SignalEvaluationRequest(BaseModel):
 
     用于 POST /v1/signal-evaluation 接口的请求体。
     """
-    ticker: str  # 股票代码
+    ticker: Ticker  # 股票代码
     tf: str  # 时间周期: 1m, 5m, 1d
     signal_type: str  # 信号类型
     direction: str  # up / down
@@ -350,11 +652,116 @@ async def root():
     }
 
 
+BAR_FIELDS = ("t", "o", "h", "l", "c", "v")
+
+
+def bars_to_columnar(bars_data: List[dict]) -> Dict[str, list]:
+    """
+    将字典格式 K 线转换为按字段分列的格式
+
+    {"t": [...], "o": [...], ...} 省去每根 K 线重复的键名，
+    响应体更小，前端也可以直接按列使用。
+
+    参数:
+        bars_data: 字典格式 K 线列表（Bar.to_dict() 的输出）
+
+    返回:
+        字段名 -> 值列表
+    """
+    return {field: [bar[field] for bar in bars_data] for field in BAR_FIELDS}
+
+
+def _bars_response(
+    ticker: str, tf: str, bars_data: List[dict], bars_json: bytes, fmt: str, headers: Dict[str, str]
+) -> Response:
+    """
+    构建 /v1/bars 响应（按 fmt 选择行格式或列格式）
+
+    结构与 BarsResponse 一致（response_model 仅用于文档），直接返回响应对象：
+    K 线来自我们自己的缓存，无需再经 pydantic 校验和 jsonable_encoder 逐根遍历。
+    行格式直接拼接已编码的 bars_json，缓存命中时不再重新序列化 K 线。
+    """
+    if fmt == "columnar":
+        return FastJSONResponse(
+            {
+                "ticker": ticker,
+                "tf": tf,
+                "bar_count": len(bars_data),
+                "bars": bars_to_columnar(bars_data),
+            },
+            headers=headers,
+        )
+
+    head = orjson.dumps({"ticker": ticker, "tf": tf, "bar_count": len(bars_data)})
+    return Response(
+        content=b"".join((head[:-1], b',"bars":', bars_json, b"}")),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def encoded_bars(key: str, bars_data: List[dict], tf: str) -> Tuple[str, bytes]:
+    """
+    获取 K 线的内容摘要和 JSON 编码
+
+    内存缓存返回的是同一个列表对象，按对象身份复用已计算的结果；
+    其他缓存后端每次返回新对象，重新计算。
+
+    返回:
+        (digest, bars_json)，digest 经 bars_etag() 生成各表示形式的 ETag
+    """
+    entry = bars_etag_cache.get(key)
+    if entry is not None and entry[0] is bars_data:
+        return entry[1], entry[2]
+    bars_json = orjson.dumps(bars_data)
+    digest = hashlib.md5(bars_json).hexdigest()
+    bars_etag_cache.set(key, (bars_data, digest, bars_json), ttl=ttl_for_timeframe(tf))
+    return digest, bars_json
+
+
+def cached_bars_digest(key: str, bars_data: List[dict]) -> Optional[str]:
+    """已计算过的 K 线内容摘要（不编码；bars_data 尚未编码过时返回 None）"""
+    entry = bars_etag_cache.get(key)
+    if entry is not None and entry[0] is bars_data:
+        return entry[1]
+    return None
+
+
+def bars_etag(digest: str, representation: str) -> str:
+    """
+    K 线响应的 ETag（弱校验，gzip 前后视为同一内容）
+
+    rows / columnar / ndjson 的响应体不同，ETag 带上表示形式，
+    用一种格式取得的 ETag 不会让另一种格式返回 304。
+    """
+    return f'W/"{digest}-{representation}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 是否命中（弱比较，支持多个值和 *）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _bars_ndjson(ticker: str, tf: str, bars_data: List[dict]):
+    """逐行生成 /v1/bars 的 NDJSON 响应（首行为元信息）"""
+    yield orjson.dumps({"ticker": ticker, "tf": tf, "bar_count": len(bars_data)}) + b"\n"
+    for bar in bars_data:
+        yield orjson.dumps(bar) + b"\n"
+
+
 @app.get("/v1/bars", response_model=BarsResponse)
 async def get_bars(
-    ticker: str = Query(..., description="股票代码（如 TSLA, AAPL）"),
-    tf: str = Query("1m", description="时间周期: 1m, 5m, 1d"),
+    ticker: Annotated[Ticker, Query(description="股票代码（如 TSLA, AAPL）")],
+    tf: str = Depends(timeframe_query),
     window: Optional[str] = Query(None, description="回溯时间（如 1d, 5d, 1mo）"),
+    fmt: Literal["rows", "columnar"] = Query("rows", alias="format", description="返回格式: rows（逐根 K 线）或 columnar（按字段分列）"),
+    stream: bool = Query(False, description="是否以 NDJSON 逐行流式返回"),
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     获取 K 线数据接口
@@ -366,6 +773,12 @@ async def get_bars(
         ticker: 股票代码（如 TSLA, AAPL, BTC-USD）
         tf: 时间周期（1m=1分钟, 5m=5分钟, 1d=日线）
         window: 回溯时间（默认: 1m->1d, 5m->5d, 1d->6mo）
+        format: 返回格式（rows 默认；columnar 返回 {"t": [...], "o": [...], ...}）
+        stream: 为 true 时返回 application/x-ndjson：
+                首行 {"ticker", "tf", "bar_count"}，之后每行一根 K 线（忽略 format）
+
+    响应带 ETag（按 format / stream 区分）；请求头 If-None-Match 与之匹配时返回 304（无响应体）。
+    流式响应只在 ETag 已计算过或请求带 If-None-Match 时返回 ETag，不为此预先编码整份 K 线。
 
     返回:
         包含 K 线数据的响应对象
@@ -376,44 +789,36 @@ async def get_bars(
         429: 请求频率超限
         502: 数据提供者错误
     """
-    # 验证时间周期
-    if tf not in ("1m", "5m", "1d"):
-        raise HTTPException(
-            status_code=400,
-            detail={"code": "TIMEFRAME_INVALID", "message": f"无效的时间周期: {tf}"}
-        )
-
-    # 获取默认回溯时间
+    # 获取默认回溯时间（tf 已由 timeframe_query 校验）
     actual_window = window or provider.get_default_window(tf)
 
-    # 先检查缓存
-    key = cache_key(ticker, tf, actual_window)
-    cached_bars = cache.get(key)
-    if cached_bars is not None:
-        logger.info(f"缓存命中: {ticker}")
-        return BarsResponse(
-            ticker=ticker.upper(),
-            tf=tf,
-            bar_count=len(cached_bars),
-            bars=cached_bars,
-        )
-
-    # 缓存未命中，从提供者获取数据
     try:
-        bars = provider.get_bars(ticker, tf, actual_window)
-
-        # 转换为字典格式用于 JSON 响应
-        bars_data = [bar.to_dict() for bar in bars]
+        bars_data = await fetch_bars_cached(ticker, tf, actual_window)
+        key = cache_key(ticker, tf, actual_window)
+
+        if stream:
+            # 流式返回不预先编码整份 K 线：复用已计算的 ETag，
+            # 没有时仅在条件请求（带 If-None-Match）时编码并计算
+            digest = cached_bars_digest(key, bars_data)
+            if digest is None and if_none_match:
+                digest, _ = encoded_bars(key, bars_data, tf)
+            etag = bars_etag(digest, "ndjson") if digest else None
+            headers = {"ETag": etag} if etag else {}
+            if etag and etag_matches(if_none_match, etag):
+                return Response(status_code=304, headers=headers)
+            return StreamingResponse(
+                _bars_ndjson(ticker, tf, bars_data),
+                media_type="application/x-ndjson",
+                headers=headers,
+            )
 
-        # 存入缓存
-        cache.set(key, bars_data)
-
-        return BarsResponse(
-            ticker=ticker.upper(),
-            tf=tf,
-            bar_count=len(bars_data),
-            bars=bars_data,
-        )
+        # 数据未变化：只返回 304，跳过序列化和传输
+        digest, bars_json = encoded_bars(key, bars_data, tf)
+        etag = bars_etag(digest, fmt)
+        headers = {"ETag": etag}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        return _bars_response(ticker, tf, bars_data, bars_json, fmt, headers)
 
     except TickerNotFoundError as e:
         # 股票代码不存在
@@ -463,59 +868,18 @@ async def analyze(request: AnalyzeRequest):
         502: 数据提供者错误
     """
     # 验证时间周期
-    if request.tf not in ("1m", "5m", "1d"):
-        raise HTTPException(
-            status_code=400,
-            detail={"code": "TIMEFRAME_INVALID", "message": f"无效的时间周期: {request.tf}"}
-        )
+    check_timeframe(request.tf)
 
     # 获取默认回溯时间
     actual_window = request.window or provider.get_default_window(request.tf)
 
-    # 获取 K 线数据（复用 /v1/bars 的逻辑）
-    key = cache_key(request.ticker, request.tf, actual_window)
-    cached_bars = cache.get(key)
-
     try:
-        if cached_bars is not None:
-            logger.info(f"分析: 缓存命中 {request.ticker}")
-            # 从缓存的字典格式转换为 CoreBar
-            from dateutil.parser import isoparse
-            core_bars = [
-                CoreBar(
-                    t=isoparse(bar["t"].replace("Z", "+00:00")),
-                    o=bar["o"],
-                    h=bar["h"],
-                    l=bar["l"],
-                    c=bar["c"],
-                    v=bar["v"]
-                )
-                for bar in cached_bars
-            ]
-        else:
-            logger.info(f"分析: 获取数据 {request.ticker}")
-            # 从提供者获取数据
-            api_bars = provider.get_bars(request.ticker, request.tf, actual_window)
-
-            # 存入缓存
-            bars_data = [bar.to_dict() for bar in api_bars]
-            cache.set(key, bars_data)
-
-            # 转换为 CoreBar（API Bar 和 Core Bar 结构相同）
-            core_bars = [
-                CoreBar(t=bar.t, o=bar.o, h=bar.h, l=bar.l, c=bar.c, v=bar.v)
-                for bar in api_bars
-            ]
-
-        # 运行市场分析
-        report = analyze_market(
-            bars=core_bars,
-            ticker=request.ticker,
-            timeframe=request.tf
-        )
+        # 获取 K 线数据（与 /v1/bars 共用缓存）
+        core_bars = await load_core_bars(request.ticker, request.tf, actual_window)
 
-        # 转换为 JSON 并返回
-        return report_to_dict(report)
+        # 运行市场分析（CPU 密集，放到进程池），子进程直接返回 JSON 字节
+        report_json = await run_analysis(core_bars, request.ticker, request.tf)
+        return Response(content=report_json, media_type="application/json")
 
     except TickerNotFoundError as e:
         raise HTTPException(
@@ -540,6 +904,82 @@ async def analyze(request: AnalyzeRequest):
         )
 
 
+# 美东时区（盘前 04:00-09:30 ET）
+ET_TZ = ZoneInfo("America/New_York")
+PREMARKET_CLOSE = dt_time(9, 30)
+
+# EH 数据不可用的负缓存 TTL（秒）
+# 盘前已结束: 今日不会再有盘前数据，缓存 1 小时
+# 盘前未结束: 数据可能稍后出现，只缓存 1 分钟
+EH_EMPTY_TTL_CLOSED = 3600
+EH_EMPTY_TTL_OPEN = 60
+
+
+@functools.lru_cache(maxsize=1)
+def get_eh_provider() -> YFinanceProvider:
+    """
+    获取 Extended Hours 数据提供者（单例）
+
+    EH 数据始终来自 YFinance；主提供者本身就是 yfinance 时直接复用。
+    """
+    if isinstance(provider, YFinanceProvider):
+        return provider
+    return YFinanceProvider()
+
+
+def eh_empty_key(ticker: str, tf: str, now_et: Optional[datetime] = None) -> str:
+    """EH 负缓存键（按 ticker、周期和美东交易日）"""
+    now_et = now_et or datetime.now(ET_TZ)
+    return cache_key(ticker, f"{tf}-eh", now_et.date().isoformat())
+
+
+def fetch_eh_bars(ticker: str, tf: str) -> Optional[List[Bar]]:
+    """
+    获取 Extended Hours K 线（带负结果缓存）
+
+    YFinance 未返回足够的 EH 数据时，按 (ticker, tf, 交易日) 缓存 EMPTY 哨兵，
+    之后的请求直接跳过 HTTP 调用，回退到普通数据。
+
+    Args:
+        ticker: 股票代码（大写）
+        tf: 时间周期
+
+    Returns:
+        EH K 线列表（至少 100 根），不可用时返回 None
+
+    Raises:
+        ProviderError: 数据获取失败（不写入负缓存）
+    """
+    now_et = datetime.now(ET_TZ)
+    empty_key = eh_empty_key(ticker, tf, now_et)
+    if cache.get(empty_key) is EMPTY:
+        logger.debug(f"EH 数据不可用（负缓存命中）: {ticker}")
+        return None
+
+    eh_bars = get_eh_provider().get_bars_extended(ticker, tf, "2d")
+
+    if not eh_bars or len(eh_bars) < 100:
+        ttl = EH_EMPTY_TTL_CLOSED if now_et.time() >= PREMARKET_CLOSE else EH_EMPTY_TTL_OPEN
+        cache.set(empty_key, EMPTY, ttl=ttl)
+        return None
+
+    return eh_bars
+
+
+def eh_context_from_bars(eh_bars: List[Bar]) -> Any:
+    """
+    由 EH K 线构建 EHContext（同步，CPU 计算，调用方放到线程池执行）
+
+    Args:
+        eh_bars: fetch_eh_bars 返回的 K 线
+
+    Returns:
+        EHContext 对象
+    """
+    core_bars = [CoreBar(bar.t, bar.o, bar.h, bar.l, bar.c, bar.v) for bar in eh_bars]
+    return build_eh_context_from_bars(core_bars)
+
+
 async def get_eh_context_internal(ticker: str, tf: str = "1m") -> Optional[Any]:
     """
     内部函数：获取 EH 上下文
@@ -554,28 +994,17 @@ async def get_eh_context_internal(ticker: str, tf: str = "1m") -> Optional[Any]:
     ticker = ticker.upper()
     key = cache_key(ticker, tf, "eh-context-internal")
 
-    # 检查缓存（使用不同 key 避免冲突）
-    cached = cache.get(key)
-    if cached:
-        # 返回缓存的字典
-        return type('EHContext', (), cached)()  # 简单对象模拟
+    # 检查缓存（直接缓存 EHContext 对象，属性访问与未命中时一致）
+    cached = eh_context_cache.get(key)
+    if cached is not None:
+        return cached
 
     try:
-        from .providers.yfinance_provider import YFinanceProvider
-        yf_provider = YFinanceProvider()
-        eh_bars = yf_provider.get_bars_extended(ticker, tf, "2d")
-
-        if eh_bars and len(eh_bars) >= 100:
-            core_bars = [
-                CoreBar(t=bar.t, o=bar.o, h=bar.h, l=bar.l, c=bar.c, v=bar.v)
-                for bar in eh_bars
-            ]
-            eh_context = build_eh_context_from_bars(core_bars)
-
-            # 缓存
-            ctx_dict = eh_context_to_dict(eh_context)
-            cache.set(key, ctx_dict, ttl=60)
+        eh_bars = await run_blocking(fetch_eh_bars, ticker, tf)
 
+        if eh_bars:
+            eh_context = await run_blocking(eh_context_from_bars, eh_bars)
+            eh_context_cache.set(key, eh_context, ttl=60)
             return eh_context
     except Exception as e:
         logger.warning(f"内部 EH 上下文获取失败: {e}")
@@ -585,7 +1014,7 @@ async def get_eh_context_internal(ticker: str, tf: str = "1m") -> Optional[Any]:
 
 @app.get("/v1/eh-context")
 async def get_eh_context(
-    ticker: str = Query(..., description="股票代码（如 TSLA, AAPL）"),
+    ticker: Annotated[Ticker, Query(description="股票代码（如 TSLA, AAPL）")],
     tf: str = Query("1m", description="时间周期: 1m, 5m"),
     use_eh: bool = Query(True, description="是否尝试获取 Extended Hours 数据"),
 ):
@@ -616,37 +1045,29 @@ async def get_eh_context(
         - ah_risk: 盘后风险评估
         - data_quality: 数据质量级别
     """
-    ticker = ticker.upper()
     key = cache_key(ticker, tf, f"eh-context-{use_eh}")
 
     # 检查缓存
-    cached = cache.get(key)
+    cached = await run_blocking(cache.get, key)
     if cached:
         return cached
 
     try:
         # 尝试获取 Extended Hours 数据
         eh_bars = None
-        if use_eh and tf in ("1m", "5m"):
+        if use_eh and tf in EH_TIMEFRAMES:
             # 尝试使用 YFinance 获取 EH 数据（免费）
             try:
-                from .providers.yfinance_provider import YFinanceProvider
-                yf_provider = YFinanceProvider()
-                eh_bars = yf_provider.get_bars_extended(ticker, tf, "2d")
-                logger.info(f"YFinance EH 数据获取成功: {ticker}, {len(eh_bars)} bars")
+                eh_bars = await run_blocking(fetch_eh_bars, ticker, tf)
+                if eh_bars:
+                    logger.info(f"YFinance EH 数据获取成功: {ticker}, {len(eh_bars)} bars")
             except Exception as e:
                 logger.warning(f"YFinance EH 数据获取失败，回退到普通模式: {e}")
                 eh_bars = None
 
-        if eh_bars and len(eh_bars) >= 100:
-            # 使用 EH 数据构建上下文
-            core_bars = [
-                CoreBar(t=bar.t, o=bar.o, h=bar.h, l=bar.l, c=bar.c, v=bar.v)
-                for bar in eh_bars
-            ]
-
-            # 使用新的 session 分割和构建函数
-            eh_context = build_eh_context_from_bars(core_bars)
+        if eh_bars:
+            # 使用 EH 数据构建上下文（session 分割 + 构建，放到线程池）
+            eh_context = await run_blocking(eh_context_from_bars, eh_bars)
 
             # 添加数据来源信息
             result = eh_context_to_dict(eh_context)
@@ -655,25 +1076,19 @@ async def get_eh_context(
         else:
             # 回退到普通数据（minimal 模式）
             window = "3d" if tf == "1m" else "5d"
-            bars = provider.get_bars(ticker, tf, window)
+            core_bars = await load_core_bars(ticker, tf, window)
 
-            if len(bars) < 100:
+            if len(core_bars) < 100:
                 raise HTTPException(
                     status_code=400,
                     detail={
                         "code": "INSUFFICIENT_DATA",
-                        "message": f"数据不足: 需要至少 100 根 K 线，实际 {len(bars)}"
+                        "message": f"数据不足: 需要至少 100 根 K 线，实际 {len(core_bars)}"
                     }
                 )
 
-            # 转换为 core Bar 类型
-            core_bars = [
-                CoreBar(t=bar.t, o=bar.o, h=bar.h, l=bar.l, c=bar.c, v=bar.v)
-                for bar in bars
-            ]
-
-            # 分离昨日和今日数据
-            yesterday_bars, today_bars = get_yesterday_bars(core_bars)
+            # 分离昨日和今日数据（按日期遍历全部 K 线，放到线程池）
+            yesterday_bars, today_bars = await run_blocking(get_yesterday_bars, core_bars)
 
             if not yesterday_bars:
                 raise HTTPException(
@@ -697,7 +1112,7 @@ async def get_eh_context(
             result["data_source"] = "regular_only"
 
         # 缓存（较短 TTL，因为 EH 数据敏感）
-        cache.set(key, result, ttl=30)
+        await run_blocking(cache.set, key, result, ttl=30)
 
         return result
 
@@ -760,8 +1175,156 @@ def eh_context_to_dict(ctx: EHContext) -> dict:
     }
 
 
+def _narrative_to_dict(request: NarrativeRequest, result) -> dict:
+    """将 NarrativeResult 转换为响应字典"""
+    return {
+        "ticker": request.ticker,
+        "timeframe": request.tf,
+        "report_type": result.report_type,
+        "lang": request.lang,
+        "narrative": {
+            "summary": result.summary,
+            "action": result.action,
+            "content": result.content,  # 完整格式化内容
+            "why": result.why,
+            "risks": result.risks,
+            "quality": result.quality,
+            "triggered_by": result.triggered_by,
+        },
+        "error": result.error,
+    }
+
+
+async def _narrative_events(request: NarrativeRequest, analysis_json: dict):
+    """
+    叙事流式事件生成器 (SSE)
+
+    事件:
+        token: 增量文本
+        done: 完整结果（与非流式响应格式相同）
+    """
+    async for kind, payload in llm_service.stream_analysis(
+        analysis_json=analysis_json,
+        timeframe=request.tf,
+        report_type=request.report_type,
+        lang=request.lang,
+    ):
+        if kind == "token":
+            yield {"event": "token", "data": payload}
+        else:
+            yield {
+                "event": "done",
+                "data": json.dumps(_narrative_to_dict(request, payload), ensure_ascii=False),
+            }
+
+
+def _validate_narrative_request(request: NarrativeRequest) -> None:
+    """
+    校验叙事请求参数
+
+    异常:
+        HTTPException: 时间周期、报告类型或语言无效 (400)
+    """
+    check_timeframe(request.tf)
+
+    if request.report_type not in VALID_REPORT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "REPORT_TYPE_INVALID", "message": f"无效的报告类型: {request.report_type}"}
+        )
+
+    if request.lang not in VALID_LANGS:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "LANG_INVALID", "message": f"无效的语言: {request.lang}"}
+        )
+
+
+def _narrative_cache_keys(request: NarrativeRequest) -> List[str]:
+    """
+    叙事请求会读取的共享缓存键（K 线 + EH 负缓存）
+
+    调用方用一次 cache.get_many 预取到进程内热层（Redis 时为一次 MGET），
+    之后 _narrative_input 中的各次 cache.get 直接命中，不再各自访问 Redis。
+    解析后的 CoreBar 和分析结果缓存在进程内，不经过共享缓存。
+    """
+    window = request.window or provider.get_default_window(request.tf)
+    keys = [cache_key(request.ticker, request.tf, window)]
+    if request.tf in EH_TIMEFRAMES:
+        keys.append(eh_empty_key(request.ticker, request.tf))
+    return keys
+
+
+async def _narrative_input(request: NarrativeRequest) -> dict:
+    """
+    获取 K 线、运行分析并构建 LLM 输入（/v1/narrative 与批量接口共用）
+
+    返回:
+        prepare_analysis_for_llm 的结构化输入
+
+    异常:
+        TickerNotFoundError / RateLimitError / ProviderError: 数据获取失败
+        ValueError: 数据不足等分析错误
+    """
+    # 获取默认回溯时间
+    actual_window = request.window or provider.get_default_window(request.tf)
+
+    # 复用分析逻辑获取数据和报告
+    core_bars = await load_core_bars(request.ticker, request.tf, actual_window)
+
+    # 运行市场分析（CPU 密集，放到进程池），同时获取 EH 上下文（仅 1m/5m 周期）
+    if request.tf in EH_TIMEFRAMES:
+        report_json, eh_ctx = await asyncio.gather(
+            run_analysis(core_bars, request.ticker, request.tf),
+            get_eh_context_internal(request.ticker, request.tf),
+        )
+    else:
+        report_json, eh_ctx = await run_analysis(core_bars, request.ticker, request.tf), None
+
+    # 获取当前价格（最后一根 K 线的收盘价）
+    current_price = core_bars[-1].c if core_bars else 0
+
+    # 转换报告为字典
+    report_dict = orjson.loads(report_json)
+
+    eh_context_data = None
+    if eh_ctx:
+        try:
+            eh_context_data = {
+                "premarket_regime": eh_ctx.premarket_regime,
+                "bias": eh_ctx.bias,
+                "bias_confidence": eh_ctx.bias_confidence,
+                "levels": {
+                    "yc": eh_ctx.levels.yc,
+                    "yh": eh_ctx.levels.yh,
+                    "yl": eh_ctx.levels.yl,
+                    "pmh": eh_ctx.levels.pmh,
+                    "pml": eh_ctx.levels.pml,
+                    "ahh": eh_ctx.levels.ahh,
+                    "ahl": eh_ctx.levels.ahl,
+                    "gap": eh_ctx.levels.gap,
+                    "gap_pct": eh_ctx.levels.gap_pct,
+                }
+            }
+        except Exception as e:
+            logger.warning(f"获取 EH 上下文失败: {e}")
+
+    # 准备 LLM 输入数据（结构化 JSON，不发送原始 OHLCV）
+    return prepare_analysis_for_llm(
+        report=report_dict,
+        ticker=request.ticker,
+        timeframe=request.tf,
+        price=current_price,
+        include_evidence=True,
+        eh_context=eh_context_data
+    )
+
+
 @app.post("/v1/narrative")
-async def narrative(request: NarrativeRequest):
+async def narrative(
+    request: NarrativeRequest,
+    stream: bool = Query(False, description="是否以 SSE 流式返回 token"),
+):
     """
     生成市场叙事报告 v2
 
@@ -780,36 +1343,19 @@ async def narrative(request: NarrativeRequest):
         window: 回溯时间（可选）
         report_type: full / quick / confirmation / context
         lang: 输出语言 (zh / en)
+        stream: 为 true 时返回 SSE 流（token 事件逐段推送，done 事件为完整结果）
 
     返回:
         包含 summary, action, content, why, risks, quality, report_type 的叙事报告
 
-    错误:
-        400: 参数无效或分析错误
-        404: 股票代码不存在
-        429: 请求频率超限
-        502: 提供者或 LLM 错误
-        503: LLM 服务不可用
-    """
-    # 验证参数
-    if request.tf not in ("1m", "5m", "1d"):
-        raise HTTPException(
-            status_code=400,
-            detail={"code": "TIMEFRAME_INVALID", "message": f"无效的时间周期: {request.tf}"}
-        )
-
-    valid_report_types = ("full", "quick", "confirmation", "context")
-    if request.report_type not in valid_report_types:
-        raise HTTPException(
-            status_code=400,
-            detail={"code": "REPORT_TYPE_INVALID", "message": f"无效的报告类型: {request.report_type}"}
-        )
-
-    if request.lang not in ("zh", "en"):
-        raise HTTPException(
-            status_code=400,
-            detail={"code": "LANG_INVALID", "message": f"无效的语言: {request.lang}"}
-        )
+    错误:
+        400: 参数无效或分析错误
+        404: 股票代码不存在
+        429: 请求频率超限
+        502: 提供者或 LLM 错误
+        503: LLM 服务不可用
+    """
+    _validate_narrative_request(request)
 
     # 检查 LLM 服务是否可用
     if not settings.llm_api_key:
@@ -818,85 +1364,13 @@ async def narrative(request: NarrativeRequest):
             detail={"code": "LLM_NOT_CONFIGURED", "message": "LLM API Key 未配置"}
         )
 
-    # 获取默认回溯时间
-    actual_window = request.window or provider.get_default_window(request.tf)
-
-    # 复用分析逻辑获取数据和报告
-    key = cache_key(request.ticker, request.tf, actual_window)
-    cached_bars = cache.get(key)
-
     try:
-        if cached_bars is not None:
-            logger.info(f"叙事: 缓存命中 {request.ticker}")
-            from dateutil.parser import isoparse
-            core_bars = [
-                CoreBar(
-                    t=isoparse(bar["t"].replace("Z", "+00:00")),
-                    o=bar["o"],
-                    h=bar["h"],
-                    l=bar["l"],
-                    c=bar["c"],
-                    v=bar["v"]
-                )
-                for bar in cached_bars
-            ]
-        else:
-            logger.info(f"叙事: 获取数据 {request.ticker}")
-            api_bars = provider.get_bars(request.ticker, request.tf, actual_window)
-            bars_data = [bar.to_dict() for bar in api_bars]
-            cache.set(key, bars_data)
-            core_bars = [
-                CoreBar(t=bar.t, o=bar.o, h=bar.h, l=bar.l, c=bar.c, v=bar.v)
-                for bar in api_bars
-            ]
-
-        # 运行市场分析
-        report = analyze_market(
-            bars=core_bars,
-            ticker=request.ticker,
-            timeframe=request.tf
-        )
-
-        # 获取当前价格（最后一根 K 线的收盘价）
-        current_price = core_bars[-1].c if core_bars else 0
-
-        # 转换报告为字典
-        report_dict = report_to_dict(report)
-
-        # 获取 EH 上下文（仅 1m/5m 周期）
-        eh_context_data = None
-        if request.tf in ("1m", "5m"):
-            try:
-                eh_ctx = await get_eh_context_internal(request.ticker, request.tf)
-                if eh_ctx:
-                    eh_context_data = {
-                        "premarket_regime": eh_ctx.premarket_regime,
-                        "bias": eh_ctx.bias,
-                        "bias_confidence": eh_ctx.bias_confidence,
-                        "levels": {
-                            "yc": eh_ctx.levels.yc,
-                            "yh": eh_ctx.levels.yh,
-                            "yl": eh_ctx.levels.yl,
-                            "pmh": eh_ctx.levels.pmh,
-                            "pml": eh_ctx.levels.pml,
-                            "ahh": eh_ctx.levels.ahh,
-                            "ahl": eh_ctx.levels.ahl,
-                            "gap": eh_ctx.levels.gap,
-                            "gap_pct": eh_ctx.levels.gap_pct,
-                        }
-                    }
-            except Exception as e:
-                logger.warning(f"获取 EH 上下文失败: {e}")
+        await run_blocking(cache.get_many, _narrative_cache_keys(request))
+        analysis_json = await _narrative_input(request)
 
-        # 准备 LLM 输入数据（结构化 JSON，不发送原始 OHLCV）
-        analysis_json = prepare_analysis_for_llm(
-            report=report_dict,
-            ticker=request.ticker,
-            timeframe=request.tf,
-            price=current_price,
-            include_evidence=True,
-            eh_context=eh_context_data
-        )
+        # 流式: 边生成边推送，首个 token 即可展示
+        if stream:
+            return EventSourceResponse(_narrative_events(request, analysis_json))
 
         # 生成叙事
         result = await llm_service.generate_analysis(
@@ -907,22 +1381,7 @@ async def narrative(request: NarrativeRequest):
         )
 
         # 返回结果
-        return {
-            "ticker": request.ticker,
-            "timeframe": request.tf,
-            "report_type": result.report_type,
-            "lang": request.lang,
-            "narrative": {
-                "summary": result.summary,
-                "action": result.action,
-                "content": result.content,  # 完整格式化内容
-                "why": result.why,
-                "risks": result.risks,
-                "quality": result.quality,
-                "triggered_by": result.triggered_by,
-            },
-            "error": result.error,
-        }
+        return _narrative_to_dict(request, result)
 
     except TickerNotFoundError as e:
         raise HTTPException(
@@ -946,12 +1405,95 @@ async def narrative(request: NarrativeRequest):
         )
 
 
+# 批量叙事单次最多请求数
+NARRATIVE_BATCH_MAX = 10
+
+
+@app.post("/v1/narrative/batch")
+async def narrative_batch(requests: List[NarrativeRequest]):
+    """
+    批量生成市场叙事报告
+
+    各项的分析与 LLM 调用并发进行（LLM 调用数受 LLM_MAX_CONCURRENCY 限制），
+    总耗时接近最慢的一项，而不是各项之和。
+
+    参数:
+        requests: NarrativeRequest 列表（1 到 NARRATIVE_BATCH_MAX 项）
+
+    返回:
+        {"count": n, "results": [...]}，顺序与请求一致。
+        每项格式同 /v1/narrative；单项失败时 narrative 为 null，
+        error 为 {"code": ..., "message": ...}，不影响其他项
+
+    错误:
+        400: 请求数量或参数无效
+        503: LLM 服务不可用
+    """
+    if not 1 <= len(requests) <= NARRATIVE_BATCH_MAX:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "BATCH_SIZE_INVALID", "message": f"请求数量需在 1 到 {NARRATIVE_BATCH_MAX} 之间"}
+        )
+
+    for request in requests:
+        _validate_narrative_request(request)
+
+    if not settings.llm_api_key:
+        raise HTTPException(
+            status_code=503,
+            detail={"code": "LLM_NOT_CONFIGURED", "message": "LLM API Key 未配置"}
+        )
+
+    # 共享缓存（Redis）时一次 MGET 预取各项的 K 线和 EH 负缓存到进程内热层，
+    # 之后各项的 cache.get 直接命中，不再各自访问 Redis
+    await run_blocking(cache.get_many, [
+        key for request in requests for key in _narrative_cache_keys(request)
+    ])
+
+    results = await asyncio.gather(*(_narrative_batch_item(request) for request in requests))
+    return {"count": len(results), "results": results}
+
+
+async def _narrative_batch_item(request: NarrativeRequest) -> dict:
+    """生成批量请求中的一项（错误记入该项的 error，不中断其他项）"""
+    try:
+        analysis_json = await _narrative_input(request)
+        async with batch_llm_semaphore:
+            result = await llm_service.generate_analysis(
+                analysis_json=analysis_json,
+                timeframe=request.tf,
+                report_type=request.report_type,
+                lang=request.lang,
+            )
+        return _narrative_to_dict(request, result)
+    except TickerNotFoundError as e:
+        code, message = "NO_DATA", str(e)
+    except RateLimitError as e:
+        code, message = "PROVIDER_RATE_LIMITED", str(e)
+    except ValueError as e:
+        code, message = "ANALYSIS_ERROR", str(e)
+    except ProviderError as e:
+        code, message = "PROVIDER_ERROR", str(e)
+    except Exception as e:
+        logger.error(f"批量叙事生成失败: {request.ticker}: {e}")
+        code, message = "NARRATIVE_ERROR", "叙事生成失败"
+
+    return {
+        "ticker": request.ticker,
+        "timeframe": request.tf,
+        "report_type": request.report_type,
+        "lang": request.lang,
+        "narrative": None,
+        "error": {"code": code, "message": message},
+    }
+
+
 # ============ Sim Trade Plan API ============
 
 @app.get("/v1/sim-trade-plan")
 async def get_sim_trade_plan(
-    ticker: str = Query(..., description="股票代码 (如 QQQ)"),
-    tf: str = Query("1m", description="时间周期", regex="^(1m|5m)$"),
+    ticker: Annotated[Ticker, Query(description="股票代码 (如 QQQ)")],
+    tf: str = Depends(eh_timeframe_query),
 ):
     """
     获取 0DTE 交易计划
@@ -989,10 +1531,8 @@ async def get_sim_trade_plan(
         # 导入 sim_trader 服务
         from .services.sim_trader_service import get_trade_plan, convert_analysis_to_snapshot
 
-        ticker = ticker.upper()
-
         # 获取 K 线数据
-        bars_data = provider.get_bars(ticker, tf, window="1d")
+        core_bars = await load_core_bars(ticker, tf, "1d")
         bars = [
             {
                 "time": bar.t,
@@ -1002,7 +1542,7 @@ async def get_sim_trade_plan(
                 "close": bar.c,
                 "volume": bar.v,
             }
-            for bar in bars_data
+            for bar in core_bars
         ]
 
         if not bars:
@@ -1011,29 +1551,15 @@ async def get_sim_trade_plan(
                 detail={"code": "NO_DATA", "message": f"No bars data for {ticker}"}
             )
 
-        # 运行分析
-        core_bars = [
-            CoreBar(
-                t=bar["time"],
-                o=bar["open"],
-                h=bar["high"],
-                l=bar["low"],
-                c=bar["close"],
-                v=bar["volume"],
+        # 运行分析，同时获取 EH 上下文（get_eh_context_internal 失败时返回 None）
+        if tf in EH_TIMEFRAMES:
+            report_json, eh_context = await asyncio.gather(
+                run_analysis(core_bars, ticker),
+                get_eh_context_internal(ticker, tf),
             )
-            for bar in bars
-        ]
-        params = AnalysisParams()
-        report = analyze_market(bars=core_bars, ticker=ticker, state=None, params=params)
-        analysis_dict = report_to_dict(report)
-
-        # 获取 EH 上下文
-        eh_context = None
-        if tf in ["1m", "5m"]:
-            try:
-                eh_context = await get_eh_context_internal(ticker, tf)
-            except Exception as e:
-                logger.warning(f"获取 EH 上下文失败: {e}")
+        else:
+            report_json, eh_context = await run_analysis(core_bars, ticker), None
+        analysis_dict = orjson.loads(report_json)
 
         # 获取交易计划
         result = get_trade_plan(
@@ -1065,7 +1591,7 @@ async def get_sim_trade_plan(
 
 @app.post("/v1/sim-trade-plan/reset")
 async def reset_sim_trade_plan(
-    ticker: str = Query(..., description="股票代码 (如 QQQ)"),
+    ticker: Annotated[Ticker, Query(description="股票代码 (如 QQQ)")],
 ):
     """
     重置交易计划状态
@@ -1074,7 +1600,6 @@ async def reset_sim_trade_plan(
     """
     from .services.sim_trader_service import reset_trader
 
-    ticker = ticker.upper()
     reset_trader(ticker)
 
     return {"message": f"Trade plan for {ticker} has been reset"}
@@ -1082,6 +1607,75 @@ async def reset_sim_trade_plan(
 
 # ============ Signal Evaluation API ============
 
+# 批量创建单次最多记录数
+MAX_EVALUATION_BATCH = 500
+
+
+def _validate_evaluation_request(request: SignalEvaluationRequest) -> None:
+    """
+    校验信号评估创建请求
+
+    异常:
+        HTTPException(400): 时间周期、方向或置信度无效
+    """
+    check_timeframe(request.tf)
+
+    if request.direction not in VALID_DIRECTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "DIRECTION_INVALID", "message": f"无效的方向: {request.direction}"}
+        )
+
+    if not 0 <= request.confidence <= 1:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "CONFIDENCE_INVALID", "message": "置信度必须在 0-1 之间"}
+        )
+
+
+def _evaluation_from_request(request: SignalEvaluationRequest) -> SignalEvaluation:
+    """由创建请求生成待评估记录（分配 ID 和创建时间）"""
+    return SignalEvaluation(
+        id=generate_eval_id(),
+        ticker=request.ticker,
+        tf=request.tf,
+        created_at=utc_timestamp(),
+        signal_type=request.signal_type,
+        direction=request.direction,
+        predicted_behavior=request.predicted_behavior,
+        entry_price=request.entry_price,
+        target_price=request.target_price,
+        invalidation_price=request.invalidation_price,
+        confidence=request.confidence,
+        notes=request.notes,
+        status="pending",
+    )
+
+
+def encode_eval_cursor(evaluation: SignalEvaluation) -> str:
+    """将记录的 (created_at, id) 编码为不透明的分页游标"""
+    raw = f"{evaluation.created_at}|{evaluation.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_eval_cursor(cursor: str) -> tuple:
+    """
+    解码分页游标为 (created_at, id)
+
+    异常:
+        HTTPException: 游标格式无效 (400)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, eval_id = raw.split("|")
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "CURSOR_INVALID", "message": "无效的分页游标"}
+        )
+    return created_at, eval_id
+
+
 @app.post("/v1/signal-evaluation", status_code=201)
 async def create_signal_evaluation(request: SignalEvaluationRequest):
     """
@@ -1105,64 +1699,56 @@ async def create_signal_evaluation(request: SignalEvaluationRequest):
         创建的评估记录
     """
     # 验证参数
-    if request.tf not in ("1m", "5m", "1d"):
-        raise HTTPException(
-            status_code=400,
-            detail={"code": "TIMEFRAME_INVALID", "message": f"无效的时间周期: {request.tf}"}
-        )
+    _validate_evaluation_request(request)
+
+    # 创建评估记录
+    evaluation = _evaluation_from_request(request)
 
-    if request.direction not in ("up", "down"):
+    try:
+        created = await run_blocking(eval_db.create, evaluation)
+        # orjson 直接序列化 slots dataclass，字段顺序即响应键顺序
+        return FastJSONResponse(created, status_code=201)
+    except Exception as e:
+        logger.error(f"创建评估记录失败: {e}")
         raise HTTPException(
-            status_code=400,
-            detail={"code": "DIRECTION_INVALID", "message": f"无效的方向: {request.direction}"}
+            status_code=500,
+            detail={"code": "DB_ERROR", "message": "数据库错误"}
         )
 
-    if not 0 <= request.confidence <= 1:
+
+@app.post("/v1/signal-evaluations/batch", status_code=201)
+async def create_signal_evaluations_batch(requests: List[SignalEvaluationRequest]):
+    """
+    批量创建信号评估记录
+
+    所有记录在同一个事务中写入（一次 executemany、一次提交），
+    任一记录校验失败则整批不写入。
+
+    参数:
+        requests: SignalEvaluationRequest 列表（最多 MAX_EVALUATION_BATCH 条）
+
+    返回:
+        创建数量和创建的评估记录列表
+    """
+    if not requests or len(requests) > MAX_EVALUATION_BATCH:
         raise HTTPException(
             status_code=400,
-            detail={"code": "CONFIDENCE_INVALID", "message": "置信度必须在 0-1 之间"}
+            detail={
+                "code": "BATCH_SIZE_INVALID",
+                "message": f"批量数量必须在 1-{MAX_EVALUATION_BATCH} 之间"
+            }
         )
 
-    # 创建评估记录
-    evaluation = SignalEvaluation(
-        id=generate_eval_id(),
-        ticker=request.ticker.upper(),
-        tf=request.tf,
-        created_at=datetime.utcnow().isoformat() + "Z",
-        signal_type=request.signal_type,
-        direction=request.direction,
-        predicted_behavior=request.predicted_behavior,
-        entry_price=request.entry_price,
-        target_price=request.target_price,
-        invalidation_price=request.invalidation_price,
-        confidence=request.confidence,
-        notes=request.notes,
-        status="pending",
-    )
+    for request in requests:
+        _validate_evaluation_request(request)
+
+    evaluations = [_evaluation_from_request(request) for request in requests]
 
     try:
-        created = eval_db.create(evaluation)
-        return {
-            "id": created.id,
-            "ticker": created.ticker,
-            "tf": created.tf,
-            "created_at": created.created_at,
-            "signal_type": created.signal_type,
-            "direction": created.direction,
-            "predicted_behavior": created.predicted_behavior,
-            "entry_price": created.entry_price,
-            "target_price": created.target_price,
-            "invalidation_price": created.invalidation_price,
-            "confidence": created.confidence,
-            "notes": created.notes,
-            "status": created.status,
-            "result": created.result,
-            "actual_outcome": created.actual_outcome,
-            "evaluation_notes": created.evaluation_notes,
-            "evaluated_at": created.evaluated_at,
-        }
+        created = await run_blocking(eval_db.create_many, evaluations)
+        return FastJSONResponse({"count": len(created), "records": created}, status_code=201)
     except Exception as e:
-        logger.error(f"创建评估记录失败: {e}")
+        logger.error(f"批量创建评估记录失败: {e}")
         raise HTTPException(
             status_code=500,
             detail={"code": "DB_ERROR", "message": "数据库错误"}
@@ -1171,11 +1757,12 @@ async def create_signal_evaluation(request: SignalEvaluationRequest):
 
 @app.get("/v1/signal-evaluations")
 async def list_signal_evaluations(
-    ticker: str = Query(..., description="股票代码"),
-    tf: Optional[str] = Query(None, description="时间周期过滤: 1m, 5m, 1d"),
-    status: Optional[str] = Query(None, description="状态过滤: pending, correct, incorrect"),
+    ticker: Annotated[Ticker, Query(description="股票代码")],
+    filters: Tuple[Optional[str], Optional[str]] = Depends(evaluation_filters),
     limit: int = Query(50, ge=1, le=200, description="返回数量限制"),
-    offset: int = Query(0, ge=0, description="分页偏移"),
+    offset: int = Query(0, ge=0, description="分页偏移（已弃用，请使用 cursor）", deprecated=True),
+    before: Optional[str] = Query(None, description="游标分页: 上一页最后一条的 created_at"),
+    cursor: Optional[str] = Query(None, description="游标分页: 上一页返回的 next_cursor"),
 ):
     """
     获取信号评估历史记录
@@ -1187,74 +1774,42 @@ async def list_signal_evaluations(
         tf: 时间周期过滤 (可选)
         status: 状态过滤 (可选)
         limit: 返回数量限制 (默认 50)
-        offset: 分页偏移 (默认 0)
+        offset: 分页偏移 (默认 0，已弃用: 深页需要扫描并丢弃 offset 行)
+        before: 游标分页 (可选)，传入上一页返回的 next_before
+        cursor: 游标分页 (可选)，传入上一页返回的 next_cursor。
+            按 (created_at, id) 定位，翻页耗时与页码无关，同一毫秒创建的记录也不会遗漏
 
     返回:
-        评估记录列表和统计信息
+        评估记录列表、统计信息和下一页游标 next_cursor / next_before
     """
-    # 验证参数
-    if tf and tf not in ("1m", "5m", "1d"):
-        raise HTTPException(
-            status_code=400,
-            detail={"code": "TIMEFRAME_INVALID", "message": f"无效的时间周期: {tf}"}
-        )
+    tf, status = filters
 
-    if status and status not in ("pending", "correct", "incorrect"):
-        raise HTTPException(
-            status_code=400,
-            detail={"code": "STATUS_INVALID", "message": f"无效的状态: {status}"}
-        )
+    before_key = decode_eval_cursor(cursor) if cursor else None
 
     try:
-        # 获取记录列表
-        records = eval_db.list(
-            ticker=ticker.upper(),
+        # 记录列表、总数和统计信息一次读取
+        records, total, statistics = await run_blocking(
+            eval_db.list_with_stats,
+            ticker=ticker,
             tf=tf,
             status=status,
             limit=limit,
-            offset=offset
+            offset=offset,
+            before=before,
+            before_key=before_key
         )
 
-        # 获取总数
-        total = eval_db.count(ticker=ticker.upper(), tf=tf, status=status)
-
-        # 获取统计信息
-        statistics = eval_db.get_statistics(ticker=ticker.upper(), tf=tf)
-
-        return {
-            "ticker": ticker.upper(),
+        has_more = len(records) == limit
+        # 直接返回响应，跳过 jsonable_encoder；记录与统计均为 dataclass，
+        # 由 orjson 按字段顺序原生序列化，无需逐条构建字典
+        return FastJSONResponse({
+            "ticker": ticker,
             "total": total,
-            "records": [
-                {
-                    "id": r.id,
-                    "ticker": r.ticker,
-                    "tf": r.tf,
-                    "created_at": r.created_at,
-                    "signal_type": r.signal_type,
-                    "direction": r.direction,
-                    "predicted_behavior": r.predicted_behavior,
-                    "entry_price": r.entry_price,
-                    "target_price": r.target_price,
-                    "invalidation_price": r.invalidation_price,
-                    "confidence": r.confidence,
-                    "notes": r.notes,
-                    "status": r.status,
-                    "result": r.result,
-                    "actual_outcome": r.actual_outcome,
-                    "evaluation_notes": r.evaluation_notes,
-                    "evaluated_at": r.evaluated_at,
-                }
-                for r in records
-            ],
-            "statistics": {
-                "total_predictions": statistics.total_predictions,
-                "correct": statistics.correct,
-                "incorrect": statistics.incorrect,
-                "pending": statistics.pending,
-                "accuracy_rate": statistics.accuracy_rate,
-                "by_signal_type": statistics.by_signal_type,
-            }
-        }
+            "next_cursor": encode_eval_cursor(records[-1]) if has_more else None,
+            "next_before": records[-1].created_at if has_more else None,
+            "records": records,
+            "statistics": statistics,
+        })
     except Exception as e:
         logger.error(f"获取评估记录失败: {e}")
         raise HTTPException(
@@ -1263,6 +1818,67 @@ async def list_signal_evaluations(
         )
 
 
+@app.get("/v1/signal-evaluations/export")
+async def export_signal_evaluations(
+    ticker: Annotated[Ticker, Query(description="股票代码")],
+    filters: Tuple[Optional[str], Optional[str]] = Depends(evaluation_filters),
+    limit: int = Query(10000, ge=1, le=100000, description="返回数量限制"),
+    before: Optional[str] = Query(None, description="只导出早于该 created_at 的记录"),
+):
+    """
+    流式导出信号评估记录 (NDJSON)
+
+    每行一条 JSON 记录，按 created_at 倒序。记录边读边发，
+    不在内存中组装完整列表，适合大批量导出。
+
+    参数:
+        ticker: 股票代码 (必需)
+        tf: 时间周期过滤 (可选)
+        status: 状态过滤 (可选)
+        limit: 返回数量限制 (默认 10000)
+        before: 游标 (可选)
+
+    返回:
+        application/x-ndjson 流
+    """
+    tf, status = filters
+
+    records = eval_db.iter_list(
+        ticker=ticker,
+        tf=tf,
+        status=status,
+        limit=limit,
+        before=before
+    )
+
+    def generate_ndjson():
+        # 同步生成器由 Starlette 放到线程池迭代，读库不阻塞事件循环
+        for record in records:
+            yield orjson.dumps(record) + b"\n"
+
+    return StreamingResponse(generate_ndjson(), media_type="application/x-ndjson")
+
+
+def _validate_evaluation_update(request: SignalEvaluationUpdateRequest) -> None:
+    """
+    校验信号评估更新请求
+
+    异常:
+        HTTPException(400): 状态或结果类型无效
+    """
+    if request.status not in RESOLVED_EVAL_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "STATUS_INVALID", "message": f"无效的状态: {request.status}"}
+        )
+
+    if request.result not in VALID_EVAL_RESULTS:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "RESULT_INVALID", "message": f"无效的结果类型: {request.result}"}
+        )
+
+
 @app.put("/v1/signal-evaluation/{eval_id}")
 async def update_signal_evaluation(eval_id: str, request: SignalEvaluationUpdateRequest):
     """
@@ -1280,22 +1896,11 @@ async def update_signal_evaluation(eval_id: str, request: SignalEvaluationUpdate
     返回:
         更新后的评估记录
     """
-    # 验证参数
-    if request.status not in ("correct", "incorrect"):
-        raise HTTPException(
-            status_code=400,
-            detail={"code": "STATUS_INVALID", "message": f"无效的状态: {request.status}"}
-        )
-
-    valid_results = ("target_hit", "invalidation_hit", "partial_correct", "direction_wrong", "timeout")
-    if request.result not in valid_results:
-        raise HTTPException(
-            status_code=400,
-            detail={"code": "RESULT_INVALID", "message": f"无效的结果类型: {request.result}"}
-        )
+    _validate_evaluation_update(request)
 
     try:
-        updated = eval_db.update(
+        updated = await run_blocking(
+            eval_db.update,
             eval_id=eval_id,
             status=request.status,
             result=request.result,
@@ -1339,7 +1944,7 @@ async def delete_signal_evaluation(eval_id: str):
         删除确认
     """
     try:
-        deleted = eval_db.delete(eval_id)
+        deleted = await run_blocking(eval_db.delete, eval_id)
         if not deleted:
             raise HTTPException(
                 status_code=404,
@@ -1358,30 +1963,69 @@ async def delete_signal_evaluation(eval_id: str):
 
 # ============ Watchlist (自选股) API ============
 
+def watchlist_to_columnar(items: List[WatchlistItem], prices: Mapping[str, RealtimePrice]) -> Dict[str, list]:
+    """
+    将自选股及实时价格转换为按字段分列的格式
+
+    每个字段一个列表（下标对应同一只股票），无实时价格的位置为 None。
+
+    参数:
+        items: 自选股列表
+        prices: symbol -> 最新价格
+
+    返回:
+        字段名 -> 值列表
+    """
+    realtime = [prices.get(item.ticker) for item in items]
+    return {
+        "tickers": [item.ticker for item in items],
+        "added_at": [item.added_at for item in items],
+        "notes": [item.note for item in items],
+        "prices": [p.price if p else None for p in realtime],
+        "changes": [p.day_change if p else None for p in realtime],
+        "change_pcts": [p.day_change_pct if p else None for p in realtime],
+        "timestamps": [p.timestamp_iso if p else None for p in realtime],
+    }
+
+
 @app.get("/v1/watchlist")
-async def get_watchlist():
+async def get_watchlist(
+    fmt: Literal["rows", "columnar"] = Query("rows", alias="format", description="响应格式: rows（逐条对象）或 columnar（按字段分列）"),
+):
     """
     获取自选股列表
 
     返回所有自选股及其实时状态。
+
+    参数:
+        format: 响应格式 (可选)，rows 为默认的逐条对象，
+            columnar 返回 {"tickers": [...], "prices": [...], ...}
     """
     try:
-        items = watchlist_db.list()
+        items = await run_blocking(watchlist_db.list)
         ws_manager = get_websocket_manager()
+        # 一次取出所有最新价格，各条目读同一份快照
+        prices = ws_manager.get_all_prices() if ws_manager else {}
+
+        if fmt == "columnar":
+            return {
+                "count": len(items),
+                "max": watchlist_db.MAX_ITEMS,
+                "items": watchlist_to_columnar(items, prices),
+            }
 
         result = []
         for item in items:
             # 获取实时价格（如果有）
             realtime = None
-            if ws_manager:
-                price_data = ws_manager.get_latest_price(item.ticker)
-                if price_data:
-                    realtime = {
-                        "price": price_data.price,
-                        "change": price_data.day_change,
-                        "change_pct": price_data.day_change_pct,
-                        "timestamp": price_data.timestamp.isoformat() if price_data.timestamp else None,
-                    }
+            price_data = prices.get(item.ticker)
+            if price_data:
+                realtime = {
+                    "price": price_data.price,
+                    "change": price_data.day_change,
+                    "change_pct": price_data.day_change_pct,
+                    "timestamp": price_data.timestamp_iso,
+                }
 
             result.append({
                 "ticker": item.ticker,
@@ -1404,7 +2048,7 @@ async def get_watchlist():
 
 
 @app.post("/v1/watchlist/{ticker}", status_code=201)
-async def add_to_watchlist(ticker: str, note: Optional[str] = None):
+async def add_to_watchlist(ticker: Ticker, note: Optional[str] = None):
     """
     添加股票到自选股
 
@@ -1418,10 +2062,8 @@ async def add_to_watchlist(ticker: str, note: Optional[str] = None):
     返回:
         添加结果
     """
-    ticker = ticker.upper()
-
     try:
-        success, message = watchlist_db.add(ticker, note)
+        success, message = await run_blocking(watchlist_db.add, ticker, note)
 
         if not success:
             raise HTTPException(
@@ -1439,7 +2081,7 @@ async def add_to_watchlist(ticker: str, note: Optional[str] = None):
             "success": True,
             "ticker": ticker,
             "message": message,
-            "count": watchlist_db.count(),
+            "count": await run_blocking(watchlist_db.count),
             "max": watchlist_db.MAX_ITEMS,
         }
     except HTTPException:
@@ -1453,7 +2095,7 @@ async def add_to_watchlist(ticker: str, note: Optional[str] = None):
 
 
 @app.delete("/v1/watchlist/{ticker}")
-async def remove_from_watchlist(ticker: str):
+async def remove_from_watchlist(ticker: Ticker):
     """
     从自选股移除
 
@@ -1465,10 +2107,8 @@ async def remove_from_watchlist(ticker: str):
     返回:
         移除结果
     """
-    ticker = ticker.upper()
-
     try:
-        success, message = watchlist_db.remove(ticker)
+        success, message = await run_blocking(watchlist_db.remove, ticker)
 
         if not success:
             raise HTTPException(
@@ -1486,7 +2126,7 @@ async def remove_from_watchlist(ticker: str):
             "success": True,
             "ticker": ticker,
             "message": message,
-            "count": watchlist_db.count(),
+            "count": await run_blocking(watchlist_db.count),
             "max": watchlist_db.MAX_ITEMS,
         }
     except HTTPException:
@@ -1500,7 +2140,7 @@ async def remove_from_watchlist(ticker: str):
 
 
 @app.get("/v1/watchlist/{ticker}/status")
-async def get_watchlist_status(ticker: str):
+async def get_watchlist_status(ticker: Ticker):
     """
     检查股票是否在自选股列表
 
@@ -1510,9 +2150,7 @@ async def get_watchlist_status(ticker: str):
     返回:
         是否在自选股列表及实时数据状态
     """
-    ticker = ticker.upper()
-
-    is_watched = watchlist_db.is_in_watchlist(ticker)
+    is_watched = await run_blocking(watchlist_db.is_in_watchlist, ticker)
     ws_manager = get_websocket_manager()
 
     realtime = None
@@ -1523,7 +2161,7 @@ async def get_watchlist_status(ticker: str):
                 "price": price_data.price,
                 "change": price_data.day_change,
                 "change_pct": price_data.day_change_pct,
-                "timestamp": price_data.timestamp.isoformat() if price_data.timestamp else None,
+                "timestamp": price_data.timestamp_iso,
             }
 
     return {
@@ -1531,7 +2169,7 @@ async def get_watchlist_status(ticker: str):
         "is_watched": is_watched,
         "has_realtime": realtime is not None,
         "realtime": realtime,
-        "count": watchlist_db.count(),
+        "count": await run_blocking(watchlist_db.count),
         "max": watchlist_db.MAX_ITEMS,
     }
 
@@ -1539,11 +2177,17 @@ async def get_watchlist_status(ticker: str):
 # ============ 实时数据流 API ============
 
 @app.get("/v1/stream/status")
-async def stream_status():
+async def stream_status(
+    include_prices: bool = Query(False, description="是否返回各 symbol 的缓存价格"),
+):
     """
     WebSocket 连接状态
 
     返回当前 WebSocket 连接状态和已订阅的 symbols。
+
+    参数:
+        include_prices: 为 true 时附带 cached_prices（默认不返回，
+            仅检查连接状态的轮询无需遍历所有价格）
     """
     ws_manager = get_websocket_manager()
 
@@ -1555,22 +2199,24 @@ async def stream_status():
             "message": "WebSocket 未配置（需要 TwelveData API Key）"
         }
 
-    return {
+    status = {
         "enabled": True,
         "connected": ws_manager.is_connected,
         "subscribed_symbols": list(ws_manager.subscribed_symbols),
-        "cached_prices": {
+    }
+    if include_prices:
+        status["cached_prices"] = {
             symbol: {
                 "price": p.price,
-                "timestamp": p.timestamp.isoformat() if p.timestamp else None
+                "timestamp": p.timestamp_iso
             }
             for symbol, p in ws_manager.get_all_prices().items()
         }
-    }
+    return status
 
 
 @app.get("/v1/stream/{ticker}")
-async def stream_price(ticker: str):
+async def stream_price(ticker: Ticker):
     """
     实时价格 SSE 流
 
@@ -1587,7 +2233,6 @@ async def stream_price(ticker: str):
         event: price
         data: {"symbol": "QQQ", "price": 520.50, "timestamp": "...", "change": 1.25, "change_pct": 0.24}
     """
-    ticker = ticker.upper()
     ws_manager = get_websocket_manager()
 
     if ws_manager is None:
@@ -1597,49 +2242,46 @@ async def stream_price(ticker: str):
         )
 
     # 只为自选股提供实时数据流
-    if not watchlist_db.is_in_watchlist(ticker):
+    if not await run_blocking(watchlist_db.is_in_watchlist, ticker):
         raise HTTPException(
             status_code=404,
             detail={"code": "NOT_IN_WATCHLIST", "message": f"{ticker} 不在自选股列表中，无法获取实时数据"}
         )
 
     async def event_generator():
-        """生成 SSE 事件"""
-        last_price = None
+        """生成 SSE 事件（等待 WebSocket 推送，无轮询）"""
+        # 按 tick_seq 去重：只推送价格有变化的更新
+        last_seq = -1
+        queue = ws_manager.add_listener(ticker)
 
-        while True:
-            try:
-                # 获取最新价格
-                price_data = ws_manager.get_latest_price(ticker)
+        try:
+            while True:
+                price_data = await queue.get()
 
-                if price_data and (last_price is None or price_data.price != last_price):
-                    last_price = price_data.price
+                if price_data.tick_seq != last_seq:
+                    last_seq = price_data.tick_seq
                     yield {
                         "event": "price",
                         "data": json.dumps({
                             "symbol": price_data.symbol,
                             "price": price_data.price,
-                            "timestamp": price_data.timestamp.isoformat() if price_data.timestamp else None,
+                            "timestamp": price_data.timestamp_iso,
                             "change": price_data.day_change,
                             "change_pct": price_data.day_change_pct,
                         })
                     }
-
-                # 等待一小段时间再检查
-                await asyncio.sleep(0.2)
-
-            except asyncio.CancelledError:
-                logger.info(f"SSE 连接关闭: {ticker}")
-                break
-            except Exception as e:
-                logger.error(f"SSE 事件生成错误: {e}")
-                break
+        except asyncio.CancelledError:
+            logger.info(f"SSE 连接关闭: {ticker}")
+        except Exception as e:
+            logger.error(f"SSE 事件生成错误: {e}")
+        finally:
+            ws_manager.remove_listener(ticker, queue)
 
     return EventSourceResponse(event_generator())
 
 
 @app.get("/v1/realtime/{ticker}")
-async def get_realtime_price(ticker: str):
+async def get_realtime_price(ticker: Ticker):
     """
     获取实时价格（单次请求）
 
@@ -1651,7 +2293,6 @@ async def get_realtime_price(ticker: str):
     返回:
         最新价格数据
     """
-    ticker = ticker.upper()
     ws_manager = get_websocket_manager()
 
     # 优先使用 WebSocket 缓存的价格
@@ -1661,7 +2302,7 @@ async def get_realtime_price(ticker: str):
             return {
                 "ticker": ticker,
                 "price": price_data.price,
-                "timestamp": price_data.timestamp.isoformat() if price_data.timestamp else None,
+                "timestamp": price_data.timestamp_iso,
                 "change": price_data.day_change,
                 "change_pct": price_data.day_change_pct,
                 "source": "websocket",
@@ -1673,7 +2314,7 @@ async def get_realtime_price(ticker: str):
 
     # 回退到 REST API
     try:
-        bars = provider.get_bars(ticker, "1m", "1d")
+        bars = await run_blocking(provider.get_bars, ticker, "1m", "1d")
         if bars:
             latest = bars[-1]
             return {
@@ -10,13 +10,23 @@
 主要导出:
 - MarketDataProvider: 数据提供者抽象基类
 - Bar: K线数据结构
+- ConditionalBars: 条件请求结果（304 时 bars 为 None）
 - get_provider: 根据配置获取提供者实例
+- retry_on_rate_limit: 频率限制时指数退避重试
 - 各种异常类型
 """
 
 from typing import Optional
 
-from .base import MarketDataProvider, Bar, ProviderError, TickerNotFoundError, RateLimitError
+from .base import (
+    MarketDataProvider,
+    Bar,
+    ConditionalBars,
+    ProviderError,
+    TickerNotFoundError,
+    RateLimitError,
+    retry_on_rate_limit,
+)
 from .yfinance_provider import YFinanceProvider
 from .alphavantage_provider import AlphaVantageProvider
 from .alpaca_provider import AlpacaProvider
@@ -69,9 +79,11 @@ def get_provider(
 __all__ = [
     "MarketDataProvider",
     "Bar",
+    "ConditionalBars",
     "ProviderError",
     "TickerNotFoundError",
     "RateLimitError",
+    "retry_on_rate_limit",
     "TwelveDataProvider",
     "YFinanceProvider",
     "AlpacaProvider",
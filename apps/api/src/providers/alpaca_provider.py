@@ -62,6 +62,8 @@ class AlpacaProvider(MarketDataProvider):
             "APCA-API-KEY-ID": api_key,
             "APCA-API-SECRET-KEY": api_secret,
         }
+        # 复用 HTTP 连接（keep-alive），避免每次请求重新握手 TCP/TLS
+        self._session = requests.Session()
 
     @property
     def name(self) -> str:
@@ -119,7 +121,7 @@ class AlpacaProvider(MarketDataProvider):
         }
 
         try:
-            response = requests.get(url, headers=self._headers, params=params, timeout=30)
+            response = self._session.get(url, headers=self._headers, params=params, timeout=30)
 
             # 处理错误响应
             if response.status_code == 401:
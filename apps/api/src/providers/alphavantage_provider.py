@@ -53,6 +53,8 @@ class AlphaVantageProvider(MarketDataProvider):
         if not api_key:
             raise ProviderError("Alpha Vantage 需要 API Key，请设置 ALPHAVANTAGE_API_KEY 环境变量")
         self._api_key = api_key
+        # 复用 HTTP 连接（keep-alive），避免每次请求重新握手 TCP/TLS
+        self._session = requests.Session()
 
     @property
     def name(self) -> str:
@@ -159,7 +161,7 @@ class AlphaVantageProvider(MarketDataProvider):
     def _make_request(self, params: dict) -> dict:
         """发送 API 请求"""
         try:
-            response = requests.get(BASE_URL, params=params, timeout=30)
+            response = self._session.get(BASE_URL, params=params, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.Timeout:
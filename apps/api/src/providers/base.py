@@ -3,16 +3,25 @@
 
 本模块定义了市场数据提供者的抽象接口和通用数据结构：
 - Bar: OHLCV K线数据结构
+- ConditionalBars: 条件请求结果（含 ETag / Last-Modified）
 - MarketDataProvider: 数据提供者抽象基类
 - 异常类型: ProviderError, TickerNotFoundError, RateLimitError
+- retry_on_rate_limit: 遇到频率限制时指数退避重试
 
 所有具体的数据提供者（如 YFinance, Polygon）都必须继承 MarketDataProvider。
 """
 
+import logging
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
 
 
 @dataclass
@@ -54,6 +63,26 @@ class Bar:
         }
 
 
+@dataclass
+class ConditionalBars:
+    """
+    条件请求结果
+
+    属性:
+        bars: K 线列表；上游返回 304 Not Modified 时为 None
+        etag: 上游返回的 ETag
+        last_modified: 上游返回的 Last-Modified
+    """
+    bars: Optional[List[Bar]]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        """上游数据是否未变化（304）"""
+        return self.bars is None
+
+
 class ProviderError(Exception):
     """
     数据提供者基础异常
@@ -81,6 +110,38 @@ class RateLimitError(ProviderError):
     pass
 
 
+def retry_on_rate_limit(
+    func: Callable[..., T],
+    max_retries: int = 3,
+    base_delay: float = 1.0,
+) -> Callable[..., T]:
+    """
+    包装函数，遇到 RateLimitError 时指数退避重试
+
+    参数:
+        func: 被包装的函数
+        max_retries: 最大重试次数（不含首次调用）
+        base_delay: 首次重试等待秒数，之后每次翻倍
+
+    返回:
+        包装后的函数，重试耗尽后抛出最后一次的 RateLimitError
+    """
+    def wrapper(*args, **kwargs) -> T:
+        delay = base_delay
+        for attempt in range(max_retries + 1):
+            try:
+                return func(*args, **kwargs)
+            except RateLimitError:
+                if attempt == max_retries:
+                    raise
+                logger.warning(f"请求频率限制，{delay:.1f} 秒后重试 ({attempt + 1}/{max_retries})")
+                time.sleep(delay)
+                delay *= 2
+        raise AssertionError("unreachable")
+
+    return wrapper
+
+
 class MarketDataProvider(ABC):
     """
     市场数据提供者抽象基类
@@ -93,6 +154,9 @@ class MarketDataProvider(ABC):
         bars = provider.get_bars("TSLA", "1m", "1d")
     """
 
+    # 多 ticker 并发请求时的最大并发数（TwelveData 免费版 8 次/分钟）
+    max_concurrency: int = 8
+
     @abstractmethod
     def get_bars(
         self,
@@ -154,3 +218,82 @@ class MarketDataProvider(ABC):
             "1d": "1y",
         }
         return defaults.get(timeframe, "5d")
+
+    def get_bars_conditional(
+        self,
+        ticker: str,
+        timeframe: str,
+        window: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> ConditionalBars:
+        """
+        带 HTTP 校验值的条件获取 K 线数据
+
+        支持 If-None-Match / If-Modified-Since 的提供者应重写此方法；
+        默认实现忽略校验值，直接调用 get_bars 并返回完整数据。
+
+        参数:
+            ticker: 股票代码
+            timeframe: K线周期
+            window: 回溯时间
+            etag: 上次响应的 ETag
+            last_modified: 上次响应的 Last-Modified
+
+        返回:
+            ConditionalBars，not_modified 为 True 时应复用缓存数据
+        """
+        return ConditionalBars(self.get_bars(ticker, timeframe, window))
+
+    def get_bars_extended_many(
+        self,
+        tickers: List[str],
+        timeframe: str,
+        window: Optional[str] = None,
+        max_retries: int = 3,
+    ) -> Dict[str, List[Bar]]:
+        """
+        并发获取多个股票的 Extended Hours K 线数据
+
+        使用线程池并发调用 get_bars_extended，并发数受 max_concurrency 限制，
+        遇到频率限制时指数退避重试。
+
+        参数:
+            tickers: 股票代码列表
+            timeframe: K线周期
+            window: 回溯时间
+            max_retries: 频率限制时的最大重试次数
+
+        返回:
+            Dict[ticker, List[Bar]]，无数据的股票不包含在结果中
+
+        异常:
+            ProviderError: 提供者不支持 Extended Hours 或请求失败
+            RateLimitError: 重试耗尽后仍超过频率限制
+        """
+        fetch = getattr(self, "get_bars_extended", None)
+        if fetch is None:
+            raise ProviderError(f"{self.name} 不支持 Extended Hours 数据")
+
+        symbols = list(dict.fromkeys(t.upper() for t in tickers))
+        if not symbols:
+            return {}
+
+        fetch_with_retry = retry_on_rate_limit(fetch, max_retries=max_retries)
+        result: Dict[str, List[Bar]] = {}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(symbols))) as executor:
+            futures = {
+                symbol: executor.submit(fetch_with_retry, symbol, timeframe, window)
+                for symbol in symbols
+            }
+            for symbol, future in futures.items():
+                try:
+                    bars = future.result()
+                except TickerNotFoundError as e:
+                    logger.warning(f"并发获取跳过 {symbol}: {e}")
+                    continue
+                if bars:
+                    result[symbol] = bars
+
+        return result
@@ -0,0 +1,101 @@
+"""
+交易时段分割（向量化）
+
+将按时间升序排列的 K 线按 (交易日, 时段) 一次性分组，
+供 segment_bars_by_session 和 scripts/test_eh.py 共用。
+
+时段定义 (ET):
+- Premarket: 04:00-09:29
+- Regular: 09:30-15:59
+- Afterhours: 16:00-19:59
+其他时间（如 00:00-04:00、20:00 之后）忽略。
+
+使用示例:
+    minutes = hours * 60 + mins          # 距 00:00 的分钟数
+    day_ids = ordinals                   # 任意按日期递增的整数
+    for day_id, s in segment_sessions(minutes, day_ids).items():
+        pm_high = highs[s.premarket].max()
+"""
+
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+# 时段边界（距 00:00 的分钟数）: 04:00, 09:30, 16:00, 20:00
+SESSION_EDGES = np.array([240, 570, 960, 1200])
+
+# 时段编号
+PREMARKET = 0
+REGULAR = 1
+AFTERHOURS = 2
+OUTSIDE = -1
+
+
+class SessionSlices(NamedTuple):
+    """
+    单个交易日各时段在原数组中的切片
+
+    属性:
+        premarket: 盘前切片
+        regular: 正盘切片
+        afterhours: 盘后切片
+    """
+    premarket: slice
+    regular: slice
+    afterhours: slice
+
+
+_EMPTY_SLICE = slice(0, 0)
+
+
+def session_codes(minutes: np.ndarray) -> np.ndarray:
+    """
+    计算每根 K 线所属时段
+
+    参数:
+        minutes: 距 00:00 的分钟数（ET）
+
+    返回:
+        与 minutes 等长的 int 数组: 0=盘前, 1=正盘, 2=盘后, -1=时段外
+    """
+    codes = np.searchsorted(SESSION_EDGES, minutes, side="right") - 1
+    codes[codes >= len(SESSION_EDGES) - 1] = OUTSIDE
+    return codes
+
+
+def segment_sessions(minutes: np.ndarray, day_ids: np.ndarray) -> Dict[int, SessionSlices]:
+    """
+    按 (交易日, 时段) 分割 K 线
+
+    输入须按时间升序排列，此时同一 (交易日, 时段) 的 K 线在数组中连续，
+    只需一次 O(N) 的边界扫描即可得到各段切片。
+
+    参数:
+        minutes: 距 00:00 的分钟数（ET）
+        day_ids: 交易日编号（按日期递增的整数，如 date.toordinal()）
+
+    返回:
+        Dict[day_id, SessionSlices]，按日期升序；没有任何时段内 K 线的日期也会出现（切片为空）
+    """
+    minutes = np.asarray(minutes)
+    day_ids = np.asarray(day_ids)
+    if len(minutes) == 0:
+        return {}
+
+    codes = session_codes(minutes)
+    keys = day_ids.astype(np.int64) * 4 + (codes + 1)
+
+    # 每段的起点：首元素 + key 变化处
+    starts = np.flatnonzero(np.diff(keys)) + 1
+    starts = np.concatenate(([0], starts))
+    ends = np.append(starts[1:], len(keys))
+
+    result: Dict[int, list] = {}
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        day = int(day_ids[start])
+        slots = result.setdefault(day, [_EMPTY_SLICE, _EMPTY_SLICE, _EMPTY_SLICE])
+        code = int(codes[start])
+        if code != OUTSIDE:
+            slots[code] = slice(start, end)
+
+    return {day: SessionSlices(*slots) for day, slots in result.items()}
@@ -26,16 +26,26 @@ Grow/Pro 计划:
     provider = TwelveDataProvider(api_key="your_api_key")
     bars = provider.get_bars("TSLA", "1m", "5d")
     bars_eh = provider.get_bars_extended("TSLA", "1m", "2d")  # 含盘前盘后
+    bars_by_ticker = provider.get_bars_extended_batch(["TSLA", "QQQ"], "1m", "2d")
 """
 
 import logging
-from datetime import datetime, timedelta, time as dt_time
+from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict, Tuple
 from dataclasses import dataclass
 
+import numpy as np
 import requests
 
-from .base import Bar, MarketDataProvider, ProviderError, TickerNotFoundError, RateLimitError
+from .base import (
+    Bar,
+    ConditionalBars,
+    MarketDataProvider,
+    ProviderError,
+    TickerNotFoundError,
+    RateLimitError,
+)
+from .segment import segment_sessions
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +61,9 @@ class TwelveDataProvider(MarketDataProvider):
     支持实时美股、外汇、加密货币数据，包含可靠的成交量。
     """
 
+    # 批量请求每次最多包含的 symbol 数
+    BATCH_SIZE = 10
+
     def __init__(self, api_key: str):
         """
         初始化 Twelve Data 提供者
@@ -64,6 +77,8 @@ class TwelveDataProvider(MarketDataProvider):
                 "免费注册：https://twelvedata.com/"
             )
         self._api_key = api_key
+        # 复用 HTTP 连接（keep-alive），避免每次请求重新握手 TCP/TLS
+        self._session = requests.Session()
 
     @property
     def name(self) -> str:
@@ -87,6 +102,37 @@ class TwelveDataProvider(MarketDataProvider):
         返回:
             Bar 对象列表，按时间升序排列
 
+        异常:
+            ProviderError: 不支持的时间周期或 API 错误
+            TickerNotFoundError: 股票代码无效或无数据
+            RateLimitError: 超过请求限制
+        """
+        return self.get_bars_conditional(ticker, timeframe, window).bars
+
+    def get_bars_conditional(
+        self,
+        ticker: str,
+        timeframe: str,
+        window: Optional[str] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> ConditionalBars:
+        """
+        条件获取 K 线数据
+
+        携带 If-None-Match / If-Modified-Since 请求头，上游返回 304 时
+        不下载也不解析数据，由调用方续期缓存。
+
+        参数:
+            ticker: 股票代码
+            timeframe: K线周期（"1m", "5m", "1d"）
+            window: 回溯时间
+            etag: 上次响应的 ETag
+            last_modified: 上次响应的 Last-Modified
+
+        返回:
+            ConditionalBars（304 时 bars 为 None）
+
         异常:
             ProviderError: 不支持的时间周期或 API 错误
             TickerNotFoundError: 股票代码无效或无数据
@@ -122,71 +168,116 @@ class TwelveDataProvider(MarketDataProvider):
             "apikey": self._api_key,
             "timezone": "UTC",
         }
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
 
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self._session.get(url, params=params, headers=headers, timeout=30)
+
+            # 数据未变化：只返回校验值
+            if response.status_code == 304:
+                logger.info(f"数据未变化 (304): {ticker}")
+                return ConditionalBars(
+                    bars=None,
+                    etag=response.headers.get("ETag", etag),
+                    last_modified=response.headers.get("Last-Modified", last_modified),
+                )
+
             data = response.json()
 
             # 检查 API 错误
-            if data.get("status") == "error":
-                error_code = data.get("code", 0)
-                error_msg = data.get("message", "Unknown error")
-
-                if error_code == 401:
-                    raise ProviderError("Twelve Data API 认证失败，请检查 API Key")
-                elif error_code == 429:
-                    raise RateLimitError(f"Twelve Data API 请求频率限制: {error_msg}")
-                elif error_code == 400 or "not found" in error_msg.lower():
-                    raise TickerNotFoundError(f"股票代码不存在: {ticker}")
-                else:
-                    raise ProviderError(f"Twelve Data API 错误: {error_msg}")
+            self._raise_for_error(data, ticker)
 
             # 解析响应
             values = data.get("values", [])
             if not values:
                 raise TickerNotFoundError(f"股票代码无数据: {ticker}")
 
-            # 解析 K 线数据
-            bars = []
-            for item in values:
-                # Twelve Data 返回格式: {"datetime": "2024-01-15 14:30:00", "open": "100.0", ...}
-                try:
-                    # 解析时间戳（可能有多种格式）
-                    datetime_str = item["datetime"]
-                    if len(datetime_str) == 10:  # 日线格式 "2024-01-15"
-                        ts = datetime.strptime(datetime_str, "%Y-%m-%d")
-                    else:  # 分钟线格式 "2024-01-15 14:30:00"
-                        ts = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
-
-                    # 成交量可能为空（某些资产类型）
-                    volume = float(item.get("volume", 0) or 0)
-
-                    bars.append(Bar(
-                        t=ts,
-                        o=float(item["open"]),
-                        h=float(item["high"]),
-                        l=float(item["low"]),
-                        c=float(item["close"]),
-                        v=volume,
-                    ))
-                except (KeyError, ValueError) as e:
-                    logger.warning(f"跳过无效数据: {item}, 错误: {e}")
-                    continue
+            # 解析 K 线数据（Twelve Data 返回倒序，_parse_values 会反转为升序）
+            bars = self._parse_values(values)
 
             if not bars:
                 raise TickerNotFoundError(f"股票代码无有效数据: {ticker}")
 
-            # Twelve Data 返回倒序（最新在前），需要反转
-            bars.reverse()
-
             logger.info(f"成功获取 {len(bars)} 根 K 线: {ticker}")
-            return bars
+            return ConditionalBars(
+                bars=bars,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
 
         except requests.exceptions.Timeout:
             raise ProviderError("Twelve Data API 请求超时")
         except requests.exceptions.RequestException as e:
             raise ProviderError(f"Twelve Data API 请求失败: {e}")
 
+    def _raise_for_error(self, data: dict, ticker: str) -> None:
+        """
+        检查 Twelve Data 响应中的错误并抛出对应异常
+
+        参数:
+            data: API 返回的 JSON（单个 symbol 的部分）
+            ticker: 股票代码（用于错误信息）
+        """
+        if data.get("status") != "error":
+            return
+
+        error_code = data.get("code", 0)
+        error_msg = data.get("message", "Unknown error")
+
+        if error_code == 401:
+            raise ProviderError("Twelve Data API 认证失败，请检查 API Key")
+        elif error_code == 429:
+            raise RateLimitError(f"Twelve Data API 请求频率限制: {error_msg}")
+        elif error_code == 400 or "not found" in error_msg.lower():
+            raise TickerNotFoundError(f"股票代码不存在: {ticker}")
+        else:
+            raise ProviderError(f"Twelve Data API 错误: {error_msg}")
+
+    def _parse_values(self, values: List[dict]) -> List[Bar]:
+        """
+        将 Twelve Data 的 values 数组解析为 Bar 列表
+
+        Twelve Data 返回格式: {"datetime": "2024-01-15 14:30:00", "open": "100.0", ...}，
+        且为倒序（最新在前），这里反转为时间升序。
+
+        参数:
+            values: API 返回的 values 数组
+
+        返回:
+            按时间升序排列的 Bar 列表（跳过无效数据）
+        """
+        bars = []
+        for item in values:
+            try:
+                # 解析时间戳（可能有多种格式）
+                datetime_str = item["datetime"]
+                if len(datetime_str) == 10:  # 日线格式 "2024-01-15"
+                    ts = datetime.strptime(datetime_str, "%Y-%m-%d")
+                else:  # 分钟线格式 "2024-01-15 14:30:00"
+                    ts = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
+
+                # 成交量可能为空（某些资产类型）
+                volume = float(item.get("volume", 0) or 0)
+
+                bars.append(Bar(
+                    t=ts,
+                    o=float(item["open"]),
+                    h=float(item["high"]),
+                    l=float(item["low"]),
+                    c=float(item["close"]),
+                    v=volume,
+                ))
+            except (KeyError, ValueError) as e:
+                logger.warning(f"跳过无效数据: {item}, 错误: {e}")
+                continue
+
+        bars.reverse()
+        return bars
+
     def _calculate_outputsize(self, window: str, timeframe: str) -> int:
         """
         根据 window 和 timeframe 计算需要获取的 K 线数量
@@ -307,58 +398,23 @@ class TwelveDataProvider(MarketDataProvider):
         }
 
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self._session.get(url, params=params, timeout=30)
             data = response.json()
 
             # 检查 API 错误
-            if data.get("status") == "error":
-                error_code = data.get("code", 0)
-                error_msg = data.get("message", "Unknown error")
-
-                if error_code == 401:
-                    raise ProviderError("Twelve Data API 认证失败，请检查 API Key")
-                elif error_code == 429:
-                    raise RateLimitError(f"Twelve Data API 请求频率限制: {error_msg}")
-                elif error_code == 400 or "not found" in error_msg.lower():
-                    raise TickerNotFoundError(f"股票代码不存在: {ticker}")
-                else:
-                    raise ProviderError(f"Twelve Data API 错误: {error_msg}")
+            self._raise_for_error(data, ticker)
 
             # 解析响应
             values = data.get("values", [])
             if not values:
                 raise TickerNotFoundError(f"股票代码无数据: {ticker}")
 
-            # 解析 K 线数据
-            bars = []
-            for item in values:
-                try:
-                    datetime_str = item["datetime"]
-                    if len(datetime_str) == 10:
-                        ts = datetime.strptime(datetime_str, "%Y-%m-%d")
-                    else:
-                        ts = datetime.strptime(datetime_str, "%Y-%m-%d %H:%M:%S")
-
-                    volume = float(item.get("volume", 0) or 0)
-
-                    bars.append(Bar(
-                        t=ts,
-                        o=float(item["open"]),
-                        h=float(item["high"]),
-                        l=float(item["low"]),
-                        c=float(item["close"]),
-                        v=volume,
-                    ))
-                except (KeyError, ValueError) as e:
-                    logger.warning(f"跳过无效数据: {item}, 错误: {e}")
-                    continue
+            # 解析 K 线数据（反转为时间升序）
+            bars = self._parse_values(values)
 
             if not bars:
                 raise TickerNotFoundError(f"股票代码无有效数据: {ticker}")
 
-            # 反转为时间升序
-            bars.reverse()
-
             logger.info(f"成功获取 {len(bars)} 根 Extended Hours K 线: {ticker}")
             return bars
 
@@ -367,6 +423,90 @@ class TwelveDataProvider(MarketDataProvider):
         except requests.exceptions.RequestException as e:
             raise ProviderError(f"Twelve Data API 请求失败: {e}")
 
+    def get_bars_extended_batch(
+        self,
+        tickers: List[str],
+        timeframe: str,
+        window: Optional[str] = None,
+    ) -> Dict[str, List[Bar]]:
+        """
+        批量获取多个股票的 Extended Hours K 线数据
+
+        Twelve Data 的 time_series 接口支持逗号分隔的多个 symbol，
+        每批最多 BATCH_SIZE 个，N 个股票只需 ceil(N / BATCH_SIZE) 次请求。
+
+        参数:
+            tickers: 股票代码列表
+            timeframe: K线周期（"1m", "5m", "15m", "30m"）
+            window: 回溯时间（如 "2d", "5d"）
+
+        返回:
+            Dict[ticker, List[Bar]]，无数据或出错的股票不包含在结果中
+
+        异常:
+            ProviderError: 不支持的时间周期、认证失败或请求失败
+            RateLimitError: 超过请求限制
+        """
+        timeframe_map = {
+            "1m": "1min",
+            "5m": "5min",
+            "15m": "15min",
+            "30m": "30min",
+        }
+        td_interval = timeframe_map.get(timeframe)
+        if not td_interval:
+            raise ProviderError(f"Extended Hours 不支持的时间周期: {timeframe}（仅支持 1m/5m/15m/30m）")
+
+        symbols = list(dict.fromkeys(t.upper() for t in tickers))
+        outputsize = self._calculate_outputsize_extended(window or "2d", timeframe)
+
+        result: Dict[str, List[Bar]] = {}
+        for start in range(0, len(symbols), self.BATCH_SIZE):
+            batch = symbols[start:start + self.BATCH_SIZE]
+            logger.info(f"正在批量获取 Extended Hours K 线数据: {','.join(batch)}, 周期={timeframe}")
+
+            params = {
+                "symbol": ",".join(batch),
+                "interval": td_interval,
+                "outputsize": outputsize,
+                "apikey": self._api_key,
+                "timezone": "America/New_York",
+                "prepost": "true",
+            }
+
+            try:
+                response = self._session.get(f"{BASE_URL}/time_series", params=params, timeout=30)
+                data = response.json()
+            except requests.exceptions.Timeout:
+                raise ProviderError("Twelve Data API 请求超时")
+            except requests.exceptions.RequestException as e:
+                raise ProviderError(f"Twelve Data API 请求失败: {e}")
+
+            # 多个 symbol 时顶层错误影响整批（认证失败、频率限制）；
+            # 单个 symbol 时响应不分组，错误交给下面逐个处理，无效代码只跳过该股票
+            if len(batch) > 1 and data.get("status") == "error":
+                self._raise_for_error(data, ",".join(batch))
+
+            # 单个 symbol 时响应不按 symbol 分组
+            per_symbol = {batch[0]: data} if len(batch) == 1 else data
+
+            for symbol in batch:
+                symbol_data = per_symbol.get(symbol) or {}
+                try:
+                    self._raise_for_error(symbol_data, symbol)
+                except TickerNotFoundError as e:
+                    logger.warning(f"批量获取跳过 {symbol}: {e}")
+                    continue
+
+                bars = self._parse_values(symbol_data.get("values", []))
+                if bars:
+                    result[symbol] = bars
+                else:
+                    logger.warning(f"批量获取跳过 {symbol}: 无有效数据")
+
+        logger.info(f"批量获取完成: {len(result)}/{len(symbols)} 个股票有 Extended Hours 数据")
+        return result
+
     def _calculate_outputsize_extended(self, window: str, timeframe: str) -> int:
         """
         计算 Extended Hours 数据需要的 outputsize
@@ -420,6 +560,8 @@ def segment_bars_by_session(bars: List[Bar]) -> Dict[str, SessionBars]:
     将 K 线数据按交易日和时段分割
 
     假设 bars 的时间戳是 ET (America/New_York) 时区。
+    逐根 K 线只取一次分钟数和日期，分类与分组由 segment.segment_sessions
+    在数组上完成，每个时段是原列表的连续切片。
 
     时段定义:
     - Premarket: 04:00-09:29 ET
@@ -432,42 +574,32 @@ def segment_bars_by_session(bars: List[Bar]) -> Dict[str, SessionBars]:
     返回:
         Dict[date_str, SessionBars]: 按日期分组的各时段数据
     """
-    # 时段边界 (ET)
-    PREMARKET_START = dt_time(4, 0)
-    REGULAR_START = dt_time(9, 30)
-    AFTERHOURS_START = dt_time(16, 0)
-    AFTERHOURS_END = dt_time(20, 0)
-
-    # 按日期分组
-    by_date: Dict[str, Dict[str, List[Bar]]] = {}
-
+    if not bars:
+        return {}
+
+    # 一次遍历同时取出分钟数、交易日编号并检查是否有序
+    minutes = []
+    day_ids = []
+    previous = bars[0].t
+    ordered = True
     for bar in bars:
-        bar_time = bar.t.time()
-        bar_date = bar.t.date().isoformat()
-
-        if bar_date not in by_date:
-            by_date[bar_date] = {
-                "premarket": [],
-                "regular": [],
-                "afterhours": [],
-            }
+        t = bar.t
+        if t < previous:
+            ordered = False
+        previous = t
+        minutes.append(t.hour * 60 + t.minute)
+        day_ids.append(t.toordinal())
 
-        # 分类到对应时段
-        if PREMARKET_START <= bar_time < REGULAR_START:
-            by_date[bar_date]["premarket"].append(bar)
-        elif REGULAR_START <= bar_time < AFTERHOURS_START:
-            by_date[bar_date]["regular"].append(bar)
-        elif AFTERHOURS_START <= bar_time < AFTERHOURS_END:
-            by_date[bar_date]["afterhours"].append(bar)
-        # 其他时间忽略（如凌晨 00:00-04:00）
+    # 乱序输入先按时间排序，保证同一时段连续
+    if not ordered:
+        return segment_bars_by_session(sorted(bars, key=lambda bar: bar.t))
 
-    # 转换为 SessionBars
     result: Dict[str, SessionBars] = {}
-    for date_str, sessions in by_date.items():
-        result[date_str] = SessionBars(
-            regular=sessions["regular"],
-            premarket=sessions["premarket"],
-            afterhours=sessions["afterhours"],
+    for day_id, slices in segment_sessions(np.array(minutes), np.array(day_ids)).items():
+        result[date.fromordinal(day_id).isoformat()] = SessionBars(
+            regular=bars[slices.regular],
+            premarket=bars[slices.premarket],
+            afterhours=bars[slices.afterhours],
         )
 
     return result
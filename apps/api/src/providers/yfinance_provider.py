@@ -22,11 +22,15 @@ Yahoo Finance 数据提供者
 
     # 获取含盘前盘后的数据
     bars_eh = provider.get_bars_extended("TSLA", "1m", "2d")
+
+    # 批量获取多个股票（一次请求）
+    bars_by_ticker = provider.get_bars_extended_batch(["TSLA", "QQQ"], "1m", "2d")
 """
 
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+import pandas as pd
 import yfinance as yf
 
 from .base import Bar, MarketDataProvider, ProviderError, TickerNotFoundError, RateLimitError
@@ -43,6 +47,9 @@ class YFinanceProvider(MarketDataProvider):
     支持多种时间周期和回溯范围。
     """
 
+    # 批量下载每次最多包含的 symbol 数
+    BATCH_SIZE = 10
+
     @property
     def name(self) -> str:
         """返回提供者名称"""
@@ -95,21 +102,7 @@ class YFinanceProvider(MarketDataProvider):
                 raise TickerNotFoundError(f"股票代码无数据: {ticker}")
 
             # 将 DataFrame 转换为 Bar 对象列表
-            bars: List[Bar] = []
-            for idx, row in df.iterrows():
-                # 处理时区 - 转换为无时区的 UTC 时间
-                ts = idx.to_pydatetime()
-                if ts.tzinfo is not None:
-                    ts = ts.replace(tzinfo=None)
-
-                bars.append(Bar(
-                    t=ts,
-                    o=float(row["Open"]),
-                    h=float(row["High"]),
-                    l=float(row["Low"]),
-                    c=float(row["Close"]),
-                    v=float(row["Volume"]),
-                ))
+            bars = self._df_to_bars(df)
 
             logger.info(f"成功获取 {len(bars)} 根 K 线: {ticker}")
             return bars
@@ -180,20 +173,7 @@ class YFinanceProvider(MarketDataProvider):
                 raise TickerNotFoundError(f"股票代码无 Extended Hours 数据: {ticker}")
 
             # 转换为 Bar 对象
-            bars: List[Bar] = []
-            for idx, row in df.iterrows():
-                ts = idx.to_pydatetime()
-                if ts.tzinfo is not None:
-                    ts = ts.replace(tzinfo=None)
-
-                bars.append(Bar(
-                    t=ts,
-                    o=float(row["Open"]),
-                    h=float(row["High"]),
-                    l=float(row["Low"]),
-                    c=float(row["Close"]),
-                    v=float(row["Volume"]),
-                ))
+            bars = self._df_to_bars(df)
 
             # 统计 EH 数据
             eh_count = self._count_extended_hours_bars(bars)
@@ -216,6 +196,116 @@ class YFinanceProvider(MarketDataProvider):
                 logger.error(f"获取 {ticker} Extended Hours 数据失败: {e}")
                 raise ProviderError(f"Extended Hours 数据获取失败: {e}")
 
+    def get_bars_extended_batch(
+        self,
+        tickers: List[str],
+        timeframe: str,
+        window: Optional[str] = None,
+    ) -> Dict[str, List[Bar]]:
+        """
+        批量获取多个股票的 Extended Hours K 线数据
+
+        使用 yf.download 一次请求多个 symbol（group_by='ticker'），
+        每批最多 BATCH_SIZE 个，再按 ticker 拆分为各自的 Bar 列表。
+
+        参数:
+            tickers: 股票代码列表
+            timeframe: K线周期（"1m", "5m"）
+            window: 回溯时间（如 "2d", "5d"）
+
+        返回:
+            Dict[ticker, List[Bar]]，无数据的股票不包含在结果中
+
+        异常:
+            ProviderError: 不支持的时间周期或下载失败
+            RateLimitError: 超过请求限制
+        """
+        interval_map = {
+            "1m": "1m",
+            "5m": "5m",
+        }
+        interval = interval_map.get(timeframe)
+        if not interval:
+            raise ProviderError(f"Extended Hours 不支持的时间周期: {timeframe}，仅支持 1m/5m")
+
+        period = window or "2d"
+        symbols = list(dict.fromkeys(t.upper() for t in tickers))
+
+        result: Dict[str, List[Bar]] = {}
+        for start in range(0, len(symbols), self.BATCH_SIZE):
+            batch = symbols[start:start + self.BATCH_SIZE]
+            logger.info(f"正在批量获取 Extended Hours 数据: {' '.join(batch)}, 周期={timeframe}, 范围={period}")
+
+            try:
+                df = yf.download(
+                    " ".join(batch),
+                    period=period,
+                    interval=interval,
+                    prepost=True,
+                    threads=True,
+                    group_by="ticker",
+                    progress=False,
+                )
+            except Exception as e:
+                error_msg = str(e).lower()
+                if "rate limit" in error_msg or "too many requests" in error_msg:
+                    raise RateLimitError(f"Yahoo Finance 请求频率限制: {e}")
+                logger.error(f"批量获取 Extended Hours 数据失败: {e}")
+                raise ProviderError(f"Extended Hours 批量数据获取失败: {e}")
+
+            if df.empty:
+                continue
+
+            for symbol in batch:
+                if isinstance(df.columns, pd.MultiIndex):
+                    if symbol not in df.columns.get_level_values(0):
+                        continue
+                    frame = df[symbol]
+                else:
+                    frame = df
+
+                # 多 symbol 合并后各自的缺失行为全 NaN
+                frame = frame.dropna(how="all")
+                if frame.empty:
+                    continue
+
+                # 与 history() 保持一致：使用交易所时区 (ET) 的本地时间
+                if frame.index.tz is not None:
+                    frame = frame.tz_convert("America/New_York")
+
+                result[symbol] = self._df_to_bars(frame)
+
+        logger.info(f"批量获取完成: {len(result)}/{len(symbols)} 个股票有 Extended Hours 数据")
+        return result
+
+    def _df_to_bars(self, df: pd.DataFrame) -> List[Bar]:
+        """
+        将 yfinance DataFrame 转换为 Bar 列表
+
+        时间戳去掉时区信息，保留交易所本地时间。
+
+        参数:
+            df: 包含 Open/High/Low/Close/Volume 列的 DataFrame
+
+        返回:
+            Bar 对象列表
+        """
+        bars: List[Bar] = []
+        for idx, row in df.iterrows():
+            ts = idx.to_pydatetime()
+            if ts.tzinfo is not None:
+                ts = ts.replace(tzinfo=None)
+
+            bars.append(Bar(
+                t=ts,
+                o=float(row["Open"]),
+                h=float(row["High"]),
+                l=float(row["Low"]),
+                c=float(row["Close"]),
+                v=float(row["Volume"]),
+            ))
+        return bars
+
     def _count_extended_hours_bars(self, bars: List[Bar]) -> dict:
         """
         统计 Extended Hours K 线数量
@@ -17,9 +17,10 @@ import json
 import logging
 import hashlib
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, List, Literal, Tuple
+from typing import Optional, Dict, Any, AsyncIterator, List, Literal, Tuple
 from dataclasses import dataclass, field
 import httpx
+import orjson
 import pytz
 
 logger = logging.getLogger(__name__)
@@ -590,6 +591,22 @@ class EventTriggerDetector:
         return hashlib.md5(zone_str.encode()).hexdigest()[:8]
 
 
+# ============ JSON 编码 ============
+
+def _prompt_json(obj: Any) -> str:
+    """
+    将数据编码为嵌入 prompt 的 JSON 文本
+
+    格式与 json.dumps(indent=2, ensure_ascii=False) 相同，使用 orjson 编码。
+    """
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _request_body(payload: Dict[str, Any]) -> bytes:
+    """将 LLM 请求体编码为 JSON 字节（通过 content= 发送，跳过 httpx 的 json.dumps）"""
+    return orjson.dumps(payload)
+
+
 # ============ Cooldown Manager ============
 
 class CooldownManager:
@@ -694,11 +711,16 @@ class LLMService:
         model: str = "",
         model_full: str = "",
         base_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
     ):
         self.provider = provider
         self.api_key = api_key
         self.base_url = base_url
 
+        # 共享的 HTTP 客户端（连接池复用 TCP/TLS 连接）；未传入时首次调用时创建
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+
         # 模型配置
         if provider == "openai":
             self.model_quick = model or "gpt-4o-mini"  # 短评/确认
@@ -711,6 +733,21 @@ class LLMService:
         self.trigger_detector = EventTriggerDetector()
         self.cooldown_manager = CooldownManager()
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """获取共享的 HTTP 客户端（懒创建）"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=90.0,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            )
+        return self._http_client
+
+    async def aclose(self) -> None:
+        """关闭自行创建的 HTTP 客户端（传入的客户端由调用方负责关闭）"""
+        if self._owns_http_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
     async def generate_analysis(
         self,
         analysis_json: Dict[str, Any],
@@ -744,6 +781,110 @@ class LLMService:
                 report_type=report_type
             )
 
+        user_prompt, model = self._build_prompt(
+            analysis_json, timeframe, report_type, lang, pending_events
+        )
+
+        try:
+            logger.info(f"LLM: Using {model} for {report_type} ({timeframe})")
+
+            if self.provider == "openai":
+                response = await self._call_openai(user_prompt, model)
+            else:
+                response = await self._call_gemini(user_prompt, model)
+
+            # 解析响应
+            result = self._parse_response(response, analysis_json, report_type)
+            result.triggered_by = triggered_by.event_type if triggered_by else None
+            return result
+
+        except Exception as e:
+            logger.error(f"LLM generation error: {e}")
+            return NarrativeResult(
+                summary=f"Generation failed: {str(e)}",
+                action="WAIT",
+                content="",
+                error=str(e),
+                quality="limited",
+                report_type=report_type
+            )
+
+    async def stream_analysis(
+        self,
+        analysis_json: Dict[str, Any],
+        timeframe: str = "5m",
+        report_type: Literal["full", "quick", "confirmation", "context", "aggregated"] = "full",
+        lang: Literal["zh", "en"] = "zh",
+        pending_events: Optional[List[Dict]] = None,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        流式生成市场分析叙事
+
+        与 generate_analysis 使用相同的 prompt 和模型，但边生成边返回，
+        首个 token 即可展示给用户，而不必等待完整输出。
+
+        Args:
+            同 generate_analysis
+
+        Yields:
+            ("token", str): 增量文本
+            ("done", NarrativeResult): 结束时的完整解析结果（出错时 error 非空）
+        """
+        if not self.api_key:
+            yield "done", NarrativeResult(
+                summary="LLM API key not configured",
+                action="WAIT",
+                content="",
+                error="NO_API_KEY",
+                quality="limited",
+                report_type=report_type
+            )
+            return
+
+        user_prompt, model = self._build_prompt(
+            analysis_json, timeframe, report_type, lang, pending_events
+        )
+
+        chunks: List[str] = []
+        try:
+            logger.info(f"LLM: Streaming {model} for {report_type} ({timeframe})")
+
+            if self.provider == "openai":
+                stream = self._stream_openai(user_prompt, model)
+            else:
+                stream = self._stream_gemini(user_prompt, model)
+
+            async for text in stream:
+                chunks.append(text)
+                yield "token", text
+
+            yield "done", self._parse_response("".join(chunks), analysis_json, report_type)
+
+        except Exception as e:
+            logger.error(f"LLM streaming error: {e}")
+            yield "done", NarrativeResult(
+                summary=f"Generation failed: {str(e)}",
+                action="WAIT",
+                content="".join(chunks),
+                error=str(e),
+                quality="limited",
+                report_type=report_type
+            )
+
+    def _build_prompt(
+        self,
+        analysis_json: Dict[str, Any],
+        timeframe: str,
+        report_type: str,
+        lang: str,
+        pending_events: Optional[List[Dict]] = None,
+    ) -> Tuple[str, str]:
+        """
+        选择模板和模型并构建 user prompt
+
+        Returns:
+            (user_prompt, model)
+        """
         # 选择 prompt 和模型
         lang_name = "Chinese" if lang == "zh" else "English"
 
@@ -773,7 +914,7 @@ class LLMService:
             # 根据 emphasis 选择不同的 EH instruction
             emphasis = eh_decision.get("emphasis", "")
             eh_section = EH_SECTION_FULL.format(
-                eh_json=json.dumps(eh_data, indent=2, ensure_ascii=False)
+                eh_json=_prompt_json(eh_data)
             )
             if emphasis in ["premarket_regime_and_gap", "gap_fill_vs_continuation"]:
                 eh_instruction = EH_INSTRUCTION_PREMARKET
@@ -789,97 +930,144 @@ class LLMService:
         if report_type == "aggregated" and pending_events:
             user_prompt = prompt_template.format(
                 lang_name=lang_name,
-                events_json=json.dumps(pending_events, indent=2, ensure_ascii=False),
-                analysis_json=json.dumps(analysis_for_llm, indent=2, ensure_ascii=False)
+                events_json=_prompt_json(pending_events),
+                analysis_json=_prompt_json(analysis_for_llm)
             )
         elif report_type == "quick":
             user_prompt = prompt_template.format(
                 lang_name=lang_name,
-                analysis_json=json.dumps(analysis_for_llm, indent=2, ensure_ascii=False),
+                analysis_json=_prompt_json(analysis_for_llm),
                 eh_section=eh_section,
                 eh_instruction=eh_instruction
             )
         else:
             user_prompt = prompt_template.format(
                 lang_name=lang_name,
-                analysis_json=json.dumps(analysis_for_llm, indent=2, ensure_ascii=False)
+                analysis_json=_prompt_json(analysis_for_llm)
             )
 
-        try:
-            logger.info(f"LLM: Using {model} for {report_type} ({timeframe})")
-
-            if self.provider == "openai":
-                response = await self._call_openai(user_prompt, model)
-            else:
-                response = await self._call_gemini(user_prompt, model)
-
-            # 解析响应
-            result = self._parse_response(response, analysis_json, report_type)
-            result.triggered_by = triggered_by.event_type if triggered_by else None
-            return result
-
-        except Exception as e:
-            logger.error(f"LLM generation error: {e}")
-            return NarrativeResult(
-                summary=f"Generation failed: {str(e)}",
-                action="WAIT",
-                content="",
-                error=str(e),
-                quality="limited",
-                report_type=report_type
-            )
+        return user_prompt, model
 
     async def _call_openai(self, user_prompt: str, model: str) -> str:
         """调用 OpenAI API"""
         url = self.base_url or "https://api.openai.com/v1/chat/completions"
 
-        async with httpx.AsyncClient(timeout=90.0) as client:
-            response = await client.post(
-                url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": model,
-                    "messages": [
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    "temperature": 0.3,
-                    "max_tokens": 2000
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data["choices"][0]["message"]["content"]
+        client = self._get_http_client()
+        response = await client.post(
+            url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            content=_request_body({
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                "temperature": 0.3,
+                "max_tokens": 2000
+            })
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data["choices"][0]["message"]["content"]
 
     async def _call_gemini(self, user_prompt: str, model: str) -> str:
         """调用 Google Gemini API"""
         url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
 
-        async with httpx.AsyncClient(timeout=90.0) as client:
-            response = await client.post(
-                url,
-                headers={"Content-Type": "application/json"},
-                params={"key": self.api_key},
-                json={
-                    "contents": [
-                        {
-                            "parts": [
-                                {"text": SYSTEM_PROMPT + "\n\n" + user_prompt}
-                            ]
-                        }
-                    ],
-                    "generationConfig": {
-                        "temperature": 0.3,
-                        "maxOutputTokens": 2000
+        client = self._get_http_client()
+        response = await client.post(
+            url,
+            headers={"Content-Type": "application/json"},
+            params={"key": self.api_key},
+            content=_request_body({
+                "contents": [
+                    {
+                        "parts": [
+                            {"text": SYSTEM_PROMPT + "\n\n" + user_prompt}
+                        ]
                     }
+                ],
+                "generationConfig": {
+                    "temperature": 0.3,
+                    "maxOutputTokens": 2000
                 }
-            )
+            })
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data["candidates"][0]["content"]["parts"][0]["text"]
+
+    async def _stream_openai(self, user_prompt: str, model: str) -> AsyncIterator[str]:
+        """调用 OpenAI API（stream=True），逐段返回增量文本"""
+        url = self.base_url or "https://api.openai.com/v1/chat/completions"
+
+        client = self._get_http_client()
+        async with client.stream(
+            "POST",
+            url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            content=_request_body({
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                "temperature": 0.3,
+                "max_tokens": 2000,
+                "stream": True
+            })
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                choices = orjson.loads(payload).get("choices") or []
+                text = choices[0].get("delta", {}).get("content") if choices else None
+                if text:
+                    yield text
+
+    async def _stream_gemini(self, user_prompt: str, model: str) -> AsyncIterator[str]:
+        """调用 Google Gemini API（streamGenerateContent, SSE），逐段返回增量文本"""
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent"
+
+        client = self._get_http_client()
+        async with client.stream(
+            "POST",
+            url,
+            headers={"Content-Type": "application/json"},
+            params={"key": self.api_key, "alt": "sse"},
+            content=_request_body({
+                "contents": [
+                    {
+                        "parts": [
+                            {"text": SYSTEM_PROMPT + "\n\n" + user_prompt}
+                        ]
+                    }
+                ],
+                "generationConfig": {
+                    "temperature": 0.3,
+                    "maxOutputTokens": 2000
+                }
+            })
+        ) as response:
             response.raise_for_status()
-            data = response.json()
-            return data["candidates"][0]["content"]["parts"][0]["text"]
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = orjson.loads(line[len("data:"):])
+                for candidate in data.get("candidates", []):
+                    for part in candidate.get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
 
     def _parse_response(
         self,
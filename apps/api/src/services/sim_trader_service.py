@@ -11,71 +11,28 @@ Sim Trader API 服务
 
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+import importlib
 import pytz
-import sys
-import os
 
+from ..analysis import CORE_PACKAGE, load_core_package
 
-def _import_sim_trader():
-    """导入 sim_trader 模块，支持 Docker 和本地环境"""
-    # Docker 环境: /app/packages/core
-    docker_core_path = '/app/packages/core'
-    # 本地环境: packages/core
-    local_core_path = os.path.abspath(os.path.join(
-        os.path.dirname(__file__), '..', '..', '..', '..', 'packages', 'core'
-    ))
-
-    # 检测运行环境
-    if os.path.exists(docker_core_path):
-        core_path = docker_core_path
-    else:
-        core_path = local_core_path
-
-    # 将 core 路径添加到 sys.path
-    if core_path not in sys.path:
-        sys.path.insert(0, core_path)
-
-    # 保存并临时移除 API 的 src 模块
-    api_src = sys.modules.get('src')
-    api_src_submodules = {k: v for k, v in sys.modules.items() if k.startswith('src.')}
-
-    for k in list(api_src_submodules.keys()):
-        del sys.modules[k]
-    if api_src:
-        del sys.modules['src']
-
-    try:
-        from src.sim_trader import (
-            create_sim_trader,
-            SimTradeStateMachine,
-            SimTraderConfig,
-            AnalysisSnapshot,
-            PriceData,
-            LevelsData,
-            SignalsData,
-            TradePlanRow,
-            TradeStatus,
-            TradeDirection,
-            RiskLevel,
-        )
-    finally:
-        # 恢复 API 的 src 模块
-        if api_src:
-            sys.modules['src'] = api_src
-        sys.modules.update(api_src_submodules)
 
+def _import_sim_trader():
+    """导入 sim_trader 模块（随 core 包以 klinelens_core.sim_trader 加载）"""
+    load_core_package()
+    sim_trader = importlib.import_module(f"{CORE_PACKAGE}.sim_trader")
     return (
-        create_sim_trader,
-        SimTradeStateMachine,
-        SimTraderConfig,
-        AnalysisSnapshot,
-        PriceData,
-        LevelsData,
-        SignalsData,
-        TradePlanRow,
-        TradeStatus,
-        TradeDirection,
-        RiskLevel,
+        sim_trader.create_sim_trader,
+        sim_trader.SimTradeStateMachine,
+        sim_trader.SimTraderConfig,
+        sim_trader.AnalysisSnapshot,
+        sim_trader.PriceData,
+        sim_trader.LevelsData,
+        sim_trader.SignalsData,
+        sim_trader.TradePlanRow,
+        sim_trader.TradeStatus,
+        sim_trader.TradeDirection,
+        sim_trader.RiskLevel,
     )
 
 
@@ -8,6 +8,7 @@ TwelveData WebSocket 实时数据管理器
 - 心跳保活
 - 多 symbol 订阅
 - 价格缓存（最新价格）
+- 按 symbol 推送价格更新（asyncio.Queue 监听者）
 
 使用示例:
     manager = TwelveDataWebSocket(api_key="your_key")
@@ -16,13 +17,22 @@ TwelveData WebSocket 实时数据管理器
 
     # 获取最新价格
     price = manager.get_latest_price("QQQ")
+
+    # 等待价格更新
+    queue = manager.add_listener("QQQ")
+    try:
+        price = await queue.get()
+    finally:
+        manager.remove_listener("QQQ", queue)
 """
 
 import asyncio
 import json
 import logging
 from datetime import datetime
-from typing import Dict, Optional, Set, Callable, Any
+from functools import cached_property
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Set, Callable, Any, Union
 from dataclasses import dataclass
 
 import websockets
@@ -42,6 +52,13 @@ class RealtimePrice:
     timestamp: datetime
     day_change: Optional[float] = None
     day_change_pct: Optional[float] = None
+    # 该 symbol 的价格序号：价格或涨跌变化时加一，重复推送的相同报价不变
+    tick_seq: int = 0
+
+    @cached_property
+    def timestamp_iso(self) -> Optional[str]:
+        """ISO 格式时间戳（每个价格只格式化一次，各接口复用）"""
+        return self.timestamp.isoformat() if self.timestamp else None
 
 
 class TwelveDataWebSocket:
@@ -63,10 +80,13 @@ class TwelveDataWebSocket:
         self._ws: Optional[websockets.WebSocketClientProtocol] = None
         self._subscribed_symbols: Set[str] = set()
         self._latest_prices: Dict[str, RealtimePrice] = {}
+        # get_all_prices() 返回的只读快照；价格更新时置空，下次读取时重建
+        self._prices_snapshot: Optional[Mapping[str, RealtimePrice]] = None
         self._running = False
         self._reconnect_delay = 5  # 重连延迟（秒）
         self._heartbeat_interval = 10  # 心跳间隔（秒）
         self._callbacks: list[Callable[[RealtimePrice], None]] = []
+        self._listeners: Dict[str, Set[asyncio.Queue]] = {}
         self._lock = asyncio.Lock()
 
     @property
@@ -96,6 +116,45 @@ class TwelveDataWebSocket:
         if callback in self._callbacks:
             self._callbacks.remove(callback)
 
+    def add_listener(self, symbol: str, maxsize: int = 16) -> asyncio.Queue:
+        """
+        注册 symbol 的价格监听队列
+
+        每次该 symbol 有价格更新时放入一条 RealtimePrice；队列满时丢弃最旧的一条。
+        若已有最新价格，会先放入该价格。
+
+        参数:
+            symbol: 股票代码
+            maxsize: 队列容量
+
+        返回:
+            asyncio.Queue，用完后需调用 remove_listener
+        """
+        symbol = symbol.upper()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        latest = self._latest_prices.get(symbol)
+        if latest is not None:
+            queue.put_nowait(latest)
+        self._listeners.setdefault(symbol, set()).add(queue)
+        return queue
+
+    def remove_listener(self, symbol: str, queue: asyncio.Queue):
+        """移除 add_listener 返回的监听队列"""
+        symbol = symbol.upper()
+        listeners = self._listeners.get(symbol)
+        if listeners is None:
+            return
+        listeners.discard(queue)
+        if not listeners:
+            del self._listeners[symbol]
+
+    def _notify_listeners(self, price: RealtimePrice):
+        """将价格更新放入该 symbol 的所有监听队列（满时丢弃最旧的一条）"""
+        for queue in self._listeners.get(price.symbol, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(price)
+
     async def connect(self):
         """
         连接到 TwelveData WebSocket
@@ -120,41 +179,51 @@ class TwelveDataWebSocket:
             self._ws = None
         logger.info("WebSocket 已断开")
 
-    async def subscribe(self, symbol: str) -> bool:
+    async def subscribe(self, symbols: Union[str, Iterable[str]]) -> bool:
         """
-        订阅 symbol 的实时价格
+        订阅实时价格
+
+        多个 symbol 合并为一条 subscribe 消息发送，只需一次往返。
 
         参数:
-            symbol: 股票代码（如 QQQ, AAPL）
+            symbols: 股票代码或代码列表（如 "QQQ" 或 ["QQQ", "AAPL"]）
 
         返回:
             是否订阅成功
         """
-        symbol = symbol.upper()
-
-        if symbol in self._subscribed_symbols:
-            logger.debug(f"已订阅 {symbol}，跳过")
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        # 去重并跳过已订阅的 symbol（保持顺序）
+        new_symbols = [
+            s for s in dict.fromkeys(symbol.upper() for symbol in symbols)
+            if s not in self._subscribed_symbols
+        ]
+
+        if not new_symbols:
+            logger.debug("已全部订阅，跳过")
             return True
 
+        names = ",".join(new_symbols)
+
         if not self.is_connected:
             # 保存待订阅，连接后自动订阅
-            self._subscribed_symbols.add(symbol)
-            logger.info(f"WebSocket 未连接，{symbol} 将在连接后订阅")
+            self._subscribed_symbols.update(new_symbols)
+            logger.info(f"WebSocket 未连接，{names} 将在连接后订阅")
             return True
 
         try:
             subscribe_msg = {
                 "action": "subscribe",
                 "params": {
-                    "symbols": symbol
+                    "symbols": names
                 }
             }
             await self._ws.send(json.dumps(subscribe_msg))
-            self._subscribed_symbols.add(symbol)
-            logger.info(f"已订阅实时价格: {symbol}")
+            self._subscribed_symbols.update(new_symbols)
+            logger.info(f"已订阅实时价格: {names}")
             return True
         except Exception as e:
-            logger.error(f"订阅 {symbol} 失败: {e}")
+            logger.error(f"订阅 {names} 失败: {e}")
             return False
 
     async def unsubscribe(self, symbol: str) -> bool:
@@ -185,7 +254,8 @@ class TwelveDataWebSocket:
             }
             await self._ws.send(json.dumps(unsubscribe_msg))
             self._subscribed_symbols.discard(symbol)
-            self._latest_prices.pop(symbol, None)
+            if self._latest_prices.pop(symbol, None) is not None:
+                self._prices_snapshot = None
             logger.info(f"已取消订阅: {symbol}")
             return True
         except Exception as e:
@@ -204,9 +274,17 @@ class TwelveDataWebSocket:
         """
         return self._latest_prices.get(symbol.upper())
 
-    def get_all_prices(self) -> Dict[str, RealtimePrice]:
-        """获取所有已订阅 symbol 的最新价格"""
-        return self._latest_prices.copy()
+    def get_all_prices(self) -> Mapping[str, RealtimePrice]:
+        """
+        获取所有已订阅 symbol 的最新价格
+
+        返回只读快照：两次价格更新之间的多次读取共用同一个快照，
+        不再每次复制字典；之后的更新不会改变已返回的快照。
+        """
+        snapshot = self._prices_snapshot
+        if snapshot is None:
+            snapshot = self._prices_snapshot = MappingProxyType(dict(self._latest_prices))
+        return snapshot
 
     async def _connection_manager(self):
         """
@@ -303,7 +381,16 @@ class TwelveDataWebSocket:
                         day_change=float(day_change) if day_change else None,
                         day_change_pct=float(day_change_pct) if day_change_pct else None,
                     )
+                    previous = self._latest_prices.get(symbol)
+                    if previous is not None:
+                        changed = (
+                            (price, realtime_price.day_change, realtime_price.day_change_pct)
+                            != (previous.price, previous.day_change, previous.day_change_pct)
+                        )
+                        realtime_price.tick_seq = previous.tick_seq + changed
                     self._latest_prices[symbol] = realtime_price
+                    self._prices_snapshot = None
+                    self._notify_listeners(realtime_price)
 
                     # 触发回调
                     for callback in self._callbacks:
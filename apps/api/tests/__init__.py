@@ -8,6 +8,8 @@ KLineLens API 测试包
 - test_health.py: 健康检查测试
 - test_cache.py: 缓存功能测试
 - test_providers.py: 数据提供者测试
+- test_database.py: 信号评估数据库测试
+- test_config.py: 配置加载测试
 
 运行测试:
     cd apps/api
@@ -1,5 +1,5 @@
 """
-/v1/analyze 端点测试
+/v1/analyze 与 /v1/narrative 端点测试
 
 测试市场分析 API 的完整集成。
 """
@@ -115,6 +115,13 @@ class TestAnalyzeEndpoint:
         assert response.status_code == 400
         assert "TIMEFRAME_INVALID" in response.json()["detail"]["code"]
 
+    def test_sim_trade_plan_rejects_non_intraday_timeframe(self):
+        """交易计划只支持 1m/5m，其他周期应返回 400"""
+        response = client.get("/v1/sim-trade-plan", params={"ticker": "QQQ", "tf": "1d"})
+
+        assert response.status_code == 400
+        assert response.json()["detail"]["code"] == "TIMEFRAME_INVALID"
+
     def test_analyze_invalid_ticker(self):
         """无效股票代码应返回 404"""
         from src.providers import TickerNotFoundError
@@ -157,6 +164,128 @@ class TestAnalyzeEndpoint:
         assert response.status_code == 200
         assert response.json()["ticker"] == "TSLA"
 
+    def test_analyze_cache_hit_reuses_core_bars(self):
+        """缓存命中时应复用已解析的 CoreBar 列表"""
+        from src.main import core_bars_from_cache
+
+        bars_data = [
+            {**bar.to_dict(), "t": bar.t.replace(tzinfo=None).isoformat() + "Z"}
+            for bar in self._generate_mock_bars(50)
+        ]
+
+        first = core_bars_from_cache("test:core-bars", bars_data, "1d")
+        second = core_bars_from_cache("test:core-bars", bars_data, "1d")
+        assert second is first
+        assert first[0].t == datetime(2026, 1, 1, 9, 30)
+
+        # 数据刷新后应重新解析
+        refreshed = bars_data[1:]
+        third = core_bars_from_cache("test:core-bars", refreshed, "1d")
+        assert third is not first
+        assert len(third) == 49
+
+        with patch('src.main.cache.get', return_value=bars_data):
+            response = client.post(
+                "/v1/analyze",
+                json={"ticker": "TSLA", "tf": "1d"}
+            )
+
+        assert response.status_code == 200
+        assert response.json()["bar_count"] == 50
+
+    def test_analyze_bars_to_json_matches_endpoint(self):
+        """进程池分析函数的输出应与端点响应一致"""
+        import orjson
+        from src.analysis import analyze_bars_to_json
+
+        mock_bars = self._generate_mock_bars(50)
+        bars = [(bar.t, bar.o, bar.h, bar.l, bar.c, bar.v) for bar in mock_bars]
+        data = orjson.loads(analyze_bars_to_json(bars, "TSLA", "1d"))
+
+        with patch('src.main.provider.get_bars', return_value=mock_bars):
+            with patch('src.main.cache.get', return_value=None):
+                response = client.post(
+                    "/v1/analyze",
+                    json={"ticker": "TSLA", "tf": "1d"}
+                )
+
+        expected = response.json()
+        data.pop("generated_at")
+        expected.pop("generated_at")
+        assert data == expected
+
+    def test_analysis_reused_until_new_bar(self):
+        """相同 K 线重复分析时复用缓存结果，新 K 线到达后重新分析"""
+        import asyncio
+        from unittest.mock import AsyncMock
+        from src.main import CoreBar, run_analysis
+
+        mock_bars = self._generate_mock_bars(50)
+        core_bars = [CoreBar(t=b.t, o=b.o, h=b.h, l=b.l, c=b.c, v=b.v) for b in mock_bars]
+        last = mock_bars[-1]
+        next_bar = CoreBar(t=last.t + timedelta(days=1), o=last.c, h=last.c + 1, l=last.c - 1, c=last.c, v=last.v)
+
+        async def run():
+            with patch('src.main._analyze', new=AsyncMock(return_value=b"{}")) as analyze:
+                await run_analysis(core_bars, "CACHED", "1d")
+                await run_analysis(list(core_bars), "CACHED", "1d")
+                await run_analysis(core_bars + [next_bar], "CACHED", "1d")
+                return analyze.await_count
+
+        assert asyncio.run(run()) == 2
+
+    def test_analysis_rerun_when_last_bar_updates(self):
+        """最新 K 线的高低点或成交量变化（收盘价不变）时应重新分析"""
+        import asyncio
+        from dataclasses import replace
+        from unittest.mock import AsyncMock
+        from src.main import CoreBar, run_analysis
+
+        mock_bars = self._generate_mock_bars(50)
+        core_bars = [CoreBar(t=b.t, o=b.o, h=b.h, l=b.l, c=b.c, v=b.v) for b in mock_bars]
+        last = core_bars[-1]
+
+        async def run():
+            with patch('src.main._analyze', new=AsyncMock(return_value=b"{}")) as analyze:
+                await run_analysis(core_bars, "LIVEBAR", "1m")
+                await run_analysis(core_bars[:-1] + [replace(last, h=last.h + 1)], "LIVEBAR", "1m")
+                await run_analysis(core_bars[:-1] + [replace(last, l=last.l - 1)], "LIVEBAR", "1m")
+                await run_analysis(core_bars[:-1] + [replace(last, v=last.v + 100)], "LIVEBAR", "1m")
+                return analyze.await_count
+
+        assert asyncio.run(run()) == 4
+
+    def test_analyze_gzip(self):
+        """客户端支持 gzip 时报告应压缩返回（小于 1KB 的报告不压缩）"""
+        import math
+        from src.providers.base import Bar
+
+        # 波动行情，生成足够多的区域和信号使报告超过 1KB
+        start_time = datetime(2026, 1, 1, 9, 30, tzinfo=timezone.utc)
+        mock_bars = [
+            Bar(
+                t=start_time + timedelta(minutes=i),
+                o=100 + 5 * math.sin(i / 7),
+                h=102 + 5 * math.sin(i / 7),
+                l=98 + 5 * math.sin(i / 7),
+                c=100 + 5 * math.sin(i / 7 + 0.3),
+                v=1000000 + i * 1000
+            )
+            for i in range(500)
+        ]
+
+        with patch('src.main.provider.get_bars', return_value=mock_bars):
+            with patch('src.main.cache.get', return_value=None):
+                response = client.post(
+                    "/v1/analyze",
+                    json={"ticker": "TSLA", "tf": "1d"},
+                    headers={"Accept-Encoding": "gzip"}
+                )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["ticker"] == "TSLA"
+
     def _generate_mock_bars(self, n: int):
         """生成模拟 K 线数据"""
         from src.providers.base import Bar
@@ -180,3 +309,148 @@ class TestAnalyzeEndpoint:
             ))
 
         return bars
+
+
+class TestImportCorePackage:
+    """core 模块导入测试"""
+
+    def test_import_is_memoized(self):
+        """重复导入应直接返回同一结果，且不影响 API 的 src 包"""
+        import sys
+        from src.analysis import import_core_package
+        import src.main
+
+        first = import_core_package()
+        second = import_core_package()
+
+        assert second is first
+        assert first[0] is src.main.analyze_market
+        assert sys.modules["src.main"] is src.main
+
+
+class TestEHContextInternal:
+    """内部 EH 上下文缓存测试"""
+
+    def test_cache_hit_returns_same_context(self):
+        """缓存命中应返回同一个 EHContext 对象（属性可正常访问）"""
+        import asyncio
+        from src.main import get_eh_context_internal, eh_context_cache
+        from src.providers.base import Bar
+
+        eh_bars = [
+            Bar(t=datetime(2026, 1, 13, 9, 0) + timedelta(minutes=i), o=1.0, h=1.0, l=1.0, c=1.0, v=1.0)
+            for i in range(100)
+        ]
+        context = MagicMock()
+        eh_context_cache.clear()
+
+        with patch('src.main.fetch_eh_bars', return_value=eh_bars):
+            with patch('src.main.build_eh_context_from_bars', return_value=context) as build:
+                first = asyncio.run(get_eh_context_internal("ehtest", "1m"))
+                second = asyncio.run(get_eh_context_internal("EHTEST", "1m"))
+
+        assert first is context
+        assert second is context
+        assert build.call_count == 1
+
+
+class TestNarrativeBatch:
+    """批量叙事测试"""
+
+    def test_batch_runs_items_independently(self):
+        """
+        测试批量叙事
+
+        预期:
+        - 结果顺序与请求一致
+        - 单项失败只影响该项（narrative 为 null，error 带错误代码）
+        """
+        import dataclasses
+        from unittest.mock import AsyncMock
+        from src.main import settings
+        from src.providers import TickerNotFoundError
+
+        async def fake_input(request):
+            if request.ticker == "NOPE":
+                raise TickerNotFoundError("无效代码")
+            return {"ticker": request.ticker}
+
+        result = MagicMock(report_type="quick", summary="s", action="a", content="c",
+                           why=[], risks=[], quality={}, triggered_by=None, error=None)
+
+        with patch('src.main.settings', dataclasses.replace(settings, llm_api_key="test")), \
+                patch('src.main._narrative_input', side_effect=fake_input), \
+                patch('src.main.llm_service.generate_analysis', new=AsyncMock(return_value=result)):
+            response = client.post("/v1/narrative/batch", json=[
+                {"ticker": "tsla", "report_type": "quick"},
+                {"ticker": "nope", "report_type": "quick"},
+            ])
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 2
+        assert [r["ticker"] for r in data["results"]] == ["TSLA", "NOPE"]
+        assert data["results"][0]["narrative"]["summary"] == "s"
+        assert data["results"][1]["narrative"] is None
+        assert data["results"][1]["error"]["code"] == "NO_DATA"
+
+    def test_narrative_prefetches_shared_cache_keys(self):
+        """
+        测试单次叙事的共享缓存预取
+
+        预期:
+        - K 线键和 EH 负缓存键通过一次 get_many 取回（Redis 时为一次 MGET）
+        """
+        import dataclasses
+        from unittest.mock import AsyncMock
+        from src.main import settings, cache_key, eh_empty_key, provider
+
+        result = MagicMock(report_type="quick", summary="s", action="a", content="c",
+                           why=[], risks=[], quality={}, triggered_by=None, error=None)
+
+        with patch('src.main.settings', dataclasses.replace(settings, llm_api_key="test")), \
+                patch('src.main.cache.get_many') as get_many, \
+                patch('src.main._narrative_input', new=AsyncMock(return_value={})), \
+                patch('src.main.llm_service.generate_analysis', new=AsyncMock(return_value=result)):
+            response = client.post("/v1/narrative", json={"ticker": "tsla", "tf": "5m", "report_type": "quick"})
+
+        assert response.status_code == 200
+        get_many.assert_called_once_with([
+            cache_key("TSLA", "5m", provider.get_default_window("5m")),
+            eh_empty_key("TSLA", "5m"),
+        ])
+
+    def test_single_narrative_bypasses_batch_semaphore(self):
+        """
+        测试单次叙事不占用批量并发额度
+
+        预期:
+        - /v1/narrative 不经过 batch_llm_semaphore，批量请求再多也不排队
+        """
+        import dataclasses
+        from unittest.mock import AsyncMock
+        from src.main import settings
+
+        result = MagicMock(report_type="quick", summary="s", action="a", content="c",
+                           why=[], risks=[], quality={}, triggered_by=None, error=None)
+
+        with patch('src.main.settings', dataclasses.replace(settings, llm_api_key="test")), \
+                patch('src.main.batch_llm_semaphore') as semaphore, \
+                patch('src.main._narrative_input', new=AsyncMock(return_value={})), \
+                patch('src.main.llm_service.generate_analysis', new=AsyncMock(return_value=result)):
+            response = client.post("/v1/narrative", json={"ticker": "TSLA", "tf": "1d", "report_type": "quick"})
+
+        assert response.status_code == 200
+        semaphore.__aenter__.assert_not_called()
+
+    def test_batch_size_invalid(self):
+        """
+        测试批量数量校验
+
+        预期:
+        - 空列表返回 400 BATCH_SIZE_INVALID
+        """
+        response = client.post("/v1/narrative/batch", json=[])
+
+        assert response.status_code == 400
+        assert response.json()["detail"]["code"] == "BATCH_SIZE_INVALID"
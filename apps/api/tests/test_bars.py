@@ -8,6 +8,7 @@ K 线数据端点测试
 """
 
 import pytest
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 
 from src.main import app
@@ -159,6 +160,230 @@ class TestBarsEndpoint:
         assert data["ticker"] == "AAPL"
 
 
+    def test_get_bars_columnar_format(self):
+        """
+        测试 format=columnar 按字段分列返回
+
+        预期:
+        - bars 为 {"t": [...], "o": [...], ...}
+        - 各列与行格式逐根对应
+        """
+        rows = [
+            {"t": "2026-01-13T14:30:00Z", "o": 245.5, "h": 246.2, "l": 245.3, "c": 246.0, "v": 125000.0},
+            {"t": "2026-01-13T14:31:00Z", "o": 246.0, "h": 246.5, "l": 245.8, "c": 246.4, "v": 98000.0},
+        ]
+
+        with patch('src.main.cache.get', return_value=rows):
+            response = client.get("/v1/bars", params={
+                "ticker": "AAPL",
+                "tf": "1m",
+                "format": "columnar"
+            })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["bar_count"] == 2
+        assert data["bars"] == {
+            "t": ["2026-01-13T14:30:00Z", "2026-01-13T14:31:00Z"],
+            "o": [245.5, 246.0],
+            "h": [246.2, 246.5],
+            "l": [245.3, 245.8],
+            "c": [246.0, 246.4],
+            "v": [125000.0, 98000.0],
+        }
+
+    def test_get_bars_stream(self):
+        """
+        测试 stream=true 以 NDJSON 返回
+
+        预期:
+        - Content-Type 为 application/x-ndjson
+        - 首行为元信息，之后每行一根 K 线
+        """
+        import json
+
+        rows = [
+            {"t": "2026-01-13T14:30:00Z", "o": 245.5, "h": 246.2, "l": 245.3, "c": 246.0, "v": 125000.0},
+            {"t": "2026-01-13T14:31:00Z", "o": 246.0, "h": 246.5, "l": 245.8, "c": 246.4, "v": 98000.0},
+        ]
+
+        with patch('src.main.cache.get', return_value=rows):
+            response = client.get("/v1/bars", params={
+                "ticker": "aapl",
+                "tf": "1m",
+                "stream": "true"
+            })
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines[0] == {"ticker": "AAPL", "tf": "1m", "bar_count": 2}
+        assert lines[1:] == rows
+
+    def test_get_bars_stream_skips_full_encode(self):
+        """
+        测试流式返回不预先编码整份 K 线
+
+        预期:
+        - 无 If-None-Match 时不对整个列表编码，也不返回 ETag
+        - 带 If-None-Match 时计算 ETag，匹配则返回 304
+        """
+        import orjson
+
+        rows = [
+            {"t": "2026-01-13T14:30:00Z", "o": 245.5, "h": 246.2, "l": 245.3, "c": 246.0, "v": 125000.0},
+        ]
+        params = {"ticker": "NVDA", "tf": "1m", "stream": "true"}
+
+        with patch('src.main.cache.get', return_value=rows), \
+                patch('src.main.orjson.dumps', wraps=orjson.dumps) as dumps:
+            first = client.get("/v1/bars", params=params)
+
+        assert first.status_code == 200
+        assert "etag" not in first.headers
+        assert rows not in [call.args[0] for call in dumps.call_args_list]
+
+        with patch('src.main.cache.get', return_value=rows):
+            second = client.get("/v1/bars", params=params, headers={"If-None-Match": '"none"'})
+            etag = second.headers["etag"]
+            third = client.get("/v1/bars", params=params, headers={"If-None-Match": etag})
+
+        assert second.status_code == 200
+        assert third.status_code == 304
+
+    def test_get_bars_etag_not_modified(self):
+        """
+        测试 ETag / If-None-Match 条件请求
+
+        预期:
+        - 响应带 ETag
+        - 携带相同 ETag 再次请求返回 304 且无响应体
+        - 数据变化后 ETag 改变，返回 200
+        """
+        rows = [
+            {"t": "2026-01-13T14:30:00Z", "o": 245.5, "h": 246.2, "l": 245.3, "c": 246.0, "v": 125000.0},
+        ]
+        params = {"ticker": "AAPL", "tf": "1m"}
+
+        with patch('src.main.cache.get', return_value=rows):
+            first = client.get("/v1/bars", params=params)
+            etag = first.headers["etag"]
+            second = client.get("/v1/bars", params=params, headers={"If-None-Match": etag})
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+        updated = [{**rows[0], "c": 246.1}]
+        with patch('src.main.cache.get', return_value=updated):
+            third = client.get("/v1/bars", params=params, headers={"If-None-Match": etag})
+
+        assert third.status_code == 200
+        assert third.headers["etag"] != etag
+
+    def test_get_bars_etag_per_representation(self):
+        """
+        测试不同表示形式的 ETag 互不通用
+
+        预期:
+        - rows / columnar / ndjson 的 ETag 各不相同
+        - 用 rows 的 ETag 请求 columnar 返回 200 而不是 304
+        """
+        rows = [
+            {"t": "2026-01-13T14:30:00Z", "o": 245.5, "h": 246.2, "l": 245.3, "c": 246.0, "v": 125000.0},
+        ]
+        params = {"ticker": "AMD", "tf": "1m"}
+
+        with patch('src.main.cache.get', return_value=rows):
+            etag = client.get("/v1/bars", params=params).headers["etag"]
+            columnar = client.get("/v1/bars", params={**params, "format": "columnar"}, headers={"If-None-Match": etag})
+            stream = client.get("/v1/bars", params={**params, "stream": "true"}, headers={"If-None-Match": etag})
+
+        assert columnar.status_code == 200
+        assert stream.status_code == 200
+        assert len({etag, columnar.headers["etag"], stream.headers["etag"]}) == 3
+
+    def test_get_bars_reuses_encoded_bars(self):
+        """
+        测试缓存命中时复用已编码的 K 线 JSON
+
+        预期:
+        - 响应结构与 BarsResponse 一致
+        - 同一份缓存数据只编码一次
+        """
+        import orjson
+
+        rows = [
+            {"t": "2026-01-13T14:30:00Z", "o": 245.5, "h": 246.2, "l": 245.3, "c": 246.0, "v": 125000.0},
+        ]
+
+        with patch('src.main.cache.get', return_value=rows), \
+                patch('src.main.orjson.dumps', wraps=orjson.dumps) as dumps:
+            first = client.get("/v1/bars", params={"ticker": "MSFT", "tf": "5m"})
+            second = client.get("/v1/bars", params={"ticker": "MSFT", "tf": "5m"})
+
+        assert first.json() == {"ticker": "MSFT", "tf": "5m", "bar_count": 1, "bars": rows}
+        assert second.content == first.content
+        assert [call.args[0] for call in dumps.call_args_list].count(rows) == 1
+
+    def test_get_bars_invalid_format(self):
+        """
+        测试无效的 format 参数
+
+        预期:
+        - 状态码: 422
+        """
+        response = client.get("/v1/bars", params={
+            "ticker": "AAPL",
+            "tf": "1d",
+            "format": "csv"
+        })
+
+        assert response.status_code == 422
+
+
+class TestFetchBarsCached:
+    """K 线获取单飞测试"""
+
+    def test_concurrent_misses_fetch_once(self):
+        """
+        测试冷缓存时并发请求同一键
+
+        预期:
+        - 提供者只被调用一次
+        - 所有请求拿到同一份数据
+        - 请求结束后不残留进行中的条目，数据已写入缓存
+        """
+        import asyncio
+        import time
+        from datetime import datetime
+        from src.main import fetch_bars_cached, _pending_fetches, _background_tasks, cache, cache_key
+        from src.providers import Bar, ConditionalBars
+
+        calls = []
+
+        def slow_fetch(ticker, tf, window, etag=None, last_modified=None):
+            calls.append(ticker)
+            time.sleep(0.1)
+            return ConditionalBars([Bar(t=datetime(2026, 1, 13, 14, 30), o=1.0, h=2.0, l=0.5, c=1.5, v=100.0)])
+
+        async def burst():
+            results = await asyncio.gather(*(fetch_bars_cached("SINGLEFLIGHT", "1d", "5d") for _ in range(5)))
+            # 缓存写入在后台完成
+            await asyncio.gather(*_background_tasks)
+            return results
+
+        with patch('src.main.provider.get_bars_conditional', side_effect=slow_fetch):
+            results = asyncio.run(burst())
+
+        assert len(calls) == 1
+        assert all(r == results[0] for r in results)
+        assert results[0][0]["t"] == "2026-01-13T14:30:00Z"
+        assert not _pending_fetches
+        assert cache.get(cache_key("SINGLEFLIGHT", "1d", "5d")) == results[0]
+
+
 class TestBarsTimeframes:
     """测试不同时间周期"""
 
@@ -4,13 +4,14 @@
 测试内存缓存的各种场景：
 - 缓存存取
 - TTL 过期
+- 磁盘持久化
 - 缓存键生成
 """
 
 import time
 import pytest
 
-from src.cache import MemoryCache, cache_key
+from src.cache import MemoryCache, DiskCache, EMPTY, cache_key, ttl_for_timeframe
 
 
 class TestMemoryCache:
@@ -106,6 +107,52 @@ class TestMemoryCache:
         cleaned = cache.cleanup_expired()
         assert cleaned == 2
 
+    def test_cleanup_skips_refreshed_entry(self):
+        """
+        测试重新 set 的条目不被旧的堆记录清理
+
+        预期:
+        - 旧 TTL 到期后，重新 set 的 key 仍然有效
+        """
+        cache = MemoryCache(default_ttl=60)
+        cache.set("key", "old", ttl=1)
+        cache.set("key", "new", ttl=60)
+
+        time.sleep(1.5)
+
+        assert cache.cleanup_expired() == 0
+        assert cache.get("key") == "new"
+
+    def test_background_eviction(self):
+        """
+        测试后台清理定时器
+
+        预期:
+        - 不调用 get / cleanup_expired，过期条目也会被移除
+        """
+        cache = MemoryCache(default_ttl=60)
+        cache.start_eviction(interval=0.2)
+        try:
+            cache.set("expire", "data", ttl=1)
+            time.sleep(1.6)
+            assert "expire" not in cache._cache
+        finally:
+            cache.stop_eviction()
+
+
+    def test_get_many(self):
+        """
+        测试批量获取
+
+        预期:
+        - 结果与 keys 一一对应，不存在或已过期的为 None
+        """
+        cache = MemoryCache(default_ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("expired", 3, ttl=-1)
+
+        assert cache.get_many(["b", "missing", "a", "expired"]) == [2, None, 1, None]
 
 class TestCacheKey:
     """缓存键生成测试类"""
@@ -144,3 +191,253 @@ class TestCacheKey:
         assert key1 != key2
         assert key1 != key3
         assert key2 != key3
+
+    def test_cache_key_reused(self):
+        """
+        测试缓存键记忆化
+
+        预期:
+        - 相同参数返回同一个字符串对象
+        """
+        assert cache_key("TSLA", "1m", "1d") is cache_key("TSLA", "1m", "1d")
+
+
+class TestDiskCache:
+    """磁盘持久化缓存测试类"""
+
+    def test_set_and_get(self, tmp_path):
+        """
+        测试基本的存取操作
+
+        预期:
+        - set 后能够 get 到相同的值
+        """
+        cache = DiskCache(path=str(tmp_path / "cache.db"), default_ttl=60)
+        cache.set("test_key", [{"t": "2026-01-01T09:30:00Z", "c": 1.5}])
+
+        assert cache.get("test_key") == [{"t": "2026-01-01T09:30:00Z", "c": 1.5}]
+
+    def test_survives_restart(self, tmp_path):
+        """
+        测试跨实例持久化
+
+        预期:
+        - 新实例打开同一文件后仍能读取到缓存
+        """
+        path = str(tmp_path / "cache.db")
+        DiskCache(path=path, default_ttl=60).set("persist_key", {"data": "value"})
+
+        reopened = DiskCache(path=path, default_ttl=60)
+        assert reopened.get("persist_key") == {"data": "value"}
+
+    def test_ttl_expiration(self, tmp_path):
+        """
+        测试 TTL 过期
+
+        预期:
+        - 过期后 L1 与磁盘都返回 None
+        """
+        path = str(tmp_path / "cache.db")
+        cache = DiskCache(path=path, default_ttl=60)
+        cache.set("expire_key", "data", ttl=1)
+
+        time.sleep(1.5)
+
+        assert cache.get("expire_key") is None
+        assert DiskCache(path=path, default_ttl=60).get("expire_key") is None
+
+    def test_l1_eviction_falls_back_to_disk(self, tmp_path):
+        """
+        测试 L1 热层淘汰
+
+        预期:
+        - 超出 L1 容量的 key 仍可从磁盘读取
+        """
+        cache = DiskCache(path=str(tmp_path / "cache.db"), default_ttl=60, l1_size=2)
+        cache.set("key1", "data1")
+        cache.set("key2", "data2")
+        cache.set("key3", "data3")
+
+        assert "key1" not in cache._cache
+        assert cache.get("key1") == "data1"
+
+    def test_cleanup_expired(self, tmp_path):
+        """
+        测试清理过期条目
+
+        预期:
+        - cleanup_expired 返回清理的条目数
+        """
+        cache = DiskCache(path=str(tmp_path / "cache.db"), default_ttl=60)
+        cache.set("expire1", "data", ttl=1)
+        cache.set("expire2", "data", ttl=1)
+        cache.set("keep", "data", ttl=60)
+
+        time.sleep(1.5)
+
+        assert cache.cleanup_expired() == 2
+        assert cache.get("keep") == "data"
+
+    def test_empty_sentinel_roundtrip(self, tmp_path):
+        """
+        测试负结果哨兵持久化
+
+        预期:
+        - 新实例从磁盘读取后仍是同一个 EMPTY 对象
+        """
+        path = str(tmp_path / "cache.db")
+        DiskCache(path=path, default_ttl=60).set("empty_key", EMPTY)
+
+        assert DiskCache(path=path, default_ttl=60).get("empty_key") is EMPTY
+
+    def test_pickle_payload_not_loaded(self, tmp_path):
+        """
+        测试磁盘中的 pickle 数据不会被反序列化
+
+        预期:
+        - 写入缓存文件的 pickle 载荷不执行，视为未命中
+        - 该行被删除
+        """
+        import os
+        import pickle
+        import sqlite3
+        import time
+
+        path = str(tmp_path / "cache.db")
+        marker = tmp_path / "pwned"
+        DiskCache(path=path, default_ttl=60).close()
+
+        class Exploit:
+            def __reduce__(self):
+                return (os.system, (f"touch {marker}",))
+
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            ("evil", pickle.dumps(Exploit()), time.time() + 60),
+        )
+        conn.commit()
+        conn.close()
+
+        cache = DiskCache(path=path, default_ttl=60)
+        assert cache.get("evil") is None
+        assert cache.get_stale("evil") is None
+        assert not marker.exists()
+
+
+    def test_concurrent_l1_access(self, tmp_path):
+        """
+        测试多线程并发读写 L1 热层
+
+        预期:
+        - 同时命中过期条目、写入和淘汰时不抛出异常
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        cache = DiskCache(path=str(tmp_path / "cache.db"), default_ttl=60, l1_size=4)
+
+        def worker(i):
+            for n in range(200):
+                key = f"k{(i + n) % 8}"
+                cache.set(key, n, ttl=0 if n % 3 == 0 else 60)
+                cache.get(key)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for future in [pool.submit(worker, i) for i in range(8)]:
+                future.result()
+
+        assert len(cache._cache) <= 4
+
+class TestTimeframeTTL:
+    """按周期划分 TTL 测试类"""
+
+    def test_intraday_shorter_than_daily(self):
+        """
+        测试分钟线 TTL 短于日线
+
+        预期:
+        - 1m < 5m < 1d
+        """
+        assert ttl_for_timeframe("1m") < ttl_for_timeframe("5m") < ttl_for_timeframe("1d")
+
+    def test_unknown_timeframe_uses_default(self):
+        """
+        测试未知周期
+
+        预期:
+        - 返回传入的默认值
+        """
+        assert ttl_for_timeframe("15m") is None
+        assert ttl_for_timeframe("15m", default=60) == 60
+
+
+class TestConditionalRevalidation:
+    """条件重新验证测试类"""
+
+    def test_memory_keeps_revalidatable_entry(self):
+        """
+        测试带 ETag 的条目过期后保留
+
+        预期:
+        - get 返回 None，get_stale 仍能取回数据与 ETag
+        - touch 后 get 重新命中
+        """
+        cache = MemoryCache(default_ttl=60)
+        cache.set("key", "data", ttl=1, etag='"v1"')
+
+        time.sleep(1.5)
+
+        assert cache.get("key") is None
+        stale = cache.get_stale("key")
+        assert stale.data == "data"
+        assert stale.etag == '"v1"'
+
+        assert cache.touch("key", ttl=60) is True
+        assert cache.get("key") == "data"
+
+    def test_memory_touch_missing_key(self):
+        """
+        测试续期不存在的 key
+
+        预期:
+        - 返回 False
+        """
+        assert MemoryCache().touch("missing") is False
+
+    def test_disk_touch_persists(self, tmp_path):
+        """
+        测试磁盘缓存续期
+
+        预期:
+        - 过期条目保留校验值，touch 后新实例也能命中
+        """
+        path = str(tmp_path / "cache.db")
+        cache = DiskCache(path=path, default_ttl=60)
+        cache.set("key", [1, 2], ttl=1, last_modified="Mon, 05 Jan 2026 21:00:00 GMT")
+
+        time.sleep(1.5)
+
+        assert cache.get("key") is None
+        assert cache.get_stale("key").last_modified == "Mon, 05 Jan 2026 21:00:00 GMT"
+        assert cache.touch("key", ttl=60) is True
+        assert DiskCache(path=path, default_ttl=60).get("key") == [1, 2]
+
+    def test_disk_cleanup_keeps_revalidatable_entry(self, tmp_path):
+        """
+        测试磁盘缓存清理保留带校验值的过期条目
+
+        预期:
+        - 无校验值的过期条目被删除
+        - 带 ETag 的过期条目保留到 STALE_GRACE 之后
+        """
+        cache = DiskCache(path=str(tmp_path / "cache.db"), default_ttl=60)
+        cache.set("plain", "data", ttl=-1)
+        cache.set("etag", "data", ttl=-1, etag='"v1"')
+
+        assert cache.cleanup_expired() == 1
+        assert cache.get_stale("plain") is None
+        assert cache.get_stale("etag").etag == '"v1"'
+
+        cache.set("etag", "data", ttl=-cache.STALE_GRACE - 1, etag='"v1"')
+        assert cache.cleanup_expired() == 1
+        assert cache.get_stale("etag") is None
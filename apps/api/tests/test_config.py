@@ -0,0 +1,76 @@
+"""
+配置加载测试
+
+测试 Settings.from_env 的各种场景：
+- 默认值
+- .env 文件解析
+- 环境变量优先级与类型转换
+"""
+
+import pytest
+
+from src.config import Settings
+
+
+class TestSettings:
+    """配置加载测试类"""
+
+    def test_defaults(self):
+        """
+        测试无任何配置时的默认值
+
+        预期:
+        - 与 dataclass 默认值一致
+        """
+        settings = Settings.from_env(env_file=None, environ={})
+
+        assert settings == Settings()
+        assert settings.cache_ttl == 60
+
+    def test_env_file_and_override(self, tmp_path):
+        """
+        测试 .env 文件与环境变量
+
+        预期:
+        - 解析引号、export 前缀和行尾注释
+        - 环境变量优先于 .env，变量名不区分大小写
+        - 整数项转换为 int
+        """
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            "# 注释\n"
+            "export PROVIDER=yfinance\n"
+            "CACHE_TTL=120 # 秒\n"
+            "CORS_ORIGINS=\"http://a.com,http://b.com\"\n"
+            "LOG_LEVEL=DEBUG\n",
+            encoding="utf-8",
+        )
+
+        settings = Settings.from_env(env_file=str(env_file), environ={"log_level": "WARNING"})
+
+        assert settings.provider == "yfinance"
+        assert settings.cache_ttl == 120
+        assert settings.cors_origins == "http://a.com,http://b.com"
+        assert settings.log_level == "WARNING"
+
+    def test_invalid_int(self):
+        """
+        测试无效的整数配置
+
+        预期:
+        - 抛出 ValueError
+        """
+        with pytest.raises(ValueError):
+            Settings.from_env(env_file=None, environ={"CACHE_TTL": "abc"})
+
+    def test_cors_origin_list(self):
+        """
+        测试跨域来源解析
+
+        预期:
+        - 按逗号拆分，去除空格和空项
+        """
+        settings = Settings(cors_origins=" http://a.com , http://b.com,,")
+
+        assert settings.cors_origin_list == ("http://a.com", "http://b.com")
+        assert Settings().cors_origin_list == ("*",)
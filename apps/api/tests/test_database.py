@@ -0,0 +1,631 @@
+"""
+Signal Evaluation / Watchlist 数据库测试
+
+测试 SignalEvaluationDB 的各种场景：
+- 创建与读取
+- 列表过滤与计数
+- 更新与删除
+- 统计信息
+
+以及 WatchlistDB 的增删查。
+"""
+
+import re
+import sqlite3
+
+import pytest
+
+from src.database import Database, SignalEvaluationDB, SignalEvaluation, WatchlistDB, generate_eval_id, utc_timestamp
+
+
+def _make_evaluation(ticker="TSLA", tf="1m", signal_type="breakout_confirmed", created_at="2026-01-15T14:30:00Z"):
+    """生成测试用评估记录"""
+    return SignalEvaluation(
+        id=generate_eval_id(),
+        ticker=ticker,
+        tf=tf,
+        created_at=created_at,
+        signal_type=signal_type,
+        direction="up",
+        predicted_behavior="continuation",
+        entry_price=100.0,
+        target_price=105.0,
+        invalidation_price=98.0,
+        confidence=0.7,
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    """创建临时数据库"""
+    database = SignalEvaluationDB(db_path=str(tmp_path / "test.db"))
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def watchlist(tmp_path):
+    """创建临时自选股数据库"""
+    database = WatchlistDB(db_path=str(tmp_path / "test.db"))
+    yield database
+    database.close()
+
+
+class TestSignalEvaluationDB:
+    """信号评估数据库测试类"""
+
+    def test_create_and_get(self, db):
+        """
+        测试创建后读取
+
+        预期:
+        - get 返回相同字段
+        """
+        evaluation = db.create(_make_evaluation())
+        fetched = db.get(evaluation.id)
+
+        assert fetched is not None
+        assert fetched.ticker == "TSLA"
+        assert fetched.status == "pending"
+
+    def test_get_nonexistent(self, db):
+        """
+        测试读取不存在的记录
+
+        预期:
+        - 返回 None
+        """
+        assert db.get("eval_missing") is None
+
+    def test_list_and_count_filters(self, db):
+        """
+        测试列表过滤与计数
+
+        预期:
+        - 按 ticker/tf 过滤，按 created_at 倒序
+        """
+        db.create(_make_evaluation(tf="1m", created_at="2026-01-15T14:30:00Z"))
+        db.create(_make_evaluation(tf="1m", created_at="2026-01-15T14:31:00Z"))
+        db.create(_make_evaluation(tf="5m", created_at="2026-01-15T14:32:00Z"))
+        db.create(_make_evaluation(ticker="AAPL"))
+
+        records = db.list(ticker="TSLA", tf="1m")
+
+        assert [r.created_at for r in records] == ["2026-01-15T14:31:00Z", "2026-01-15T14:30:00Z"]
+        assert db.count(ticker="TSLA") == 3
+        assert db.count(ticker="TSLA", tf="5m") == 1
+
+    def test_list_keyset_pagination(self, db):
+        """
+        测试游标分页
+
+        预期:
+        - before 传入上一页最后一条的 created_at，返回更早的记录且不重复
+        """
+        for minute in range(5):
+            db.create(_make_evaluation(created_at=f"2026-01-15T14:3{minute}:00Z"))
+
+        first = db.list(ticker="TSLA", limit=2)
+        second = db.list(ticker="TSLA", limit=2, before=first[-1].created_at)
+
+        assert [r.created_at for r in first] == ["2026-01-15T14:34:00Z", "2026-01-15T14:33:00Z"]
+        assert [r.created_at for r in second] == ["2026-01-15T14:32:00Z", "2026-01-15T14:31:00Z"]
+
+    def test_list_keyset_pagination_ties(self, db):
+        """
+        测试 (created_at, id) 游标分页
+
+        预期:
+        - created_at 相同的记录按 id 区分，翻页既不遗漏也不重复
+        """
+        db.create_many([_make_evaluation() for _ in range(5)])
+
+        first = db.list(ticker="TSLA", limit=2)
+        rest = db.list(ticker="TSLA", limit=10, before_key=(first[-1].created_at, first[-1].id))
+
+        ids = [r.id for r in first + rest]
+        assert ids == sorted(ids, reverse=True)
+        assert len(set(ids)) == 5
+
+    def test_list_with_stats_matches_separate_calls(self, db):
+        """
+        测试列表、总数、统计一次读取
+
+        预期:
+        - 与 list/count/get_statistics 分别调用的结果一致
+        - 统计缓存命中时总数仍按 status 过滤
+        """
+        a = db.create(_make_evaluation(created_at="2026-01-15T14:30:00Z"))
+        db.create(_make_evaluation(created_at="2026-01-15T14:31:00Z", signal_type="false_breakout"))
+        db.create(_make_evaluation(tf="5m", created_at="2026-01-15T14:32:00Z"))
+        db.update(a.id, "correct", "target_hit", "")
+
+        records, total, stats = db.list_with_stats(ticker="TSLA", tf="1m", limit=1)
+
+        assert records == db.list(ticker="TSLA", tf="1m", limit=1)
+        assert total == db.count(ticker="TSLA", tf="1m") == 2
+        assert stats == db.get_statistics(ticker="TSLA", tf="1m")
+
+        records, total, _ = db.list_with_stats(ticker="TSLA", tf="1m", status="pending")
+        assert [r.signal_type for r in records] == ["false_breakout"]
+        assert total == 1
+
+    def test_iter_list_matches_list(self, db):
+        """
+        测试流式读取
+
+        预期:
+        - iter_list 跨多个批次返回与 list 相同的记录和顺序
+        """
+        db.create_many([
+            _make_evaluation(created_at=f"2026-01-15T14:{i // 60:02d}:{i % 60:02d}Z")
+            for i in range(600)
+        ])
+
+        streamed = list(db.iter_list(ticker="TSLA", limit=1000))
+
+        assert len(streamed) == 600
+        assert streamed == db.list(ticker="TSLA", limit=1000)
+        assert list(db.iter_list(ticker="TSLA", limit=300, offset=100)) == db.list(ticker="TSLA", limit=300, offset=100)
+
+    def test_iter_list_allows_writes_between_batches(self, db):
+        """
+        测试流式读取期间的写入
+
+        预期:
+        - 批次之间不持有打开的游标，其他调用可在同一连接上读写
+        - 已读取到的位置之后继续按 (created_at, id) 返回更早的记录
+        """
+        db.create_many([
+            _make_evaluation(created_at=f"2026-01-15T14:{i // 60:02d}:{i % 60:02d}Z")
+            for i in range(600)
+        ])
+        expected = db.list(ticker="TSLA", limit=1000)
+
+        streamed = []
+        for i, record in enumerate(db.iter_list(ticker="TSLA", limit=1000)):
+            streamed.append(record)
+            if i == 10:
+                db.create(_make_evaluation(created_at="2026-01-16T00:00:00Z"))
+                db.update_many([(record.id, "correct", "target_hit", "hit", None)])
+
+        assert [r.id for r in streamed] == [r.id for r in expected]
+
+    def test_update_and_delete(self, db):
+        """
+        测试更新与删除
+
+        预期:
+        - update 返回更新后的记录
+        - delete 后记录不存在
+        """
+        evaluation = db.create(_make_evaluation())
+
+        updated = db.update(evaluation.id, "correct", "target_hit", "hit 105")
+        assert updated.status == "correct"
+        assert updated.evaluated_at is not None
+
+        assert db.update("eval_missing", "correct", "target_hit", "x") is None
+        assert db.delete(evaluation.id) is True
+        assert db.delete(evaluation.id) is False
+
+    def test_timestamp_format(self, db):
+        """
+        测试时间戳格式
+
+        预期:
+        - Python 生成的 created_at 与 SQLite 写入的 evaluated_at 格式一致（毫秒 + Z）
+        """
+        pattern = r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d{3}Z"
+        evaluation = db.create(_make_evaluation(created_at=utc_timestamp()))
+        updated = db.update(evaluation.id, "correct", "target_hit", "")
+
+        assert re.fullmatch(pattern, updated.created_at)
+        assert re.fullmatch(pattern, updated.evaluated_at)
+        assert updated.evaluated_at >= updated.created_at
+
+    def test_update_many(self, db):
+        """
+        测试批量更新
+
+        预期:
+        - 单个事务更新多条记录，返回更新条数
+        - 不存在的 ID 不计入
+        """
+        a = db.create(_make_evaluation())
+        b = db.create(_make_evaluation())
+
+        updated = db.update_many([
+            (a.id, "correct", "target_hit", "hit", None),
+            (b.id, "incorrect", "invalidation_hit", "stopped", "late entry"),
+            ("eval_missing", "correct", "target_hit", "", None),
+        ])
+
+        assert updated == 2
+        assert db.get(a.id).status == "correct"
+        assert db.get(b.id).evaluation_notes == "late entry"
+
+    def test_statistics(self, db):
+        """
+        测试统计信息
+
+        预期:
+        - 准确率排除 pending
+        - 按信号类型统计
+        """
+        a = db.create(_make_evaluation(signal_type="breakout_confirmed"))
+        b = db.create(_make_evaluation(signal_type="breakout_confirmed"))
+        db.create(_make_evaluation(signal_type="breakout_confirmed"))
+        c = db.create(_make_evaluation(signal_type="fakeout"))
+        db.update(a.id, "correct", "target_hit", "")
+        db.update(b.id, "incorrect", "invalidation_hit", "")
+        db.update(c.id, "correct", "target_hit", "")
+
+        stats = db.get_statistics(ticker="TSLA")
+
+        assert stats.total_predictions == 4
+        assert stats.correct == 2
+        assert stats.incorrect == 1
+        assert stats.pending == 1
+        assert stats.accuracy_rate == pytest.approx(2 / 3)
+        assert stats.by_signal_type["breakout_confirmed"] == {"total": 3, "correct": 1, "accuracy": 0.5}
+        assert stats.by_signal_type["fakeout"] == {"total": 1, "correct": 1, "accuracy": 1.0}
+
+    def test_uses_wal_journal(self, db):
+        """
+        测试持久连接启用 WAL
+
+        预期:
+        - journal_mode 为 wal
+        """
+        mode = db._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_read_pragmas(self, db):
+        """
+        测试读优化 PRAGMA
+
+        预期:
+        - 新建文件使用 8KB 页，并启用 mmap
+        """
+        assert db._conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+        assert db._conn.execute("PRAGMA mmap_size").fetchone()[0] == 268435456
+
+    def test_list_uses_composite_index(self, db):
+        """
+        测试 list 查询走复合索引
+
+        预期:
+        - 使用 idx_tkr_tf_created_id，且无需临时排序
+        """
+        query, params = db._list_query("TSLA", "1m", None, 50, 0, None, ("2026-01-15T14:30:00Z", "eval_X"))
+        plan = " ".join(row[3] for row in db._conn.execute("EXPLAIN QUERY PLAN " + query, params))
+
+        assert "idx_tkr_tf_created_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_statistics_uses_covering_index(self, db):
+        """
+        测试统计查询只读索引
+
+        预期:
+        - 使用 idx_stats_cover 覆盖索引，GROUP BY 无需临时排序
+        """
+        plan = " ".join(
+            row[3] for row in db._conn.execute(
+                "EXPLAIN QUERY PLAN SELECT signal_type, COUNT(*), "
+                "SUM(CASE WHEN status = 'correct' THEN 1 ELSE 0 END) "
+                "FROM signal_evaluations WHERE ticker = ? AND tf = ? GROUP BY signal_type",
+                ("TSLA", "1m"),
+            )
+        )
+
+        assert "COVERING INDEX idx_stats_cover" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_create_many(self, db):
+        """
+        测试批量创建
+
+        预期:
+        - 所有记录写入
+        - 主键冲突时整批回滚
+        """
+        evaluations = [_make_evaluation() for _ in range(20)]
+        db.create_many(evaluations)
+        assert db.count(ticker="TSLA") == 20
+
+        duplicate = [_make_evaluation(ticker="AAPL"), evaluations[0]]
+        with pytest.raises(Exception):
+            db.create_many(duplicate)
+        assert db.count(ticker="AAPL") == 0
+
+    def test_statistics_cache_invalidated_on_write(self, db):
+        """
+        测试统计缓存在写入后失效
+
+        预期:
+        - 重复读取命中缓存
+        - create/update/delete 后返回最新统计
+        """
+        a = db.create(_make_evaluation())
+        first = db.get_statistics(ticker="TSLA")
+        assert db.get_statistics(ticker="TSLA") is first
+
+        db.create(_make_evaluation())
+        assert db.get_statistics(ticker="TSLA").total_predictions == 2
+
+        db.update(a.id, "correct", "target_hit", "")
+        assert db.get_statistics(ticker="TSLA").correct == 1
+
+        db.delete(a.id)
+        assert db.get_statistics(ticker="TSLA").total_predictions == 1
+
+
+    def test_count_cache_invalidated_on_write(self, db):
+        """
+        测试计数缓存在写入后失效
+
+        预期:
+        - 其他连接写入的记录在 COUNT_TTL 内不可见（命中缓存）
+        - 本实例 create/delete 后立即返回最新计数
+        """
+        db.create(_make_evaluation())
+        assert db.count(ticker="TSLA") == 1
+
+        other = SignalEvaluationDB(db_path=db.db_path)
+        try:
+            other.create(_make_evaluation())
+        finally:
+            other.close()
+        assert db.count(ticker="TSLA") == 1
+
+        created = db.create(_make_evaluation())
+        assert db.count(ticker="TSLA") == 3
+
+        db.delete(created.id)
+        assert db.count(ticker="TSLA") == 2
+
+    def test_concurrent_writes_and_cached_reads(self, db):
+        """
+        测试并发写入与缓存读取
+
+        预期:
+        - 写线程与读线程交错执行时不抛出异常
+        - 全部写入完成后统计与计数反映所有记录
+        """
+        import threading
+
+        errors = []
+        writers, per_writer = 4, 25
+
+        def write():
+            try:
+                for _ in range(per_writer):
+                    db.create(_make_evaluation())
+            except Exception as exc:
+                errors.append(exc)
+
+        def read():
+            try:
+                for _ in range(per_writer * 2):
+                    db.get_statistics("TSLA")
+                    db.list_with_stats("TSLA", limit=5)
+                    db.count(ticker="TSLA")
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=write) for _ in range(writers)]
+        threads += [threading.Thread(target=read) for _ in range(writers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        total = writers * per_writer
+        assert db.get_statistics("TSLA").total_predictions == total
+        assert db.count(ticker="TSLA") == total
+
+
+class TestGenerateEvalId:
+    """评估 ID 生成测试类"""
+
+    def test_format(self):
+        """
+        测试 ID 格式
+
+        预期:
+        - eval_ 前缀 + 26 位 Crockford Base32
+        """
+        eval_id = generate_eval_id()
+        assert eval_id.startswith("eval_")
+        assert len(eval_id) == 31
+
+    def test_monotonic_and_unique(self):
+        """
+        测试 ID 单调递增且不重复
+
+        预期:
+        - 连续生成的 ID 按字典序递增
+        """
+        ids = [generate_eval_id() for _ in range(1000)]
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+
+class TestWatchlistDB:
+    """自选股数据库测试类"""
+
+    def test_add_list_remove(self, watchlist):
+        """
+        测试添加、列表与移除
+
+        预期:
+        - ticker 统一大写，按添加顺序返回
+        - 重复添加和移除不存在的 ticker 返回失败
+        """
+        assert watchlist.add("tsla", note="core")[0] is True
+        assert watchlist.add("QQQ")[0] is True
+        assert watchlist.add("TSLA")[0] is False
+
+        items = watchlist.list()
+        assert [i.ticker for i in items] == ["TSLA", "QQQ"]
+        assert items[0].note == "core"
+        assert watchlist.get("tsla").ticker == "TSLA"
+
+        assert watchlist.count() == 2
+        assert watchlist.remove("TSLA")[0] is True
+        assert watchlist.remove("TSLA")[0] is False
+        assert watchlist.count() == 1
+
+    def test_case_insensitive_lookup(self, watchlist):
+        """
+        测试大小写不敏感查找
+
+        预期:
+        - 以大写存储，get/remove/is_in_watchlist 不区分大小写
+        """
+        watchlist.add("aapl")
+
+        assert watchlist.get("Aapl").ticker == "AAPL"
+        assert watchlist.is_in_watchlist("aapl") is True
+        assert watchlist.add("AAPL")[0] is False
+        assert watchlist.remove("aapl")[0] is True
+        assert watchlist.count() == 0
+
+    def test_ticker_cache_updated_in_place(self, watchlist):
+        """
+        测试自选股代码集合缓存
+
+        预期:
+        - 其他连接写入的记录在 TICKERS_TTL 内不可见（命中缓存）
+        - 本实例 add/remove 后 count/is_in_watchlist 立即反映变化
+        """
+        watchlist.add("TSLA")
+        assert watchlist.count() == 1
+
+        other = WatchlistDB(db_path=watchlist.db_path)
+        try:
+            other.add("QQQ")
+        finally:
+            other.close()
+        assert watchlist.is_in_watchlist("QQQ") is False
+
+        watchlist.add("aapl")
+        assert watchlist.is_in_watchlist("AAPL") is True
+        assert watchlist.count() == 2
+
+        watchlist.remove("tsla")
+        assert watchlist.is_in_watchlist("TSLA") is False
+        assert watchlist.count() == 1
+
+    def test_concurrent_add_remove_and_reads(self, watchlist):
+        """
+        测试并发读写自选股代码集合缓存
+
+        预期:
+        - 读线程遍历缓存集合时，写线程的 add/remove 不会引发异常
+        - 全部写入完成后缓存与表内容一致
+        """
+        import threading
+
+        errors = []
+        tickers = [f"T{i}" for i in range(watchlist.MAX_ITEMS)]
+
+        def write():
+            try:
+                for _ in range(50):
+                    for ticker in tickers:
+                        watchlist.add(ticker)
+                    for ticker in tickers[::2]:
+                        watchlist.remove(ticker)
+            except Exception as exc:
+                errors.append(exc)
+
+        def read():
+            try:
+                for _ in range(500):
+                    sorted(watchlist._tickers())
+                    watchlist.count()
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=write) for _ in range(2)]
+        threads += [threading.Thread(target=read) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert watchlist._tickers() == {item.ticker for item in watchlist.list()}
+
+    def test_migrates_case_sensitive_table(self, tmp_path):
+        """
+        测试旧表迁移
+
+        预期:
+        - 旧的大小写敏感表重建为 NOCASE，数据保留
+        """
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE watchlist (ticker TEXT PRIMARY KEY, added_at TEXT NOT NULL, note TEXT)")
+        conn.execute("INSERT INTO watchlist VALUES ('TSLA', '2026-01-15T14:30:00Z', 'core')")
+        conn.commit()
+        conn.close()
+
+        database = WatchlistDB(db_path=path)
+        try:
+            assert database.get("tsla").note == "core"
+            assert database.add("tsla")[0] is False
+        finally:
+            database.close()
+
+    def test_max_items(self, watchlist):
+        """
+        测试数量上限
+
+        预期:
+        - 超过 MAX_ITEMS 时添加失败
+        """
+        for i in range(WatchlistDB.MAX_ITEMS):
+            assert watchlist.add(f"T{i}")[0] is True
+
+        success, message = watchlist.add("EXTRA")
+        assert success is False
+        assert "上限" in message
+
+        # 已满时重复添加，仍提示已存在
+        success, message = watchlist.add("T0")
+        assert success is False
+        assert "已在" in message
+        assert watchlist.count() == WatchlistDB.MAX_ITEMS
+
+
+class TestDatabase:
+    """共享连接数据库测试类"""
+
+    def test_shared_connection(self, tmp_path):
+        """
+        测试两个表共用一个连接
+
+        预期:
+        - signals 与 watchlist 使用同一连接和锁
+        - 关闭子仓库不关闭共享连接，Database.close 才关闭
+        """
+        database = Database(db_path=str(tmp_path / "test.db"))
+
+        assert database.signals._conn is database.watchlist._conn is database.conn
+        assert database.signals._lock is database.watchlist._lock
+
+        database.signals.create(_make_evaluation())
+        database.watchlist.add("TSLA")
+        database.signals.close()
+        assert database.watchlist.count() == 1
+        assert database.signals.count(ticker="TSLA") == 1
+
+        database.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            database.conn.execute("SELECT 1")
+
@@ -128,3 +128,178 @@ class TestYFinanceProvider:
         # 检查时间戳格式
         assert isinstance(bar_dict["t"], str)
         assert bar_dict["t"].endswith("Z")
+
+    def test_get_bars_extended_batch_demux(self, provider):
+        """
+        测试批量 Extended Hours 数据按 ticker 拆分
+
+        预期:
+        - 一次 yf.download 调用
+        - 每个 ticker 得到各自的 Bar 列表，缺失行被丢弃
+        """
+        import pandas as pd
+        from unittest.mock import patch
+
+        index = pd.DatetimeIndex(
+            ["2026-01-15 14:30", "2026-01-15 14:31"], tz="UTC"
+        )
+        fields = ["Open", "High", "Low", "Close", "Volume"]
+        columns = pd.MultiIndex.from_product([["TSLA", "QQQ"], fields])
+        df = pd.DataFrame(
+            [
+                [1.0, 2.0, 0.5, 1.5, 100, 10.0, 11.0, 9.0, 10.5, 50],
+                [1.5, 2.5, 1.0, 2.0, 200, None, None, None, None, None],
+            ],
+            index=index,
+            columns=columns,
+        )
+
+        with patch("src.providers.yfinance_provider.yf.download", return_value=df) as mock_download:
+            result = provider.get_bars_extended_batch(["tsla", "qqq"], "1m", "2d")
+
+        assert mock_download.call_count == 1
+        assert len(result["TSLA"]) == 2
+        assert len(result["QQQ"]) == 1
+        # 转换为 ET 本地时间: 14:30 UTC -> 09:30 ET
+        assert result["TSLA"][0].t.hour == 9
+        assert result["TSLA"][0].t.tzinfo is None
+
+
+class TestProviderFanOut:
+    """多 ticker 并发获取测试类"""
+
+    def _make_provider(self, fetch):
+        """创建只实现 get_bars_extended 的测试提供者"""
+        from src.providers.base import MarketDataProvider
+
+        class FakeProvider(MarketDataProvider):
+            name = "fake"
+
+            def get_bars(self, ticker, timeframe, window=None):
+                return []
+
+            def get_bars_extended(self, ticker, timeframe, window=None):
+                return fetch(ticker)
+
+        return FakeProvider()
+
+    def test_get_bars_extended_many(self):
+        """
+        测试并发获取
+
+        预期:
+        - 每个 ticker 一个结果，无效或无数据的 ticker 被跳过
+        """
+        def fetch(ticker):
+            if ticker == "BAD":
+                raise TickerNotFoundError(ticker)
+            if ticker == "EMPTY":
+                return []
+            return [ticker]
+
+        provider = self._make_provider(fetch)
+        result = provider.get_bars_extended_many(["tsla", "qqq", "bad", "empty"], "1m")
+
+        assert result == {"TSLA": ["TSLA"], "QQQ": ["QQQ"]}
+
+    def test_retry_on_rate_limit(self):
+        """
+        测试频率限制重试
+
+        预期:
+        - 前两次 RateLimitError 后第三次成功
+        """
+        from src.providers.base import retry_on_rate_limit
+        from src.providers import RateLimitError
+
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise RateLimitError("429")
+            return "ok"
+
+        assert retry_on_rate_limit(flaky, max_retries=3, base_delay=0)() == "ok"
+        assert len(calls) == 3
+
+
+class TestConditionalRequest:
+    """条件请求测试类"""
+
+    def test_twelvedata_not_modified(self):
+        """
+        测试 TwelveData 304 响应
+
+        预期:
+        - 发送 If-None-Match 请求头
+        - 返回 not_modified，且不解析响应体
+        """
+        from unittest.mock import MagicMock, patch
+        from src.providers import TwelveDataProvider
+
+        response = MagicMock(status_code=304, headers={"ETag": '"v1"'})
+        provider = TwelveDataProvider(api_key="test")
+
+        with patch.object(provider._session, "get", return_value=response) as mock_get:
+            result = provider.get_bars_conditional("TSLA", "1m", "1d", etag='"v1"')
+
+        assert result.not_modified
+        assert result.etag == '"v1"'
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+        response.json.assert_not_called()
+
+
+    def test_twelvedata_batch_single_invalid_symbol(self):
+        """
+        测试 TwelveData 批量获取中单个 symbol 的批次无效
+
+        预期:
+        - 第 11 个股票单独成批且代码无效时只跳过该股票，前一批结果保留
+        """
+        from unittest.mock import MagicMock, patch
+        from src.providers import TwelveDataProvider
+
+        provider = TwelveDataProvider(api_key="test")
+        symbols = [f"T{i}" for i in range(provider.BATCH_SIZE)]
+        value = {"datetime": "2026-01-15 09:30:00", "open": "1", "high": "2", "low": "0.5", "close": "1.5", "volume": "100"}
+        full_batch = MagicMock()
+        full_batch.json.return_value = {s: {"status": "ok", "values": [value]} for s in symbols}
+        invalid = MagicMock()
+        invalid.json.return_value = {"status": "error", "code": 400, "message": "symbol not found"}
+
+        with patch.object(provider._session, "get", side_effect=[full_batch, invalid]):
+            result = provider.get_bars_extended_batch(symbols + ["BAD"], "1m", "2d")
+
+        assert sorted(result) == sorted(symbols)
+
+class TestSessionSegmentation:
+    """交易时段分割测试类"""
+
+    def test_segment_bars_by_session(self):
+        """
+        测试按日期和时段分割
+
+        预期:
+        - 盘前/正盘/盘后边界正确（09:30 属于正盘，16:00 属于盘后）
+        - 04:00 前和 20:00 后的 K 线被忽略
+        """
+        from datetime import datetime, timedelta
+        from src.providers import Bar, segment_bars_by_session
+
+        bars = []
+        t = datetime(2026, 1, 5, 3, 0)
+        while t <= datetime(2026, 1, 6, 20, 30):
+            bars.append(Bar(t=t, o=1.0, h=1.0, l=1.0, c=1.0, v=1.0))
+            t += timedelta(minutes=30)
+
+        segmented = segment_bars_by_session(bars)
+
+        assert list(segmented.keys()) == ["2026-01-05", "2026-01-06"]
+        day = segmented["2026-01-05"]
+        assert len(day.premarket) == 11
+        assert len(day.regular) == 13
+        assert len(day.afterhours) == 8
+        assert day.regular[0].t.hour == 9 and day.regular[0].t.minute == 30
+        assert day.afterhours[0].t.hour == 16
+        assert day.afterhours[-1].t.hour == 19
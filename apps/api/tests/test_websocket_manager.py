@@ -0,0 +1,131 @@
+"""
+WebSocket 管理器单元测试
+
+测试价格监听队列、最新价格快照和实时价格数据。
+"""
+
+import asyncio
+import json
+from datetime import datetime
+
+from src.websocket_manager import RealtimePrice, TwelveDataWebSocket
+
+
+def _price_message(symbol: str, price: float) -> str:
+    return json.dumps({"event": "price", "symbol": symbol, "price": price, "timestamp": 1768487400})
+
+
+class TestListeners:
+    """价格监听队列测试"""
+
+    def test_listener_receives_updates(self):
+        """
+        测试价格更新推送到监听队列
+
+        预期:
+        - 只收到对应 symbol 的更新
+        - 注册时已有最新价格则先收到该价格
+        """
+        async def run():
+            manager = TwelveDataWebSocket(api_key="test")
+            await manager._handle_message(_price_message("QQQ", 520.0))
+
+            queue = manager.add_listener("qqq")
+            await manager._handle_message(_price_message("AAPL", 230.0))
+            await manager._handle_message(_price_message("QQQ", 521.0))
+
+            return [queue.get_nowait().price for _ in range(queue.qsize())]
+
+        assert asyncio.run(run()) == [520.0, 521.0]
+
+    def test_full_queue_drops_oldest(self):
+        """
+        测试队列满时丢弃最旧的价格
+
+        预期:
+        - 队列保留最新的 maxsize 条
+        """
+        async def run():
+            manager = TwelveDataWebSocket(api_key="test")
+            queue = manager.add_listener("QQQ", maxsize=2)
+            for price in (1.0, 2.0, 3.0):
+                await manager._handle_message(_price_message("QQQ", price))
+            return [queue.get_nowait().price for _ in range(queue.qsize())]
+
+        assert asyncio.run(run()) == [2.0, 3.0]
+
+    def test_remove_listener(self):
+        """
+        测试注销监听队列
+
+        预期:
+        - 注销后不再收到更新，也不残留空集合
+        """
+        async def run():
+            manager = TwelveDataWebSocket(api_key="test")
+            queue = manager.add_listener("QQQ")
+            manager.remove_listener("QQQ", queue)
+            await manager._handle_message(_price_message("QQQ", 520.0))
+            return queue.empty(), manager._listeners
+
+        assert asyncio.run(run()) == (True, {})
+
+
+class TestRealtimePrice:
+    """实时价格数据测试"""
+
+    def test_timestamp_iso_cached(self):
+        """
+        测试 ISO 时间戳只格式化一次
+
+        预期:
+        - 与 isoformat() 一致，重复读取返回同一对象；无时间戳时为 None
+        """
+        price = RealtimePrice(symbol="QQQ", price=520.0, timestamp=datetime(2026, 1, 15, 14, 30))
+
+        assert price.timestamp_iso == "2026-01-15T14:30:00"
+        assert price.timestamp_iso is price.timestamp_iso
+        assert RealtimePrice(symbol="QQQ", price=520.0, timestamp=None).timestamp_iso is None
+
+
+class TestPriceSnapshot:
+    """最新价格快照测试"""
+
+    def test_snapshot_reused_until_update(self):
+        """
+        测试价格快照复用
+
+        预期:
+        - 两次更新之间返回同一个只读快照
+        - 更新后返回新快照，旧快照内容不变
+        """
+        async def run():
+            manager = TwelveDataWebSocket(api_key="test")
+            await manager._handle_message(_price_message("QQQ", 520.0))
+            first = manager.get_all_prices()
+            same = manager.get_all_prices()
+            await manager._handle_message(_price_message("QQQ", 521.0))
+            return first, same, manager.get_all_prices()
+
+        first, same, updated = asyncio.run(run())
+
+        assert same is first
+        assert first["QQQ"].price == 520.0
+        assert updated["QQQ"].price == 521.0
+
+    def test_tick_seq_bumps_on_change_only(self):
+        """
+        测试价格序号
+
+        预期:
+        - 价格变化时 tick_seq 加一，相同报价重复推送时不变
+        """
+        async def run():
+            manager = TwelveDataWebSocket(api_key="test")
+            seqs = []
+            for price in (520.0, 520.0, 521.0):
+                await manager._handle_message(_price_message("QQQ", price))
+                seqs.append(manager.get_latest_price("QQQ").tick_seq)
+            return seqs
+
+        assert asyncio.run(run()) == [0, 0, 1]